@@ -0,0 +1,78 @@
+"""
+Analysis history store: write throughput with and without batched
+(group-commit) transactions, and "at-risk meetings this week" over a
+large history via the indexes vs. loading every analysis.
+
+Usage (from backend/):
+    python benchmarks/bench_analysis_store.py [--analyses 20000] [--segments 40]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_enriched_call
+from services.analysis_cache import StoredAnalysis
+from services.analysis_store import AnalysisStore
+
+HEALTH = ["on_track", "on_track", "at_risk", "blocked"]
+WEEK = 7 * 24 * 3600
+
+def timed(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def fill(store, n, segments, now, seed=7):
+    rng = random.Random(seed)
+    for i in range(n):
+        health = rng.choice(HEALTH)
+        insights = {"mode": "meeting", "meeting_quality": {"label": "Low" if health != "on_track" else "High"},
+                    "meeting_health": health, "summary": "synthetic"}
+        store.save(StoredAnalysis(f"a{i}", "meeting", None, "", segments, "bench", insights=insights),
+                   session_id=f"s{i % 500}", created_at=now - rng.uniform(0, 26 * WEEK))
+    store.flush()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--analyses", type=int, default=20000)
+    parser.add_argument("--segments", type=int, default=40)
+    parser.add_argument("--writes", type=int, default=500, help="analyses per write-throughput run")
+    args = parser.parse_args()
+
+    segments = make_enriched_call(args.segments)
+    now = time.time()
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'writes':>16} {'analyses/s':>11}")
+        for batch_size in (1, 64):
+            store = AnalysisStore(os.path.join(tmp, f"writes{batch_size}.db"), batch_size=batch_size)
+            start = time.perf_counter()
+            fill(store, args.writes, segments, now)
+            rate = args.writes / (time.perf_counter() - start)
+            store.close()
+            print(f"{f'batch_size={batch_size}':>16} {rate:>11.0f}")
+
+        store = AnalysisStore(os.path.join(tmp, "history.db"))
+        fill(store, args.analyses, segments, now)
+        since = now - WEEK
+        indexed = store.query(meeting_health="at_risk", since=since, limit=1000)
+
+        def scan():
+            # What a history view costs without the indexed columns: load and check every analysis
+            ids = [row[0] for row in store._reader().execute("SELECT analysis_id FROM analyses")]
+            return [a for a in map(store.get, ids) if a.insights["meeting_health"] == "at_risk"]
+
+        print(f"\n{args.analyses} analyses, {len(indexed)} at risk this week")
+        print(f"{'indexed query':>16} {timed(lambda: store.query(meeting_health='at_risk', since=since, limit=1000)):>9.2f} ms")
+        print(f"{'load + filter':>16} {timed(scan, repeat=1):>9.2f} ms")
+        store.close()
+
+if __name__ == "__main__":
+    main()
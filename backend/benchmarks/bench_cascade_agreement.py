@@ -0,0 +1,68 @@
+"""
+Cascade agreement benchmark.
+
+Replays recorded transcripts (saved /analyze responses or enriched-segment
+JSON/JSONL) and measures, per confidence threshold, how many segments the
+cheap lexicon tier would settle on its own and how often it agrees with the
+transformer labels that were stored.
+
+Usage (from backend/):
+    python benchmarks/bench_cascade_agreement.py recordings/*.json [--thresholds 0.7,0.8,0.85,0.9]
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.lexicon_sentiment import LexiconSentimentScorer
+from services.nlp_engine import map_sentiment_label
+from utils.config_loader import KEYWORDS_CONFIG
+
+def _segments_of(doc):
+    if isinstance(doc, list):
+        return doc
+    if "transcript" in doc and isinstance(doc["transcript"], dict):
+        return doc["transcript"].get("segments", [])
+    return doc.get("segments", [])
+
+def load_recorded_segments(paths):
+    """Yields model-labelled segments from .json / .jsonl recordings."""
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            docs = [json.loads(line) for line in f if line.strip()] if path.endswith(".jsonl") else [json.load(f)]
+        for doc in docs:
+            for seg in _segments_of(doc):
+                # Only segments the transformer actually scored are ground truth
+                if seg.get("sentiment_source", "model") == "model" and seg.get("sentiment_confidence", 0) > 0:
+                    yield seg
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("paths", nargs="+")
+    parser.add_argument("--thresholds", default="0.6,0.7,0.75,0.8,0.85,0.9")
+    args = parser.parse_args()
+
+    segments = list(load_recorded_segments(args.paths))
+    if not segments:
+        print("No model-labelled segments found.")
+        return
+
+    scorer = LexiconSentimentScorer.from_config(KEYWORDS_CONFIG)
+    fast = scorer([s["text"] for s in segments])
+    fast_labels = [map_sentiment_label(r["label"], r["score"])[1] for r in fast]
+
+    overall = sum(f == s["sentiment_label"] for f, s in zip(fast_labels, segments)) / len(segments)
+    print(f"Segments: {len(segments)}   tier-1 agreement on all segments: {overall:.1%}\n")
+    print(f"{'threshold':>9} {'tier-1 share':>13} {'agreement':>10} {'model calls saved':>18}")
+
+    for threshold in [float(t) for t in args.thresholds.split(",")]:
+        accepted = [i for i, r in enumerate(fast) if r["score"] >= threshold]
+        agree = sum(fast_labels[i] == segments[i]["sentiment_label"] for i in accepted)
+        share = len(accepted) / len(segments)
+        agreement = agree / len(accepted) if accepted else 1.0
+        print(f"{threshold:>9.2f} {share:>13.1%} {agreement:>10.1%} {len(accepted):>18}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Keyword config startup: parse + validate + compile every matcher vs loading
+the compiled snapshot from the on-disk cache.
+
+Usage (from backend/):
+    python benchmarks/bench_config_snapshot.py [--repeat 20]
+"""
+import argparse
+import os
+import re
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Importing the consumers registers every compiler (matchers, lexicon)
+import services.context_analyzer  # noqa: F401
+import services.nlp_engine  # noqa: F401
+from utils.config_loader import CONFIG_PATH, read_config
+
+def timed(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        re.purge()  # a new process has no compiled patterns cached
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        config = read_config(CONFIG_PATH, cache_dir=cache_dir).compile_all()
+        cold = timed(lambda: read_config(CONFIG_PATH, cache_dir="").compile_all(), args.repeat)
+        cached = timed(lambda: read_config(CONFIG_PATH, cache_dir=cache_dir).compile_all(), args.repeat)
+
+    print(f"phrases after normalization: {config.report}")
+    print(f"{'cold ms':>8} {'cached ms':>10}")
+    print(f"{cold:>8.2f} {cached:>10.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+mode=both vs running Meeting and Sales analysis separately: how much the
+second analysis costs once the keyword pass is shared.
+
+Usage (from backend/):
+    python benchmarks/bench_conversation_modes.py [--segments 2000,20000]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_enriched_call
+from services import context_analyzer as ca
+
+def timed(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--segments", default="2000,20000")
+    args = parser.parse_args()
+
+    print(f"{'segments':>8} {'meeting ms':>11} {'sales ms':>9} {'separate ms':>12} {'both ms':>8} {'auto ms':>8}")
+    for n in [int(x) for x in args.segments.split(",")]:
+        segments = make_enriched_call(n, objection_every=10)
+        nlp_input = {"text": "", "segments": segments}
+
+        meeting = timed(lambda: ca.analyze_meeting(nlp_input))
+        sales = timed(lambda: ca.analyze_sales(segments))
+        both = timed(lambda: ca.analyze_conversation(nlp_input, "both"))
+        auto = timed(lambda: ca.analyze_conversation(nlp_input, "auto"))
+        print(f"{n:>8} {meeting:>11.1f} {sales:>9.1f} {meeting + sales:>12.1f} {both:>8.1f} {auto:>8.1f}")
+
+if __name__ == "__main__":
+    main()
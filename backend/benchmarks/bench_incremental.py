@@ -0,0 +1,54 @@
+"""
+Live sessions: cost of adding one batch of segments to an incremental
+analyzer vs re-running the batch analyzer over the whole call so far.
+
+Usage (from backend/):
+    python benchmarks/bench_incremental.py [--segments 500,2000,8000] [--batch 16]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_enriched_call
+from services import context_analyzer as ca
+
+def timed(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def prefilled(cls, segments):
+    analyzer = cls()
+    analyzer.add_segments(segments)
+    return analyzer
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--segments", default="500,2000,8000")
+    parser.add_argument("--batch", type=int, default=16)
+    args = parser.parse_args()
+
+    print(f"{'mode':>8} {'segments':>8} {'update ms':>10} {'snapshot ms':>12} {'full ms':>8}")
+    for n in [int(x) for x in args.segments.split(",")]:
+        call = make_enriched_call(n + args.batch, objection_every=40)
+        history, batch = call[:n], call[n:]
+
+        for mode, cls, full in (
+            ("meeting", ca.IncrementalMeetingAnalyzer, lambda: ca.analyze_meeting({"text": "", "segments": call})),
+            ("sales", ca.IncrementalSalesAnalyzer, lambda: ca.analyze_sales(call)),
+        ):
+            # Fresh prefilled analyzer per run so every update appends the same batch
+            analyzers = [prefilled(cls, history) for _ in range(3)]
+            update = timed(lambda: analyzers.pop().add_segments(batch))
+            live = prefilled(cls, call)
+            snapshot = timed(live.snapshot)
+            print(f"{mode:>8} {n:>8} {update:>10.2f} {snapshot:>12.2f} {timed(full):>8.1f}")
+
+if __name__ == "__main__":
+    main()
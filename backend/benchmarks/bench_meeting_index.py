@@ -0,0 +1,50 @@
+"""
+Meeting Mode detectors: one shared feature index vs every detector
+rescanning the transcript on its own.
+
+Usage (from backend/):
+    python benchmarks/bench_meeting_index.py [--segments 2000,20000,100000]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_enriched_call
+from services import context_analyzer as ca
+
+DETECTORS = [
+    ca.detect_signals, ca.detect_risks_present, ca.detect_issues_present,
+    ca.extract_primary_topic, ca.detect_execution_attempted, ca.aggregate_sentiment,
+    ca.detect_decisions, ca.extract_actions, ca.detect_tension_points,
+    ca.detect_explicit_no_blockers,
+]
+
+def timed(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--segments", default="2000,20000,100000")
+    args = parser.parse_args()
+
+    print(f"{'segments':>8} {'index ms':>9} {'lookups ms':>11} {'rescans ms':>11} {'analyze ms':>11}")
+    for n in [int(x) for x in args.segments.split(",")]:
+        segments = make_enriched_call(n)
+        index = ca.meeting_index(segments)
+
+        build = timed(lambda: ca.meeting_index(segments))
+        lookups = timed(lambda: [detector(index) for detector in DETECTORS])
+        rescans = timed(lambda: [detector(segments) for detector in DETECTORS])
+        analyze = timed(lambda: ca.analyze_meeting({"text": "", "segments": segments}))
+        print(f"{n:>8} {build:>9.1f} {lookups:>11.1f} {rescans:>11.1f} {analyze:>11.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Response size of a long call for list views: the full /analyze body vs
+`fields` projections, plus one page of segments.
+
+Usage (from backend/):
+    python benchmarks/bench_projection.py [--segments 600,2400]
+"""
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_enriched_call
+from services.context_analyzer import analyze_transcript
+from services.projection import page_segments, project
+from services.response_encoding import encode_body
+from services.time_index import TimeIndex
+
+PROJECTIONS = [
+    ("full", None),
+    ("no duplicate", "-insights.transcript"),
+    ("list view", "insights.summary,insights.quality,insights.key_insights"),
+]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--segments", default="600,2400")
+    args = parser.parse_args()
+
+    print(f"{'segments':>8} {'response':>14} {'KB':>9}")
+    for n in [int(x) for x in args.segments.split(",")]:
+        call = make_enriched_call(n)
+        content = {
+            "analysis_id": "bench",
+            "mode": "sales",
+            "transcript": {"text": " ".join(s["text"] for s in call), "segments": call},
+            "insights": analyze_transcript("sales", "", call),
+        }
+        for name, fields in PROJECTIONS:
+            body = encode_body(project(content, fields) if fields else content)
+            print(f"{n:>8} {name:>14} {len(body) / 1024:>9.1f}")
+        page = page_segments(TimeIndex(call), start=0.0, end=600.0)
+        print(f"{n:>8} {'segment page':>14} {len(encode_body(page)) / 1024:>9.1f}")
+
+if __name__ == "__main__":
+    main()
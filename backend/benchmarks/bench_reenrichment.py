@@ -0,0 +1,52 @@
+"""
+Transcript corrections: sentiment inferences and enrichment time of
+re-enriching an edited call vs enriching it from scratch.
+
+Usage (from backend/):
+    python benchmarks/bench_reenrichment.py [--segments 200,600,1500] [--edits 1,10]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_raw_call
+from services.nlp_engine import NLPEngine
+
+def timed(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--segments", default="200,600,1500")
+    parser.add_argument("--edits", default="1,10")
+    args = parser.parse_args()
+
+    engine = NLPEngine(load_model=False)  # Lexicon scorer stands in for the model
+
+    print(f"{'segments':>8} {'edits':>6} {'full inf':>9} {'edit inf':>9} {'full ms':>8} {'edit ms':>8}")
+    for n in [int(x) for x in args.segments.split(",")]:
+        full_stats = {}
+        previous = engine.enrich_transcript(make_raw_call(n), stats=full_stats)
+        for edits in [int(x) for x in args.edits.split(",")]:
+            edited = [{"start": s["start"], "end": s["end"], "text": s["text"]} for s in previous]
+            step = max(1, len(edited) // edits)
+            for i in range(0, min(len(edited), step * edits), step):
+                edited[i]["text"] = edited[i]["text"].rstrip(".!?") + ", corrected."
+
+            stats = {}
+            engine.reenrich(previous, edited, stats=stats)
+            full = timed(lambda: engine.enrich_transcript(edited))
+            edit = timed(lambda: engine.reenrich(previous, edited))
+            print(f"{n:>8} {edits:>6} {full_stats['sentiment_inferred']:>9} {stats['sentiment_inferred']:>9} "
+                  f"{full:>8.2f} {edit:>8.2f}")
+
+if __name__ == "__main__":
+    main()
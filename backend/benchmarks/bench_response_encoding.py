@@ -0,0 +1,60 @@
+"""
+/analyze response encoding on a long synthetic call: encode time and body
+size per format (stdlib json, orjson, MessagePack) and content coding.
+
+Usage (from backend/):
+    python benchmarks/bench_response_encoding.py [--segments 600,2400]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_enriched_call
+from services import response_encoding as enc
+from services.context_analyzer import analyze_transcript
+
+def timed(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def stdlib_json(content):
+    # What JSONResponse does
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--segments", default="600,2400")  # ~30 min and ~2 h of speech
+    args = parser.parse_args()
+
+    formats = [("json", lambda c: stdlib_json(c))]
+    if enc.orjson is not None:
+        formats.append(("orjson", lambda c: enc.encode_body(c, enc.MEDIA_JSON)))
+    if enc.msgpack is not None:
+        formats.append(("msgpack", lambda c: enc.encode_body(c, enc.MEDIA_MSGPACK)))
+    codings = [None, "gzip"] + (["br"] if enc.brotli is not None else [])
+
+    print(f"{'segments':>8} {'format':>8} {'coding':>6} {'encode ms':>10} {'KB':>8}")
+    for n in [int(x) for x in args.segments.split(",")]:
+        call = make_enriched_call(n)
+        content = {
+            "mode": "both",
+            "transcript": {"text": " ".join(s["text"] for s in call), "segments": call},
+            "insights": analyze_transcript("both", "", call),
+        }
+        for name, encode in formats:
+            body = encode(content)
+            for coding in codings:
+                encode_ms = timed(lambda: enc.compress(encode(content), coding))
+                size = len(enc.compress(body, coding)) / 1024
+                print(f"{n:>8} {name:>8} {coding or '-':>6} {encode_ms:>10.1f} {size:>8.0f}")
+
+if __name__ == "__main__":
+    main()
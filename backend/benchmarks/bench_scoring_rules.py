@@ -0,0 +1,43 @@
+"""
+Sales quality scoring for many calls: row-by-row evaluation of the rule table
+vs one evaluate_batch() over signal columns.
+
+Usage (from backend/):
+    python benchmarks/bench_scoring_rules.py [--calls 1000,10000,100000]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.scoring_rules import SCORING_RULES
+
+def timed(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", default="1000,10000,100000")
+    args = parser.parse_args()
+
+    table = SCORING_RULES["sales_quality"]
+    rng = np.random.default_rng(0)
+    print(f"{'calls':>8} {'rows ms':>10} {'batch ms':>10}")
+    for n in [int(x) for x in args.calls.split(",")]:
+        columns = {name: rng.random(n) < 0.3 for name in table.signals}
+        rows = [{name: bool(columns[name][i]) for name in table.signals} for i in range(n)]
+        per_row = timed(lambda: [table.evaluate(row) for row in rows])
+        batch = timed(lambda: table.evaluate_batch(columns))
+        print(f"{n:>8} {per_row:>10.1f} {batch:>10.2f}")
+
+if __name__ == "__main__":
+    main()
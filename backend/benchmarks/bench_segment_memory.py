@@ -0,0 +1,67 @@
+"""
+Segment model: memory and allocations of slotted Segments vs plain dicts on
+a long transcript, plus analyzer time with cached lowercase text.
+
+Usage (from backend/):
+    python benchmarks/bench_segment_memory.py [--segments 10000]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_raw_call
+from services.context_analyzer import analyze_meeting, analyze_sales
+from services.nlp_engine import NLPEngine
+
+def measure(build):
+    """Returns (result, live KiB, live blocks, peak KiB) for objects created by build()."""
+    tracemalloc.start()
+    result = build()
+    current, peak = tracemalloc.get_traced_memory()
+    blocks = sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+    tracemalloc.stop()
+    return result, current / 1024, blocks, peak / 1024
+
+def timed(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--segments", type=int, default=10000)
+    args = parser.parse_args()
+
+    engine = NLPEngine(load_model=False)  # Lexicon scorer stands in for the model
+    raw = make_raw_call(args.segments, objection_every=0)
+
+    enriched, _, _, seg_peak = measure(lambda: engine.enrich_transcript(raw))
+    print(f"enriched segments: {len(enriched)} (from {len(raw)} raw), enrichment peak {seg_peak:.0f} KiB")
+
+    # Containers only: both share the text strings (replace() also reuses the lowercase cache)
+    _, seg_kib, seg_blocks, _ = measure(lambda: [seg.replace() for seg in enriched])
+    as_dicts, dict_kib, dict_blocks, _ = measure(lambda: [seg.to_dict() for seg in enriched])
+
+    print(f"{'representation':<16} {'live KiB':>10} {'blocks':>9} {'B/seg':>7}")
+    for name, kib, blocks in (("Segment", seg_kib, seg_blocks), ("dict", dict_kib, dict_blocks)):
+        print(f"{name:<16} {kib:>10.0f} {blocks:>9} {kib * 1024 / len(enriched):>7.0f}")
+    lower_kib = sum(sys.getsizeof(seg.text_lower) for seg in enriched) / 1024
+    print(f"lowercase text cache: {lower_kib:.0f} KiB (replaces a .lower() per segment per detector)")
+
+    text = " ".join(seg["text"] for seg in raw)
+    print(f"{'analyzer':<16} {'Segment ms':>10} {'dict ms':>9}")
+    for name, run in (
+        ("meeting", lambda segs: analyze_meeting({"text": text, "segments": segs})),
+        ("sales", analyze_sales),
+    ):
+        print(f"{name:<16} {timed(lambda: run(enriched)):>10.1f} {timed(lambda: run(as_dicts)):>9.1f}")
+
+if __name__ == "__main__":
+    main()
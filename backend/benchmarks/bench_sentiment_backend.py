@@ -0,0 +1,59 @@
+"""
+Latency benchmark: torch pipeline vs ONNX Runtime (int8) sentiment backend.
+
+Usage (from backend/):
+    python benchmarks/bench_sentiment_backend.py [--batch 32] [--runs 10]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.nlp_engine import SENTIMENT_MODEL, map_sentiment_label
+
+SAMPLE_TEXTS = [
+    "I'll send the proposal by Friday and we can review it together.",
+    "The pricing is way too expensive for a team our size.",
+    "We are blocked on the security approval for the new API.",
+    "Sounds good, let's move forward with the pilot next month.",
+    "Honestly I am not sure the integration will work with our stack.",
+    "Let's review the agenda and the action list from last week.",
+]
+
+def time_backend(name, pipe, texts, runs):
+    pipe(texts[:2], batch_size=2)  # warm-up
+    timings = []
+    results = None
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        results = pipe(texts, batch_size=len(texts))
+        timings.append((time.perf_counter() - t0) * 1000)
+
+    timings.sort()
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    print(f"{name:<6} p50={statistics.median(timings):8.1f} ms  p95={p95:8.1f} ms  "
+          f"({len(texts)} segments/batch)")
+    return statistics.median(timings), [map_sentiment_label(r["label"], r["score"])[1] for r in results]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--batch", type=int, default=32)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    from transformers import pipeline
+    from services.onnx_sentiment import OnnxSentimentPipeline
+
+    texts = [SAMPLE_TEXTS[i % len(SAMPLE_TEXTS)] for i in range(args.batch)]
+
+    torch_ms, torch_labels = time_backend("torch", pipeline("sentiment-analysis", model=SENTIMENT_MODEL), texts, args.runs)
+    onnx_ms, onnx_labels = time_backend("onnx", OnnxSentimentPipeline(SENTIMENT_MODEL), texts, args.runs)
+
+    agreement = sum(a == b for a, b in zip(torch_labels, onnx_labels)) / len(texts)
+    print(f"\nSpeedup: {torch_ms / onnx_ms:.2f}x   label agreement: {agreement:.0%}")
+
+if __name__ == "__main__":
+    main()
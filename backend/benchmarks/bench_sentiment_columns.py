@@ -0,0 +1,58 @@
+"""
+Bulk rescoring: NumPy columnar sentiment aggregations over a stacked batch
+of calls vs the scalar per-call functions.
+
+Usage (from backend/):
+    python benchmarks/bench_sentiment_columns.py [--calls 1000] [--segments 200]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_enriched_call
+from services import context_analyzer as ca
+from services.sentiment_columns import (
+    SentimentColumns, aggregate_sentiment_batch, overall_call_sentiment_batch,
+    calculate_business_sentiment_batch,
+)
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=1000)
+    parser.add_argument("--segments", type=int, default=200)
+    args = parser.parse_args()
+
+    calls = [make_enriched_call(args.segments, seed=i) for i in range(args.calls)]
+    indexes = [ca.meeting_index(sorted(call, key=lambda x: x["start"])) for call in calls]
+
+    def scalar():
+        for index in indexes:
+            ca.aggregate_sentiment(index)
+            ca.overall_call_sentiment(index.segments)
+            ca.calculate_business_sentiment(index, "on_track")
+
+    def batch(columns):
+        aggregate_sentiment_batch(columns)
+        overall_call_sentiment_batch(columns)
+        calculate_business_sentiment_batch(columns, "on_track")
+
+    columns, pack_ms = timed(lambda: SentimentColumns(calls))
+    _, scalar_ms = timed(scalar)
+    _, batch_ms = timed(lambda: batch(columns))
+
+    rows = args.calls * args.segments
+    print(f"{args.calls} calls x {args.segments} segments ({rows} rows)")
+    print(f"pack columns (incl. keyword index): {pack_ms:9.1f} ms")
+    print(f"scalar aggregations:                {scalar_ms:9.1f} ms")
+    print(f"columnar aggregations:              {batch_ms:9.1f} ms  ({scalar_ms / max(batch_ms, 1e-9):.0f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Objection resolution: follow-up windows from a shared TimeIndex vs
+filtering the whole transcript once per objection.
+
+Usage (from backend/):
+    python benchmarks/bench_time_index.py [--segments 2000,20000,100000]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_enriched_call
+from services import context_analyzer as ca
+from services.time_index import TimeIndex
+
+def timed(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def filter_resolved(objections, segments):
+    # Pre-index behaviour: every objection rescans the transcript
+    return [[s for s in segments if s["start"] > o["time"]][:5] for o in objections]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--segments", default="2000,20000,100000")
+    args = parser.parse_args()
+
+    print(f"{'segments':>8} {'objections':>10} {'index ms':>9} {'windows ms':>11} {'filter ms':>10}")
+    for n in [int(x) for x in args.segments.split(",")]:
+        segments = sorted(make_enriched_call(n, objection_every=10), key=lambda s: s["start"])
+        objections = ca.detect_objections(segments)
+
+        build = timed(lambda: TimeIndex(segments))
+        timeline = TimeIndex(segments)
+        windows = timed(lambda: ca.classify_objections(objections, timeline))
+        filtered = timed(lambda: filter_resolved(objections, segments), repeat=1)
+        print(f"{n:>8} {len(objections):>10} {build:>9.1f} {windows:>11.1f} {filtered:>10.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Synthetic transcripts for benchmarks (no audio, no models).
+"""
+import random
+
+DISCOVERY_LINES = [
+    "Can you walk me through how your team handles reporting today?",
+    "We mostly export everything to spreadsheets at the end of the week.",
+    "How many people touch that process before it reaches leadership?",
+    "Around six analysts, and it usually takes two full days.",
+    "That is a common pattern we see with teams your size.",
+    "Our dashboards pull data directly from the warehouse every hour.",
+    "What does your current onboarding look like for new analysts?",
+    "Honestly it is mostly shadowing and a few internal docs.",
+    "Let me share my screen and show you the workflow builder.",
+    "Here you can see how the alerts are configured per team.",
+]
+
+OBJECTION_LINES = [
+    "The price seems too expensive for our current budget.",
+    "I would need to check with my manager before we commit.",
+    "The integration with our CRM looks complicated.",
+    "We are already using another vendor for part of this.",
+]
+
+CLOSING_LINES = [
+    "That makes sense, thanks for clarifying.",
+    "I'll send the proposal by Friday so you can review it.",
+    "Sounds good, let's schedule the follow up for next week.",
+    "This looks good and it solves our problem with reporting.",
+]
+
+LABELS = [("Positive", 0.7), ("Neutral", 0.0), ("Negative", -0.7)]
+
+def make_raw_call(n_segments: int, objection_every: int = 40, seed: int = 7) -> list:
+    """Whisper-like raw segments: [{start, end, text}]."""
+    rng = random.Random(seed)
+    segments = []
+    t = 0.0
+    closing_start = max(0, n_segments - len(CLOSING_LINES))
+    for i in range(n_segments):
+        if i >= closing_start:
+            text = CLOSING_LINES[i - closing_start]
+        elif objection_every and i % objection_every == objection_every - 1:
+            text = rng.choice(OBJECTION_LINES)
+        else:
+            text = rng.choice(DISCOVERY_LINES)
+        duration = round(rng.uniform(2.0, 6.0), 2)
+        segments.append({"start": round(t, 2), "end": round(t + duration, 2), "text": text})
+        t += duration
+    return segments
+
+def make_enriched_call(n_segments: int, objection_every: int = 40, seed: int = 7) -> list:
+    """Raw segments plus plausible sentiment fields (as if enriched)."""
+    rng = random.Random(seed + 1)
+    enriched = []
+    for seg in make_raw_call(n_segments, objection_every, seed):
+        label, base = rng.choice(LABELS)
+        if seg["text"] in OBJECTION_LINES:
+            label, base = "Negative", -0.8
+        confidence = round(rng.uniform(0.5, 0.99), 2)
+        enriched.append({
+            **seg,
+            "keywords": [],
+            "sentiment": round(base * confidence, 3),
+            "sentiment_label": label,
+            "sentiment_confidence": confidence,
+        })
+    return enriched
@@ -1,7 +1,10 @@
-from fastapi import FastAPI, UploadFile, File, Form
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from starlette.concurrency import run_in_threadpool
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+from pydantic import BaseModel
+from datetime import datetime
+from typing import List, Optional
 import os
 import shutil
 import sys
@@ -10,8 +13,13 @@ import sys
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from services.speech_to_text import transcribe_audio
-from services.nlp_engine import NLPEngine
-from services.context_analyzer import analyze_meeting, analyze_sales
+from services.nlp_engine import NLPEngine, SOURCE_LEXICON, STREAM_MICRO_BATCH
+from services.context_analyzer import analyze_transcript
+from services.analysis_cache import AnalysisCache, StoredAnalysis
+from services.analysis_store import ANALYSIS_DB_PATH, AnalysisStore
+from services.response_encoding import encode_line, encoded_response, OFFLOAD_MIN_SEGMENTS
+from services.projection import DEFAULT_PAGE_SIZE, carries_segments, page_segments, parse_fields, project
+from utils.config_loader import ConfigValidationError, ConfigWatcher, ProfileCache, current_config
 
 app = FastAPI(
     title="TalkSense AI",
@@ -31,6 +39,45 @@ app.add_middleware(
 )
 
 nlp_engine = NLPEngine()
+# Hot reload of config/keywords.json (TALKSENSE_CONFIG_RELOAD_INTERVAL, 0 = off)
+config_watcher = ConfigWatcher()
+# Per-tenant keyword profiles (config/profiles/<id>.json), compiled on first use
+profile_cache = ProfileCache()
+# Recent analyses, so transcript corrections re-enrich only what changed
+analysis_cache = AnalysisCache()
+# Analysis history on disk (TALKSENSE_ANALYSIS_DB, "" = off); opened on startup
+analysis_store = None
+
+@app.on_event("startup")
+def start_sentiment_batcher():
+    # One inference loop shared by all in-flight /analyze requests
+    nlp_engine.start_batching()
+
+@app.on_event("startup")
+def start_config_watcher():
+    # Compile (or load from the snapshot cache) before the first request
+    current_config().compile_all()
+    config_watcher.start()
+
+@app.on_event("startup")
+def open_analysis_store():
+    global analysis_store
+    if ANALYSIS_DB_PATH:
+        analysis_store = AnalysisStore(ANALYSIS_DB_PATH)
+
+@app.on_event("shutdown")
+def stop_sentiment_batcher():
+    nlp_engine.stop_batching()
+
+@app.on_event("shutdown")
+def stop_config_watcher():
+    config_watcher.stop()
+
+@app.on_event("shutdown")
+def close_analysis_store():
+    # Writes queued by the last requests are committed before exit
+    if analysis_store is not None:
+        analysis_store.close()
 
 UPLOAD_DIR = "uploads"
 
@@ -42,12 +89,145 @@ def health_check():
     Returns:
         dict: Status message indicating backend is running
     """
-    return {"status": "TalkSense AI backend running"}
+    return {
+        "status": "TalkSense AI backend running",
+        "config_version": current_config().version,
+        "profile_cache": profile_cache.stats(),
+        "analysis_cache": analysis_cache.stats(),
+        "analysis_store": analysis_store.stats() if analysis_store is not None else None
+    }
+
+def save_upload(input_file, output_path):
+    """Helper function to save uploaded file to disk."""
+    with open(output_path, "wb") as buffer:
+        shutil.copyfileobj(input_file, buffer)
+
+def remove_upload(file_path):
+    """Clean up uploaded file to prevent disk space accumulation."""
+    if os.path.exists(file_path):
+        try:
+            os.remove(file_path)
+        except Exception:
+            # Log error in production, but don't fail the response
+            pass
+
+def resolve_config(profile):
+    """
+    The keyword config for this request: the live base config, or the
+    `profile` overlay on top of it (404 if unknown, 422 if invalid).
+    """
+    if not profile:
+        return current_config()
+    try:
+        return profile_cache.get(profile)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e.args[0]))
+    except ConfigValidationError as e:
+        raise HTTPException(status_code=422, detail=f"Invalid config profile {profile}: {e}")
+
+def run_analyzer(mode, transcript_text, enriched_segments, config=None):
+    """Mode-specific context analysis (blocking; call from a thread)."""
+    return analyze_transcript(mode, transcript_text, enriched_segments, config=config)
+
+def segments_to_json(segments):
+    """Segments stay slotted objects through the pipeline; dicts only at the response boundary."""
+    return [seg.to_dict() for seg in segments]
+
+def check_fields(fields):
+    """Validates a `fields` projection up front (422 on a malformed path)."""
+    try:
+        parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+def project_fields(content: dict, fields):
+    """`content` narrowed to `fields` (see services/projection.py); analysis_id is always kept."""
+    return project(content, fields, always=("analysis_id",)) if fields else content
+
+async def negotiated_response(request: Request, content: dict, segments: int = 0, fields: str = None):
+    """
+    JSON (orjson) or MessagePack per `Accept`, gzip/brotli per `Accept-Encoding`;
+    large calls encode off the loop unless `fields` dropped their segments.
+    """
+    content = project_fields(content, fields)
+    if fields and not carries_segments(content):
+        segments = 0
+    return await encoded_response(content, request.headers.get("accept"), request.headers.get("accept-encoding"),
+                                  segments=segments)
+
+def persist_analysis(stored, filename=None, session_id=None):
+    """Queues `stored` for the analysis history (written in the background; no-op if disabled)."""
+    if analysis_store is not None:
+        analysis_store.save(stored, filename=filename, session_id=session_id)
+
+def remember_analysis(mode, profile, transcript_text, enriched_segments, config, insights,
+                      filename=None, session_id=None):
+    """Stores the enriched call for later transcript edits and retrieval. Returns its analysis_id."""
+    analysis_id = analysis_cache.new_id()
+    stored = analysis_cache.put(StoredAnalysis(analysis_id, mode, profile, transcript_text, enriched_segments,
+                                               config.version, insights=insights))
+    persist_analysis(stored, filename, session_id)
+    return analysis_id
+
+async def get_stored(analysis_id):
+    """The analysis from the cache, else from the history store (404 if in neither)."""
+    try:
+        return analysis_cache.get(analysis_id)
+    except KeyError as e:
+        if analysis_store is None:
+            raise HTTPException(status_code=404, detail=str(e.args[0]))
+    try:
+        stored = await run_in_threadpool(analysis_store.get, analysis_id)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e.args[0]))
+    return analysis_cache.put(stored)
+
+def parse_cursor(before):
+    """`next_before` of GET /analyses ("<created_at>:<analysis_id>") -> (created_at, analysis_id) (422 otherwise)."""
+    if before is None:
+        return None
+    created_at, _, analysis_id = before.partition(":")
+    try:
+        return float(created_at), analysis_id
+    except ValueError:
+        raise HTTPException(status_code=422, detail=f"Invalid before cursor: {before!r}")
+
+def parse_time(value, name):
+    """Epoch seconds or an ISO 8601 timestamp -> epoch seconds (422 otherwise)."""
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        raise HTTPException(status_code=422, detail=f"Invalid {name}: {value!r} (epoch seconds or ISO 8601)")
+
+def is_degraded(enriched_segments):
+    # True when some sentiment came from the lexicon fallback (model missing/overloaded)
+    return any(seg.get("sentiment_source") == SOURCE_LEXICON for seg in enriched_segments)
+
+async def transcribe_upload(file: UploadFile):
+    """Saves the upload and runs Speech-to-Text. Returns (file_path, raw_transcript_data)."""
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    file_path = os.path.join(UPLOAD_DIR, file.filename)
+
+    await run_in_threadpool(save_upload, file.file, file_path)
+
+    # Whisper releases GIL, so threads are effective
+    raw_transcript_data = await run_in_threadpool(transcribe_audio, file_path)
+    return file_path, raw_transcript_data
 
 @app.post("/analyze")
 async def analyze_audio(
+    request: Request,
     file: UploadFile = File(...),
-    mode: str = Form("meeting")  # Explicitly mark as Form field
+    mode: str = Form("meeting"),  # Explicitly mark as Form field
+    profile: str = Form(None),
+    fields: str = Form(None),
+    session_id: str = Form(None)
 ):
     """
     Main analysis endpoint for processing audio files.
@@ -59,66 +239,263 @@ async def analyze_audio(
     
     Args:
         file: Audio file upload (mp3, wav, m4a)
-        mode: Analysis mode - "meeting" or "sales" (default: "meeting")
+        mode: Analysis mode - "meeting", "sales", "both" (both analyses from one
+            shared pass) or "auto" (detects the conversation type) (default: "meeting")
+        profile: Optional keyword config profile ID (config/profiles/<id>.json over keywords.json)
+        fields: Optional projection, e.g. "insights.summary,insights.quality" or
+            "-insights.transcript" (see services/projection.py)
+        session_id: Optional client session / meeting series ID, for GET /analyses?session_id=
     
     Returns:
-        JSONResponse: Structured analysis results including transcript and insights
+        Response: Structured analysis results including transcript and insights.
+            JSON by default; MessagePack with `Accept: application/msgpack`;
+            gzip/brotli compressed per `Accept-Encoding`
     
     Raises:
         HTTPException: If file processing fails or invalid mode provided
     """
-    os.makedirs(UPLOAD_DIR, exist_ok=True)
     file_path = os.path.join(UPLOAD_DIR, file.filename)
-
-    def save_upload(input_file, output_path):
-        """Helper function to save uploaded file to disk."""
-        with open(output_path, "wb") as buffer:
-            shutil.copyfileobj(input_file, buffer)
+    check_fields(fields)
+    # One keyword config version for the whole request, even if a reload lands meanwhile
+    config = await run_in_threadpool(resolve_config, profile)
 
     try:
-        await run_in_threadpool(save_upload, file.file, file_path)
-
         # 1. Speech-to-Text (Blocking -> ThreadPool)
-        # Whisper releases GIL, so threads are effective
-        raw_transcript_data = await run_in_threadpool(transcribe_audio, file_path)
+        file_path, raw_transcript_data = await transcribe_upload(file)
         # Extract just the segments list (assuming transcribe_audio returns a dict with "segments")
         raw_segments = raw_transcript_data.get("segments", [])
 
         # 2. NLP Enrichment (Sentiment + Keywords) (Blocking -> ThreadPool)
         # Transformers pipeline also releases GIL
-        enriched_segments = await run_in_threadpool(nlp_engine.enrich_transcript, raw_segments)
+        enrichment_stats = {}
+        enriched_segments = await run_in_threadpool(
+            nlp_engine.enrich_transcript, raw_segments, stats=enrichment_stats, config=config
+        )
 
         # 3. Context Analysis
         # Prepare data structure expected by analyzers and frontend
         final_transcript = {
             "text": raw_transcript_data.get("text", ""),
-            "segments": enriched_segments
+            "segments": segments_to_json(enriched_segments)
         }
 
-        insights = {}
-        if mode == "sales":
-            # analyze_sales expects a list of segments
-            insights = await run_in_threadpool(analyze_sales, enriched_segments)
-        else:
-            # Default to meeting mode
-            insights = await run_in_threadpool(analyze_meeting, final_transcript)
+        insights = await run_in_threadpool(run_analyzer, mode, final_transcript["text"], enriched_segments, config)
+        analysis_id = remember_analysis(mode, profile, final_transcript["text"], enriched_segments, config, insights,
+                                        filename=file.filename, session_id=session_id)
 
         # 4. Construct Final Response
-        return JSONResponse(
-            content={
+        return await negotiated_response(
+            request,
+            {
+                "analysis_id": analysis_id,
                 "filename": file.filename,
                 "mode": mode,
                 "transcript": final_transcript,  # Use the enriched version with sentiment
-                "insights": insights
-            }
+                "insights": insights,
+                "enrichment_stats": enrichment_stats,
+                "sentiment_degraded": is_degraded(enriched_segments),
+                "config_version": config.version
+            },
+            segments=len(enriched_segments),
+            fields=fields
         )
     
     finally:
-        # Clean up uploaded file to prevent disk space accumulation
-        if os.path.exists(file_path):
-            try:
-                os.remove(file_path)
-            except Exception:
-                # Log error in production, but don't fail the response
-                pass
+        remove_upload(file_path)
+
+@app.post("/analyze/stream")
+async def analyze_audio_stream(
+    file: UploadFile = File(...),
+    mode: str = Form("meeting"),
+    profile: str = Form(None),
+    fields: str = Form(None),
+    session_id: str = Form(None)
+):
+    """
+    Streaming variant of /analyze (NDJSON, one JSON object per line).
+
+    Enrichment runs as generator stages (merge -> keywords -> micro-batched
+    sentiment), so segment lines are sent as soon as their micro-batch is scored:
+        {"type": "segment", "segment": {...}}      (one per enriched segment)
+        {"type": "insights", "insights": {...}, ...} (last line)
+    `fields` projects the insights line like /analyze; `session_id` is stored as for /analyze.
+    """
+    file_path = os.path.join(UPLOAD_DIR, file.filename)
+    check_fields(fields)
+    config = await run_in_threadpool(resolve_config, profile)
+    try:
+        file_path, raw_transcript_data = await transcribe_upload(file)
+    except Exception:
+        remove_upload(file_path)
+        raise
+
+    raw_segments = raw_transcript_data.get("segments", [])
+    transcript_text = raw_transcript_data.get("text", "")
+
+    async def event_stream():
+        enrichment_stats = {}
+        enriched_segments = []
+        try:
+            stages = nlp_engine.iter_enriched(
+                raw_segments,
+                stats=enrichment_stats,
+                micro_batch=STREAM_MICRO_BATCH,
+                config=config
+            )
+            async for segment in iterate_in_threadpool(stages):
+                enriched_segments.append(segment)
+                yield encode_line({"type": "segment", "segment": segment.to_dict()})
+
+            insights = await run_in_threadpool(run_analyzer, mode, transcript_text, enriched_segments, config)
+            analysis_id = remember_analysis(mode, profile, transcript_text, enriched_segments, config, insights,
+                                            filename=file.filename, session_id=session_id)
+            final = {
+                "type": "insights",
+                "analysis_id": analysis_id,
+                "filename": file.filename,
+                "mode": mode,
+                "insights": insights,
+                "enrichment_stats": enrichment_stats,
+                "sentiment_degraded": is_degraded(enriched_segments),
+                "config_version": config.version
+            }
+            if fields:
+                final = {"type": "insights", **project_fields(final, fields)}
+            # The insights line repeats the whole transcript: encode long calls off the loop
+            if len(enriched_segments) >= OFFLOAD_MIN_SEGMENTS and carries_segments(final):
+                yield await run_in_threadpool(encode_line, final)
+            else:
+                yield encode_line(final)
+        finally:
+            remove_upload(file_path)
+
+    return StreamingResponse(event_stream(), media_type="application/x-ndjson")
 
+class SegmentEdit(BaseModel):
+    start: float
+    end: float
+    text: str
+
+class TranscriptEdit(BaseModel):
+    segments: List[SegmentEdit]
+    text: Optional[str] = None
+    mode: Optional[str] = None
+
+@app.put("/analyses/{analysis_id}/transcript")
+async def edit_transcript(request: Request, analysis_id: str, edit: TranscriptEdit, fields: Optional[str] = None):
+    """
+    Applies transcript corrections to a stored analysis (the `analysis_id` of
+    an /analyze response) and returns updated insights without re-uploading.
+
+    `segments` is the corrected transcript (start, end, text per segment).
+    Only changed or re-merged segments get keyword extraction and sentiment;
+    the rest reuse their stored enrichment. The analysis keeps its profile
+    and, unless `mode` is given, its mode. `text` defaults to the joined segments.
+    `fields` (query) projects the response like /analyze.
+    """
+    check_fields(fields)
+    stored = await get_stored(analysis_id)
+    config = await run_in_threadpool(resolve_config, stored.profile)
+    mode = edit.mode or stored.mode
+
+    enrichment_stats = {}
+    enriched_segments = await run_in_threadpool(
+        nlp_engine.reenrich, stored.segments, [seg.model_dump() for seg in edit.segments],
+        stats=enrichment_stats, rekey=config.version != stored.config_version, config=config
+    )
+    transcript_text = edit.text if edit.text is not None else " ".join(seg.text.strip() for seg in enriched_segments)
+    insights = await run_in_threadpool(run_analyzer, mode, transcript_text, enriched_segments, config)
+
+    revision = stored.revision + 1
+    persist_analysis(analysis_cache.put(StoredAnalysis(analysis_id, mode, stored.profile, transcript_text,
+                                                       enriched_segments, config.version, revision, insights)))
+    return await negotiated_response(
+        request,
+        {
+            "analysis_id": analysis_id,
+            "revision": revision,
+            "mode": mode,
+            "transcript": {"text": transcript_text, "segments": segments_to_json(enriched_segments)},
+            "insights": insights,
+            "enrichment_stats": enrichment_stats,
+            "sentiment_degraded": is_degraded(enriched_segments),
+            "config_version": config.version
+        },
+        segments=len(enriched_segments),
+        fields=fields
+    )
+
+@app.get("/analyses")
+async def list_analyses(
+    request: Request,
+    mode: Optional[str] = None,
+    session_id: Optional[str] = None,
+    meeting_health: Optional[str] = None,
+    meeting_quality: Optional[str] = None,
+    sales_quality: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    before: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=1000)
+):
+    """
+    Analysis history, newest first, from the indexed store (no reprocessing):
+    e.g. ?meeting_health=at_risk&since=2026-10-12 for this week's at-risk
+    meetings. `since` / `until` take epoch seconds or ISO 8601; for the next
+    page pass `before` = the response's `next_before` cursor. Summaries only:
+    fetch one with GET /analyses/{analysis_id}.
+    """
+    if analysis_store is None:
+        raise HTTPException(status_code=503, detail="Analysis history is disabled (TALKSENSE_ANALYSIS_DB)")
+    analyses = await run_in_threadpool(
+        analysis_store.query, mode=mode, session_id=session_id, meeting_health=meeting_health,
+        meeting_quality=meeting_quality, sales_quality=sales_quality,
+        since=parse_time(since, "since"), until=parse_time(until, "until"), before=parse_cursor(before),
+        limit=limit
+    )
+    last = analyses[-1] if len(analyses) == limit else None
+    next_before = f"{last['created_at']!r}:{last['analysis_id']}" if last else None
+    return await negotiated_response(request, {"analyses": analyses, "next_before": next_before})
+
+@app.get("/analyses/{analysis_id}")
+async def get_analysis(request: Request, analysis_id: str, fields: Optional[str] = None):
+    """
+    A stored analysis in the /analyze shape. List views should pass `fields`,
+    e.g. fields=insights.summary,insights.quality,insights.key_insights
+    returns a few KB instead of the full transcript (twice).
+    """
+    check_fields(fields)
+    stored = await get_stored(analysis_id)
+    return await negotiated_response(
+        request,
+        {
+            "analysis_id": stored.analysis_id,
+            "revision": stored.revision,
+            "mode": stored.mode,
+            "transcript": {"text": stored.text, "segments": segments_to_json(stored.segments)},
+            "insights": stored.insights,
+            "sentiment_degraded": is_degraded(stored.segments),
+            "config_version": stored.config_version
+        },
+        segments=len(stored.segments),
+        fields=fields
+    )
+
+@app.get("/analyses/{analysis_id}/segments")
+async def get_analysis_segments(
+    request: Request,
+    analysis_id: str,
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1)
+):
+    """
+    Enriched segments of a stored analysis, one page at a time: segments
+    starting in [start, end) seconds (both optional), `limit` per page from
+    `offset`. Follow `next_offset` until it is null.
+    """
+    stored = await get_stored(analysis_id)
+    page = page_segments(stored.timeline, start, end, offset, limit)
+    page["segments"] = segments_to_json(page["segments"])
+    return await negotiated_response(request, {"analysis_id": analysis_id, "revision": stored.revision, **page})
@@ -0,0 +1,200 @@
+"""
+Offline bulk rescoring of stored enriched transcripts.
+
+Re-runs the context analyzers (after a keywords.json or analyzer change)
+without audio, Whisper or the sentiment model. Only the rule-based analyzers
+are imported, never torch / transformers / whisper.
+
+Input: JSONL, one call per line. Either an /analyze response
+({"mode", "transcript": {"text", "segments"}, ...}) or a bare record
+({"id", "mode", "text", "segments"}). Output: JSONL, one line per call:
+    {"id", "source", "mode", "insights", "config_version"}   or   {"id", "source", "error"}
+
+Sentiment aggregates (counts, overall call sentiment, business score) are
+computed column-wise for a whole chunk at once (services/sentiment_columns.py).
+
+Progress is checkpointed after every written chunk; re-running the same
+command resumes where it stopped (use --restart to start over).
+
+Usage (from backend/):
+    python rescore.py archive/*.jsonl --output rescored.jsonl [--mode sales] [--workers 8] [--chunk-size 64]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.context_analyzer import analyze_transcript
+from services.sentiment_columns import precomputed_sentiment
+from utils.config_loader import current_config, pinned_config
+
+def record_transcript(record: dict):
+    """Returns (text, segments) of a stored response or bare record."""
+    source = record["transcript"] if isinstance(record.get("transcript"), dict) else record
+    return source.get("text", ""), source.get("segments", [])
+
+def rescore_record(record: dict, mode: str = None, config=None, sentiment: dict = None) -> dict:
+    config = config or current_config()
+    mode = mode or record.get("mode") or "meeting"
+    text, segments = record_transcript(record)
+    return {"mode": mode, "insights": analyze_transcript(mode, text, segments, config=config, sentiment=sentiment),
+            "config_version": config.version}
+
+def chunk_sentiment(records: list, config) -> list:
+    """
+    Sentiment aggregates of every record in a chunk, from one columnar pass.
+    None for unreadable records, or for all of them if the pass fails; those
+    calls fall back to the scalar functions (and report their own errors).
+    """
+    calls = []
+    for record in records:
+        try:
+            calls.append(record_transcript(record)[1])
+        except Exception:
+            calls.append([])
+    try:
+        with pinned_config(config):
+            return precomputed_sentiment(calls)
+    except Exception:
+        return [None] * len(records)
+
+def rescore_chunk(path: str, lines: list, mode: str = None):
+    """Worker: rescores [(line_no, raw_line)]. Returns (output JSON lines, error count)."""
+    out = []
+    errors = 0
+    config = current_config()  # one keyword config version per chunk
+    entries = []  # (source, parsed record or its parse error)
+    for line_no, raw in lines:
+        if not raw.strip():
+            continue
+        try:
+            record = json.loads(raw)
+        except ValueError as e:
+            record = e
+        entries.append((f"{path}:{line_no}", record))
+
+    sentiment = chunk_sentiment([record for _, record in entries], config)
+    for (source, record), call_sentiment in zip(entries, sentiment):
+        record_id = source
+        try:
+            if isinstance(record, Exception):
+                raise record
+            record_id = record.get("id") or record.get("session_id") or source
+            result = {"id": record_id, "source": source, **rescore_record(record, mode, config, call_sentiment)}
+        except Exception as e:
+            # One bad record must not stop an archive-wide run
+            result = {"id": record_id, "source": source, "error": f"{type(e).__name__}: {e}"}
+            errors += 1
+        out.append(json.dumps(result))
+    return out, errors
+
+def load_checkpoint(checkpoint_path: str) -> dict:
+    if os.path.exists(checkpoint_path):
+        with open(checkpoint_path, encoding="utf-8") as f:
+            return json.load(f)
+    return {"files": {}, "output_offset": 0}
+
+def save_checkpoint(checkpoint_path: str, checkpoint: dict):
+    # Write-then-rename so a crash never leaves a torn checkpoint
+    tmp_path = checkpoint_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp_path, checkpoint_path)
+
+def rescore(inputs, output: str, mode: str = None, workers: int = None, chunk_size: int = 64,
+            checkpoint_path: str = None, restart: bool = False, report_every: float = 5.0) -> dict:
+    """
+    Rescores every call in `inputs` into `output`. Chunks of `chunk_size`
+    lines are analyzed in a process pool (threads in-process for workers=1)
+    and written in input order. Returns {"calls", "errors", "seconds", "calls_per_second"}.
+    """
+    workers = workers or os.cpu_count() or 1
+    checkpoint_path = checkpoint_path or output + ".ckpt"
+    if restart and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    checkpoint = load_checkpoint(checkpoint_path)
+    if not os.path.exists(output):
+        checkpoint = {"files": {}, "output_offset": 0}
+
+    # Drop anything written after the last checkpoint (partial chunk of a crashed run).
+    # Binary mode, so the offset is a plain byte position
+    out = open(output, "r+b" if checkpoint["output_offset"] else "wb")
+    out.truncate(checkpoint["output_offset"])
+    out.seek(checkpoint["output_offset"])
+
+    # Compiled once here (and cached on disk), not in every worker
+    current_config().compile_all()
+    executor = ProcessPoolExecutor(workers) if workers > 1 else ThreadPoolExecutor(1)
+    calls = errors = 0
+    started = last_report = time.perf_counter()
+
+    def write(lines_done, path, result):
+        nonlocal calls, errors, last_report
+        chunk_out, chunk_errors = result
+        for line in chunk_out:
+            out.write(line.encode("utf-8") + b"\n")
+        calls += len(chunk_out)
+        errors += chunk_errors
+        out.flush()
+        checkpoint["files"][path] = lines_done
+        checkpoint["output_offset"] = out.tell()
+        save_checkpoint(checkpoint_path, checkpoint)
+
+        now = time.perf_counter()
+        if now - last_report >= report_every:
+            last_report = now
+            print(f"rescore: {calls} calls, {calls / (now - started):.1f} calls/s", file=sys.stderr)
+
+    try:
+        for path in inputs:
+            done = checkpoint["files"].get(path, 0)
+            with open(path, encoding="utf-8") as f:
+                numbered = islice(enumerate(f, 1), done, None)
+                # Bounded in-flight chunks keep memory flat on huge archives
+                pending = deque()
+                for chunk in iter(lambda: list(islice(numbered, chunk_size)), []):
+                    pending.append((chunk[-1][0], executor.submit(rescore_chunk, path, chunk, mode)))
+                    if len(pending) >= 2 * workers:
+                        lines_done, future = pending.popleft()
+                        write(lines_done, path, future.result())
+                while pending:
+                    lines_done, future = pending.popleft()
+                    write(lines_done, path, future.result())
+    finally:
+        executor.shutdown()
+        out.close()
+
+    seconds = time.perf_counter() - started
+    return {
+        "calls": calls,
+        "errors": errors,
+        "seconds": round(seconds, 3),
+        "calls_per_second": round(calls / seconds, 1) if seconds > 0 else 0.0,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("inputs", nargs="+", help="Enriched transcript JSONL files")
+    parser.add_argument("--output", required=True, help="Result JSONL file")
+    parser.add_argument("--mode", choices=["meeting", "sales", "both", "auto"],
+                        help="Analysis mode (default: each record's own mode, else meeting)")
+    parser.add_argument("--workers", type=int, default=None, help="Processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=64, help="Calls per worker task")
+    parser.add_argument("--checkpoint", default=None, help="Checkpoint file (default: <output>.ckpt)")
+    parser.add_argument("--restart", action="store_true", help="Ignore an existing checkpoint")
+    args = parser.parse_args(argv)
+
+    stats = rescore(args.inputs, args.output, mode=args.mode, workers=args.workers,
+                    chunk_size=args.chunk_size, checkpoint_path=args.checkpoint, restart=args.restart)
+    print(f"rescored {stats['calls']} calls ({stats['errors']} errors) in {stats['seconds']}s: "
+          f"{stats['calls_per_second']} calls/s")
+    return stats
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+import os
+import threading
+import uuid
+from collections import OrderedDict
+
+from services.time_index import TimeIndex
+
+# Analyses kept for transcript corrections (PUT /analyses/{id}/transcript)
+ANALYSIS_CACHE_SIZE = int(os.environ.get("TALKSENSE_ANALYSIS_CACHE_SIZE", "256"))
+
+class StoredAnalysis:
+    """
+    One analyzed call as needed to re-run it after an edit: the enriched
+    segments (keywords and sentiment are reused for unchanged ones), the
+    request's mode and profile, and the keyword config version the keyword
+    flags were computed with. `revision` counts applied edits. `insights`
+    and the segments' time index serve GET /analyses/{id} and its segment pages.
+    """
+
+    __slots__ = ("analysis_id", "mode", "profile", "text", "segments", "config_version", "revision",
+                 "insights", "_timeline")
+
+    def __init__(self, analysis_id: str, mode: str, profile: str, text: str, segments: list,
+                 config_version: str, revision: int = 0, insights: dict = None):
+        self.analysis_id = analysis_id
+        self.mode = mode
+        self.profile = profile
+        self.text = text
+        self.segments = segments
+        self.config_version = config_version
+        self.revision = revision
+        self.insights = insights
+        self._timeline = None
+
+    @property
+    def timeline(self) -> TimeIndex:
+        """Start-time index of the segments, built on first use."""
+        if self._timeline is None:
+            self._timeline = TimeIndex(self.segments)
+        return self._timeline
+
+class AnalysisCache:
+    """
+    Bounded, thread-safe LRU of StoredAnalysis by analysis ID. Entries are
+    replaced, never mutated, so a reader keeps a consistent snapshot while an
+    edit of the same analysis is being applied.
+    """
+
+    def __init__(self, maxsize: int = ANALYSIS_CACHE_SIZE):
+        self.maxsize = max(1, int(maxsize))
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    @staticmethod
+    def new_id() -> str:
+        return uuid.uuid4().hex
+
+    def put(self, analysis: StoredAnalysis) -> StoredAnalysis:
+        with self._lock:
+            self._entries[analysis.analysis_id] = analysis
+            self._entries.move_to_end(analysis.analysis_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return analysis
+
+    def get(self, analysis_id: str) -> StoredAnalysis:
+        """The stored analysis. Raises KeyError if unknown or evicted."""
+        with self._lock:
+            analysis = self._entries.get(analysis_id)
+            if analysis is None:
+                raise KeyError(f"Unknown or expired analysis: {analysis_id}")
+            self._entries.move_to_end(analysis_id)
+            return analysis
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"size": len(self._entries), "maxsize": self.maxsize, "evictions": self.evictions}
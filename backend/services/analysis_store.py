@@ -0,0 +1,296 @@
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+from services.analysis_cache import StoredAnalysis
+from services.response_encoding import encode_body
+from services.segment import Segment, segment_extra
+
+logger = logging.getLogger(__name__)
+
+# SQLite file for analysis history ("" = no persistence)
+ANALYSIS_DB_PATH = os.environ.get(
+    "TALKSENSE_ANALYSIS_DB",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "analyses.db"),
+)
+# Group commit: up to this many queued analyses per write transaction ...
+STORE_BATCH_SIZE = int(os.environ.get("TALKSENSE_STORE_BATCH_SIZE", "64"))
+# ... waiting at most this long for a batch to fill
+STORE_FLUSH_MS = float(os.environ.get("TALKSENSE_STORE_FLUSH_MS", "20"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS analyses (
+    analysis_id     TEXT PRIMARY KEY,
+    session_id      TEXT,
+    filename        TEXT,
+    mode            TEXT NOT NULL,
+    profile         TEXT,
+    config_version  TEXT,
+    revision        INTEGER NOT NULL DEFAULT 0,
+    created_at      REAL NOT NULL,
+    updated_at      REAL NOT NULL,
+    meeting_quality TEXT,
+    sales_quality   TEXT,
+    meeting_health  TEXT,
+    segment_count   INTEGER NOT NULL,
+    text            TEXT,
+    insights        BLOB
+);
+CREATE INDEX IF NOT EXISTS analyses_session ON analyses (session_id, created_at, analysis_id);
+CREATE INDEX IF NOT EXISTS analyses_created ON analyses (created_at, analysis_id);
+CREATE INDEX IF NOT EXISTS analyses_mode ON analyses (mode, created_at, analysis_id);
+CREATE INDEX IF NOT EXISTS analyses_meeting_quality ON analyses (meeting_quality, created_at, analysis_id);
+CREATE INDEX IF NOT EXISTS analyses_sales_quality ON analyses (sales_quality, created_at, analysis_id);
+CREATE INDEX IF NOT EXISTS analyses_meeting_health ON analyses (meeting_health, created_at, analysis_id);
+
+CREATE TABLE IF NOT EXISTS segments (
+    analysis_id TEXT NOT NULL REFERENCES analyses (analysis_id) ON DELETE CASCADE,
+    position    INTEGER NOT NULL,
+    start       REAL NOT NULL,
+    "end"       REAL NOT NULL,
+    text        TEXT NOT NULL,
+    keywords    TEXT,
+    sentiment   REAL,
+    sentiment_label      TEXT,
+    sentiment_confidence REAL,
+    sentiment_source     TEXT,
+    parts       TEXT,
+    extra       TEXT,
+    PRIMARY KEY (analysis_id, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS segments_start ON segments (analysis_id, start);
+"""
+
+# Columns returned by query() (no transcript, no insights)
+SUMMARY_COLUMNS = ("analysis_id", "session_id", "filename", "mode", "profile", "config_version", "revision",
+                   "created_at", "updated_at", "meeting_quality", "sales_quality", "meeting_health", "segment_count")
+
+_STOP = object()
+
+def index_columns(insights: dict) -> dict:
+    """Indexed labels of an analysis: meeting_quality, sales_quality, meeting_health (None if not in this mode)."""
+    results = [insights.get("meeting"), insights.get("sales")] if insights.get("mode") == "both" else [insights]
+    columns = {"meeting_quality": None, "sales_quality": None, "meeting_health": None}
+    for result in results:
+        if not result:
+            continue
+        if result.get("mode") == "sales":
+            columns["sales_quality"] = (result.get("quality") or {}).get("label")
+        else:
+            columns["meeting_quality"] = (result.get("meeting_quality") or {}).get("label")
+            columns["meeting_health"] = result.get("meeting_health")
+    return columns
+
+def _segment_row(analysis_id: str, position: int, seg) -> tuple:
+    parts = seg.get("parts")
+    extra = segment_extra(seg)
+    return (analysis_id, position, seg["start"], seg["end"], seg["text"], json.dumps(seg.get("keywords", [])),
+            seg.get("sentiment", 0.0), seg.get("sentiment_label", "Neutral"), seg.get("sentiment_confidence", 0.0),
+            seg.get("sentiment_source", "none"), json.dumps(parts) if parts else None,
+            json.dumps(extra) if extra else None)
+
+def _row_segment(row) -> Segment:
+    start, end, text, keywords, sentiment, label, confidence, source, parts, extra = row
+    return Segment.from_dict({
+        **(json.loads(extra) if extra else {}),
+        "start": start, "end": end, "text": text, "keywords": json.loads(keywords or "[]"),
+        "sentiment": sentiment, "sentiment_label": label, "sentiment_confidence": confidence,
+        "sentiment_source": source, "parts": json.loads(parts) if parts else None,
+    })
+
+class AnalysisStore:
+    """
+    Persistent analysis history in SQLite (WAL mode): analyses with their
+    insights and indexed labels, plus their enriched segments.
+
+    - Writes are queued and applied by one writer thread in batched
+      transactions (group commit); SQLite has a single writer anyway, so
+      requests never wait on the disk. flush() waits for the queue.
+    - Reads use one connection per thread; WAL lets them run while a batch commits.
+    """
+
+    def __init__(self, path: str = ANALYSIS_DB_PATH, batch_size: int = STORE_BATCH_SIZE,
+                 flush_ms: float = STORE_FLUSH_MS):
+        self.path = path
+        self.batch_size = max(1, int(batch_size))
+        self.flush_seconds = flush_ms / 1000
+        self.written = 0
+        self.batches = 0
+        self.failures = 0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.executescript(SCHEMA)
+            # Databases created before segments kept their extra fields
+            if "extra" not in {column[1] for column in conn.execute("PRAGMA table_info(segments)")}:
+                conn.execute("ALTER TABLE segments ADD COLUMN extra TEXT")
+        finally:
+            conn.close()
+
+        self._local = threading.local()
+        self._readers = []
+        self._readers_lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="analysis-store-writer", daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        return conn
+
+    def _reader(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+            conn.execute("PRAGMA query_only=ON")
+            with self._readers_lock:
+                self._readers.append(conn)
+        return conn
+
+    # --- Writes ---
+
+    def save(self, analysis: StoredAnalysis, filename: str = None, session_id: str = None,
+             created_at: float = None):
+        """
+        Queues an insert, or an update of an existing analysis (its created_at
+        is kept). `created_at` (epoch seconds) defaults to now; set it when backfilling.
+        """
+        now = time.time()
+        self._queue.put((analysis, filename, session_id, now if created_at is None else created_at, now))
+
+    def flush(self):
+        """Blocks until every queued analysis is written."""
+        self._queue.join()
+
+    def close(self):
+        self._queue.put(_STOP)
+        self._writer.join()
+        with self._readers_lock:
+            for conn in self._readers:
+                conn.close()
+            self._readers.clear()
+
+    def _write_loop(self):
+        conn = self._connect()
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                self._queue.task_done()
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.flush_seconds
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    self._queue.task_done()
+                    stopping = True
+                    break
+                batch.append(item)
+            try:
+                self._write(conn, batch)
+            except Exception as e:
+                self.failures += len(batch)
+                logger.error(f"Analysis store: failed to write {len(batch)} analyses: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+        conn.close()
+
+    def _write(self, conn: sqlite3.Connection, batch: list):
+        # One transaction per batch; saves are applied in order, so an
+        # analysis and its edit may share a batch
+        with conn:
+            for analysis, filename, session_id, created_at, now in batch:
+                insights = analysis.insights or {}
+                labels = index_columns(insights)
+                conn.execute("""
+                    INSERT INTO analyses (analysis_id, session_id, filename, mode, profile, config_version, revision,
+                                          created_at, updated_at, meeting_quality, sales_quality,
+                                          meeting_health, segment_count, text, insights)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (analysis_id) DO UPDATE SET
+                        session_id = COALESCE(excluded.session_id, session_id),
+                        filename = COALESCE(excluded.filename, filename),
+                        mode = excluded.mode, profile = excluded.profile, config_version = excluded.config_version,
+                        revision = excluded.revision, updated_at = excluded.updated_at,
+                        meeting_quality = excluded.meeting_quality, sales_quality = excluded.sales_quality,
+                        meeting_health = excluded.meeting_health, segment_count = excluded.segment_count,
+                        text = excluded.text, insights = excluded.insights
+                """, (
+                    analysis.analysis_id, session_id, filename, analysis.mode, analysis.profile,
+                    analysis.config_version, analysis.revision, created_at, now,
+                    labels["meeting_quality"], labels["sales_quality"], labels["meeting_health"],
+                    len(analysis.segments), analysis.text, encode_body(insights),
+                ))
+                conn.execute("DELETE FROM segments WHERE analysis_id = ?", (analysis.analysis_id,))
+                conn.executemany("INSERT INTO segments VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                 [_segment_row(analysis.analysis_id, i, seg) for i, seg in enumerate(analysis.segments)])
+        self.written += len(batch)
+        self.batches += 1
+
+    # --- Reads ---
+
+    def get(self, analysis_id: str) -> StoredAnalysis:
+        """The stored analysis with its segments. Raises KeyError if unknown."""
+        conn = self._reader()
+        row = conn.execute(
+            "SELECT mode, profile, text, config_version, revision, insights FROM analyses "
+            "WHERE analysis_id = ?",
+            (analysis_id,),
+        ).fetchone()
+        if row is None:
+            raise KeyError(f"Unknown analysis: {analysis_id}")
+        mode, profile, text, config_version, revision, insights = row
+        segments = [_row_segment(r) for r in conn.execute(
+            'SELECT start, "end", text, keywords, sentiment, sentiment_label, sentiment_confidence, '
+            "sentiment_source, parts, extra FROM segments WHERE analysis_id = ? ORDER BY position",
+            (analysis_id,),
+        )]
+        return StoredAnalysis(analysis_id, mode, profile, text, segments, config_version, revision,
+                              json.loads(insights) if insights else None)
+
+    def query(self, mode: str = None, session_id: str = None, meeting_health: str = None,
+              meeting_quality: str = None, sales_quality: str = None, since: float = None,
+              until: float = None, limit: int = 50, before: tuple = None) -> list:
+        """
+        Analysis summaries (SUMMARY_COLUMNS, newest first) matching every given
+        filter; `since` / `until` bound created_at (epoch seconds). Page with
+        `before` = (created_at, analysis_id) of the last row seen: analyses
+        sharing a timestamp are ordered by ID, so none is skipped. Served from
+        the indexes, without loading segments or insights.
+        """
+        filters, params = [], []
+        for column, value in (("mode", mode), ("session_id", session_id), ("meeting_health", meeting_health),
+                              ("meeting_quality", meeting_quality), ("sales_quality", sales_quality)):
+            if value is not None:
+                filters.append(f"{column} = ?")
+                params.append(value)
+        for clause, value in (("created_at >= ?", since), ("created_at < ?", until)):
+            if value is not None:
+                filters.append(clause)
+                params.append(value)
+        if before is not None:
+            filters.append("(created_at, analysis_id) < (?, ?)")
+            params.extend(before)
+        where = f"WHERE {' AND '.join(filters)}" if filters else ""
+        sql = (f"SELECT {', '.join(SUMMARY_COLUMNS)} FROM analyses {where} "
+               "ORDER BY created_at DESC, analysis_id DESC LIMIT ?")
+        rows = self._reader().execute(sql, params + [max(1, int(limit))]).fetchall()
+        return [dict(zip(SUMMARY_COLUMNS, row)) for row in rows]
+
+    def stats(self) -> dict:
+        return {"path": self.path, "queued": self._queue.qsize(), "written": self.written,
+                "batches": self.batches, "failures": self.failures}
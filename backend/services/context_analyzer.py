@@ -1,20 +1,35 @@
 import sys
 import os
-from collections import Counter
+from abc import ABC, abstractmethod
+from collections import Counter, deque
 
 # Ensure we can import from utils
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from utils.config_loader import KEYWORDS_CONFIG
-
-# Load Configured Keywords (or defaults)
-DECISION_KEYWORDS = KEYWORDS_CONFIG["meeting"]["decisions"]
-ACTION_KEYWORDS = KEYWORDS_CONFIG["meeting"]["actions"]
-
-# --- NEW: INDEPENDENT DETECTOR KEYWORDS ---
-OWNERSHIP_COMMITMENT_KEYWORDS = KEYWORDS_CONFIG["meeting"]["ownership_commitment"]
-DIRECTIONAL_DECISION_KEYWORDS = KEYWORDS_CONFIG["meeting"]["directional_decisions"]
-ISSUE_KEYWORDS = KEYWORDS_CONFIG["meeting"]["issues"]
-RISK_KEYWORDS = KEYWORDS_CONFIG["meeting"]["risks"]
+from utils.config_loader import active_config, current_config, pinned_config, register_compiler, KeywordConfig, DEFAULT_KEYWORDS
+from services.scoring_rules import SCORING_RULES
+from services.segment import segment_text_lower
+from services.feature_index import FeatureIndex
+from services.stage_graph import StageGraph
+from services.time_index import TimeIndex
+from utils.phrase_matcher import PhraseMatcher
+
+# Configured Keywords (config/keywords.json, or defaults) are read from the
+# active KeywordConfig, so a hot reload applies from the next request on
+def meeting_keywords(key: str) -> list:
+    """meeting.<key> phrases: decisions, actions, ownership_commitment, directional_decisions, issues, risks."""
+    return active_config().data["meeting"][key]
+
+def objection_keywords() -> dict:
+    """sales.objections: objection type -> phrases."""
+    return active_config().data["sales"]["objections"]
+
+def buying_signal_keywords() -> list:
+    """sales.buying_signals if configured (e.g. by a profile), else BUYING_SIGNAL_KEYWORDS."""
+    return active_config().data["sales"].get("buying_signals", BUYING_SIGNAL_KEYWORDS)
+
+def confidence_threshold(key: str) -> float:
+    """thresholds.<key>: objection_confidence (0.75) or sentiment_confidence (0.6)."""
+    return active_config().data.get("thresholds", {}).get(key, DEFAULT_KEYWORDS["thresholds"][key])
 
 # --- STREAMLINED CONSTANTS ---
 DECISION_PATTERNS = [
@@ -68,7 +83,6 @@ NEGATIVE_DECISION_PATTERNS = [
 ]
 
 # --- SALES MODE HELPERS ---
-OBJECTION_KEYWORDS = KEYWORDS_CONFIG["sales"]["objections"]
 
 NO_INTENT_TERMS = [
     "not planning to switch", "not switching", "not this quarter",
@@ -114,6 +128,12 @@ BUYING_SIGNAL_KEYWORDS = [
     "this is useful", "this helps", "solves our problem", "addresses our need"
 ]
 
+NEXT_STEP_TERMS = ["schedule next", "book a demo", "send the invite"]
+DECISION_MAKER_TERMS = ["i decide", "my budget", "authorization", "sign the contract", "decision maker"]
+HARD_COMMITMENT_TERMS = ["demo booked", "let's schedule", "calendar invite", "meeting on tuesday"]
+PROPOSAL_TERMS = ["proposal", "send proposal"]
+DEADLINE_TERMS = ["review", "by friday", "by monday", "by tuesday", "by wednesday", "by thursday"]
+
 def aggregate_sentiment(segments):
     counts = {
         "Positive": 0,
@@ -121,8 +141,8 @@ def aggregate_sentiment(segments):
         "Negative": 0
     }
 
-    for seg in segments:
-        label = seg.get("sentiment_label", "Neutral")
+    labels = segments.labels if isinstance(segments, FeatureIndex) else (seg.get("sentiment_label", "Neutral") for seg in segments)
+    for label in labels:
         if label in counts:
             counts[label] += 1
 
@@ -136,12 +156,8 @@ def detect_ownership_committed(segments):
     Returns True if ANY speaker commits to an action.
     MANDATORY: Ownership is NOT just keywords like "owner".
     """
-    for seg in segments:
-        text = seg.get("text", "").lower()
-        # Check for commitment patterns
-        if any(pattern in text for pattern in OWNERSHIP_COMMITMENT_KEYWORDS):
-            return True
-    return False
+    # Check for commitment patterns
+    return meeting_index(segments).any("ownership_commitment")
 
 def detect_decisions_made(segments):
     """
@@ -149,12 +165,8 @@ def detect_decisions_made(segments):
     Returns True if any direction is set.
     NOT just looking for "decided" - includes "we will", "next step is", etc.
     """
-    for seg in segments:
-        text = seg.get("text", "").lower()
-        # Check for directional decision patterns
-        if any(pattern in text for pattern in DIRECTIONAL_DECISION_KEYWORDS):
-            return True
-    return False
+    # Check for directional decision patterns
+    return meeting_index(segments).any("directional_decision")
 
 def detect_signals(segments):
     """
@@ -166,27 +178,19 @@ def detect_signals(segments):
     - Either it happened OR it didn't
     - Strength is a UI concern, not a logic concern
     """
-    ownership_detected = False
-    decision_detected = False
-    execution_decision_detected = False
-
-    for seg in segments:
-        text = seg.get("text", "")
+    index = meeting_index(segments)
 
-        # Check for ownership patterns
-        if not ownership_detected and any(p in text.lower() for p in OWNERSHIP_PATTERNS):
-            ownership_detected = True
+    # Check for ownership patterns
+    ownership_detected = index.any("ownership")
 
-        # Check for decisions (for display purposes)
-        if not decision_detected and any(d in text.lower() for d in DECISION_PATTERNS):
-            decision_detected = True
+    # Check for decisions (for display purposes)
+    decision_detected = index.any("decision")
 
-        # 🔒 HARD FREEZE: Check for execution decision
-        # Once TRUE, break immediately - no further evaluation
-        if not execution_decision_detected and is_valid_execution_decision(text):
-            execution_decision_detected = True
-            # FREEZE: Do NOT allow later logic to change this back
-            # No re-evaluation, no confidence downgrade, no "but maybe"
+    # 🔒 HARD FREEZE: Check for execution decision
+    # Once TRUE, it stays TRUE - no further evaluation
+    execution_decision_detected = any(index.flags["execution_decision"])
+    # FREEZE: Do NOT allow later logic to change this back
+    # No re-evaluation, no confidence downgrade, no "but maybe"
 
     return {
         "ownership": ownership_detected,
@@ -204,33 +208,21 @@ def detect_execution_attempted(segments):
     This checks if the conversation included actual execution-related
     discussions, not just preparatory or strategic talk.
     """
-    for seg in segments:
-        t = seg.get("text", "").lower()
-        if any(v in t for v in EXECUTION_VERBS):
-            return True
-    return False
+    return meeting_index(segments).any("execution_verb")
 
 def detect_issues_present(segments):
     """
     Non-punitive issue detection.
     Returns True if issues mentioned (signal only, not penalty).
     """
-    for seg in segments:
-        text = seg.get("text", "").lower()
-        if any(pattern in text for pattern in ISSUE_KEYWORDS):
-            return True
-    return False
+    return meeting_index(segments).any("issue")
 
 def detect_risks_present(segments):
     """
     Non-punitive risk detection.
     Returns True if risks mentioned (signal only, not penalty).
     """
-    for seg in segments:
-        text = seg.get("text", "").lower()
-        if any(pattern in text for pattern in RISK_KEYWORDS):
-            return True
-    return False
+    return meeting_index(segments).any("risk")
 
 # --- EXECUTIVE SIGNAL EXTRACTORS ---
 
@@ -253,14 +245,11 @@ def extract_primary_topic(segments):
     Extracts topic using controlled vocabulary buckets.
     Falls back to 'general discussion' if no bucket matches.
     """
-    scores = {k: 0 for k in TOPIC_KEYWORDS}
-
-    for seg in segments:
-        text = seg.get("text", "").lower()
-        for topic, keywords in TOPIC_KEYWORDS.items():
-            if any(k in text for k in keywords):
-                scores[topic] += 1
+    index = meeting_index(segments)
+    scores = {topic: index.count(f"topic:{topic}") for topic in TOPIC_KEYWORDS}
+    return _primary_topic(scores)
 
+def _primary_topic(scores):
     # Find the topic with the max score
     if not scores: # Safety check
         return "general discussion"
@@ -453,52 +442,22 @@ def compute_meeting_quality_v2(signals):
     
     Returns ONLY label (no score, no drivers, no side effects)
     This is the ONLY definition that preserves old outputs.
+    Rules: config/scoring_rules.json "meeting_quality".
     """
-    ownership = signals.get("ownership", False)
-    execution = signals.get("execution_decision", False)
-
-    if ownership and execution:
-        return {"label": "High"}
-
-    if ownership or execution:
-        return {"label": "Medium"}
-
-    return {"label": "Low"}
+    return SCORING_RULES["meeting_quality"].evaluate(signals)
 
 def compute_project_risk(issues_detected, risks_detected, uncontrolled_dependencies):
     """
     STEP 7: Separate "Meeting Quality" from "Project Risk".
     Computes Project Risk independently from meeting quality.
     This is about the PROJECT, not the MEETING.
+    Rules: config/scoring_rules.json "project_risk".
     """
-    risk_score = 0
-    drivers = []
-    
-    if issues_detected:
-        risk_score += 3
-        drivers.append("Issues identified")
-    
-    if risks_detected:
-        risk_score += 3
-        drivers.append("Risks flagged")
-    
-    if uncontrolled_dependencies:
-        risk_score += 4
-        drivers.append("Uncontrolled dependencies")
-    
-    # Map score to label
-    if risk_score >= 7:
-        label = "High"
-    elif risk_score >= 4:
-        label = "Medium"
-    else:
-        label = "Low"
-    
-    return {
-        "label": label,
-        "score": risk_score,
-        "drivers": drivers
-    }
+    return SCORING_RULES["project_risk"].evaluate({
+        "issues_detected": issues_detected,
+        "risks_detected": risks_detected,
+        "uncontrolled_dependencies": uncontrolled_dependencies,
+    })
 
 # --- OLD QUALITY ENGINE (DEPRECATED - KEPT FOR REFERENCE) ---
 
@@ -561,32 +520,41 @@ def compute_meeting_quality(signals, decisions, action_items, tension_points, ex
         "drivers": drivers
     }
 
-def assess_sales_signals(segments, objections, recommendations):
+def sales_text_blob(segments):
+    """Lowercased transcript joined with spaces (phrases may span segments)."""
+    if isinstance(segments, FeatureIndex):
+        return " ".join(segments.lowers)
+    return " ".join([segment_text_lower(s) for s in segments])
+
+def assess_sales_signals(segments, objections, recommendations, text_blob=None):
     """
     Extracts binary signals for Sales Quality.
     STEPS 1, 2, 3, 4 implemented here.
+    `segments` may be a list or a TimeIndex; `text_blob` can be passed in
+    when the caller already built it.
     """
-    text_blob = " ".join([s["text"].lower() for s in segments])
+    timeline = TimeIndex.of(segments)
+    if text_blob is None:
+        text_blob = sales_text_blob(timeline)
     
     # STEP 1: End-of-Call Commitment Override
     # Analyze last 20-25% of transcript
-    total_segments = len(segments)
-    end_start_idx = int(total_segments * 0.75)  # Last 25%
-    end_segments = segments[end_start_idx:]
-    
-    end_of_call_commitment = False
-    for seg in end_segments:
-        label = seg.get("sentiment_label", "Neutral")
-        confidence = seg.get("sentiment_confidence", 0)
-        text = seg["text"].lower()
-        
-        # Check for Positive/Neutral sentiment with confidence >= 0.6
-        if (label in ["Positive", "Neutral"]) and confidence >= 0.6:
-            # Check for commitment keywords
-            if any(keyword in text for keyword in COMMITMENT_KEYWORDS):
-                end_of_call_commitment = True
-                break
-    
+    end_segments = timeline.last_fraction(0.25)  # Last 25%
+    end_of_call_commitment = any(_is_end_commitment(seg) for seg in end_segments)
+
+    return _sales_signals_from_blob(text_blob, objections, recommendations, end_of_call_commitment)
+
+def _is_end_commitment(seg):
+    # Positive/Neutral sentiment with confidence >= 0.6 and a commitment keyword
+    label = seg.get("sentiment_label", "Neutral")
+    confidence = seg.get("sentiment_confidence", 0)
+    if (label in ["Positive", "Neutral"]) and confidence >= 0.6:
+        text = segment_text_lower(seg)
+        return any(keyword in text for keyword in COMMITMENT_KEYWORDS)
+    return False
+
+def _sales_signals_from_blob(text_blob, objections, recommendations, end_of_call_commitment):
+    """STEPS 2-4 of assess_sales_signals: every check is `term in text_blob`."""
     # STEP 2: Budget Alignment as Buying Signal
     budget_alignment = any(keyword in text_blob for keyword in BUDGET_ALIGNMENT_KEYWORDS)
     
@@ -596,7 +564,7 @@ def assess_sales_signals(segments, objections, recommendations):
     has_hard_authority_risk = any(term in text_blob for term in HARD_AUTHORITY_RISK_TERMS)
     
     # Check if next step and timeline exist
-    next_step_exists = len(recommendations) > 0 or any(t in text_blob for t in ["schedule next", "book a demo", "send the invite"])
+    next_step_exists = len(recommendations) > 0 or any(t in text_blob for t in NEXT_STEP_TERMS)
     timeline_exists = any(keyword in text_blob for keyword in COMMITMENT_KEYWORDS[:5])  # Day-specific keywords
     
     # Only flag decision_authority_risk if hard risk AND no next step AND no timeline
@@ -604,14 +572,12 @@ def assess_sales_signals(segments, objections, recommendations):
     shared_decision_making = has_soft_authority and not decision_authority_risk
     
     # 1. Decision Maker Identified
-    dm_terms = ["i decide", "my budget", "authorization", "sign the contract", "decision maker"]
-    decision_maker = any(t in text_blob for t in dm_terms)
+    decision_maker = any(t in text_blob for t in DECISION_MAKER_TERMS)
     
     # 2. Next Step Agreed
     next_step = next_step_exists
     
     # 2b. Hard Commitment
-    HARD_COMMITMENT_TERMS = ["demo booked", "let's schedule", "calendar invite", "meeting on tuesday"]
     hard_commitment = any(t in text_blob for t in HARD_COMMITMENT_TERMS)
     
     # STEP 1 Override: If end_of_call_commitment detected, upgrade to hard_commitment
@@ -633,7 +599,7 @@ def assess_sales_signals(segments, objections, recommendations):
     
     # STEP 4: Value Articulated - ONLY explicit buyer acknowledgment
     # REMOVED: ROI-based inference
-    value_articulated = any(keyword in text_blob for keyword in BUYING_SIGNAL_KEYWORDS)
+    value_articulated = any(keyword in text_blob for keyword in buying_signal_keywords())
     
     # 5. Momentum (Not Stalled)
     stalled = "send info" in text_blob and not next_step
@@ -657,74 +623,10 @@ def compute_sales_quality(signals):
     """
     Computes Sales Quality Score (0-10).
     STEPS 1 & 2: Incorporate end-of-call commitment and budget alignment.
+    Weights, disqualification override and label guardrails live in
+    config/scoring_rules.json "sales_quality".
     """
-    score = 0
-    drivers = []
-    
-    # 🔴 HARD DISQUALIFICATION OVERRIDE
-    if signals.get("no_intent") or signals.get("deferred"):
-        return {
-            "label": "Low",
-            "score": 2,
-            "drivers": ["Disqualified: No Intent/Deferred"]
-        }
-
-    if signals["decision_maker_known"]:
-        score += 2
-        drivers.append("Decision maker identified")
-        
-    if signals["next_step"]:
-        score += 3
-        drivers.append("Next step agreed")
-
-    if signals.get("hard_commitment"):
-        score += 2
-        drivers.append("Hard commitment locked")
-    
-    # STEP 1: End-of-Call Commitment (strong signal)
-    if signals.get("end_of_call_commitment"):
-        score += 3
-        drivers.append("Strong end-of-call commitment")
-    
-    # STEP 2: Budget Alignment (strong buying signal)
-    if signals.get("budget_alignment"):
-        score += 2
-        drivers.append("Budget alignment confirmed")
-        
-    if signals["objection_handled"]:
-        score += 2
-        drivers.append("Objections managed")
-        
-    if signals["value_articulated"]:
-        score += 2
-        drivers.append("Value articulated")
-        
-    if not signals["stalled"]:
-        score += 1
-        drivers.append("Momentum maintained")
-        
-    # --- GUARDRAILS (UPDATED) ---
-    # STEP 1 Override: End-of-call commitment upgrades to "Strong" (High)
-    if signals.get("end_of_call_commitment") or signals.get("hard_commitment"):
-        label = "High"
-        score = max(score, 8)
-        # Update momentum classification
-        if "Strong end-of-call commitment" in drivers or "Hard commitment locked" in drivers:
-            drivers.append("Momentum: Strong")
-    # 2. Medium Quality = Next Step Agreed
-    elif signals.get("next_step"):
-        label = "Medium"
-        score = max(score, 5)
-    # 3. Low Quality = Everything else
-    else:
-        label = "Low"
-        score = min(score, 4)
-    
-    return {
-        "label": label,
-        "score": score,
-        "drivers": drivers
-    }
+    return SCORING_RULES["sales_quality"].evaluate(signals)
 
 EXECUTION_TERMS = [
     "bug", "issue", "qa", "approval", "dependency",
@@ -760,6 +662,135 @@ TEMPORAL_KEYWORDS = [
     "by EOD", "by end of day", "deadline", "due", "schedule"
 ]
 
+# --- FEATURE INDEX ---
+# Every phrase list the meeting detectors check, matched in ONE scan per segment
+
+OWNERSHIP_ONLY_PHRASES = [
+    "take ownership",
+    "own this",
+    "i'm responsible",
+    "i am responsible"
+]
+
+FIRST_PERSON_FUTURE = ("i will", "i'll", "we will", "we'll")
+
+def _meeting_categories(data: dict):
+    """Matcher categories for one keywords config (`data` = parsed keywords.json)."""
+    meeting = data["meeting"]
+    categories = {
+        "ownership_commitment": meeting["ownership_commitment"],
+        "directional_decision": meeting["directional_decisions"],
+        "ownership": OWNERSHIP_PATTERNS,
+        "decision": DECISION_PATTERNS,
+        "execution_verb": EXECUTION_VERBS,
+        "conceptual": CONCEPTUAL_VERBS,
+        "agenda": AGENDA_PHRASES,
+        "negative_decision": NEGATIVE_DECISION_PATTERNS,
+        "issue": meeting["issues"],
+        "risk": meeting["risks"],
+        "tension": ["blocked", "issue", "problem", "concern", "delay"],
+        "ownership_only": OWNERSHIP_ONLY_PHRASES,
+        "no_blocker": ["no blocker"],
+        "none": ["none"],
+        "blocker": ["blocker"],
+        "all_clear": ["all clear", "good to go"],
+        "closure": ["no blocker", "no blockers", "good to go"],
+        "agreed": ["agreed"],
+        "emotional_negative": EMOTIONAL_NEGATIVE_TERMS,
+        "business_neutral": BUSINESS_NEUTRAL_TERMS,
+        "execution_term": EXECUTION_TERMS,
+        "resolution": RESOLUTION_TERMS,
+    }
+    for topic, keywords in TOPIC_KEYWORDS.items():
+        categories[f"topic:{topic}"] = keywords
+
+    # Sales cues, so one pass also serves analyze_sales (mode=both/auto)
+    objections = data["sales"]["objections"]
+    for obj_type, phrases in objections.items():
+        categories[f"objection:{obj_type}"] = phrases
+    categories.update({
+        "objection": [phrase for phrases in objections.values() for phrase in phrases],
+        "buying_signal": data["sales"].get("buying_signals", BUYING_SIGNAL_KEYWORDS),
+        "budget_alignment": BUDGET_ALIGNMENT_KEYWORDS,
+        "no_intent": NO_INTENT_TERMS,
+        "soft_authority": SOFT_AUTHORITY_TERMS,
+        "hard_authority": HARD_AUTHORITY_RISK_TERMS,
+        "acceptance": ACCEPTANCE_PHRASES,
+    })
+    return categories
+
+# Compiled once per config version (on the reload thread, before it goes live)
+# The built-in phrase lists above are part of the cache key, so editing them rebuilds it
+register_compiler("meeting_matcher", lambda data: PhraseMatcher(_meeting_categories(data)), inputs=_meeting_categories)
+
+def meeting_matcher() -> PhraseMatcher:
+    return active_config().artifact("meeting_matcher")
+
+def meeting_index(segments) -> FeatureIndex:
+    """
+    Returns `segments` unchanged if it already is a FeatureIndex, otherwise
+    indexes them: per-segment category bitsets, question / execution-decision
+    flags and sentiment columns. Detectors accept either form.
+    """
+    if isinstance(segments, FeatureIndex):
+        return segments
+
+    index = FeatureIndex(segments, meeting_matcher(), predicates={"question": is_question})
+
+    # Same rules as is_valid_execution_decision: no questions, agenda or
+    # conceptual language; negative-form or regular decision patterns
+    bits = index.matcher.bits
+    index.flags["execution_decision"] = [
+        _is_execution_decision(mask, question, bits)
+        for mask, question in zip(index.masks, index.flags["question"])
+    ]
+    return index
+
+def _is_execution_decision(mask, question, bits):
+    rejected = bits["agenda"] | bits["conceptual"]
+    accepted = bits["negative_decision"] | bits["decision"]
+    return not question and not mask & rejected and bool(mask & accepted)
+
+def conversation_index(enriched_segments) -> FeatureIndex:
+    """
+    The shared pass behind mode=both/auto: segments sorted by start, then ONE
+    meeting_index over them (lowercased text, meeting and sales keyword masks,
+    time index). analyze_meeting and analyze_sales both accept it via `index=`.
+    """
+    return meeting_index(sorted(enriched_segments, key=lambda x: x["start"]))
+
+# Keyword cues that tell the conversation types apart (mode=auto)
+SALES_CUES = [
+    "objection", "buying_signal", "budget_alignment", "no_intent", "soft_authority", "hard_authority",
+]
+MEETING_CUES = [
+    "ownership_commitment", "directional_decision", "decision", "agenda",
+    "issue", "risk", "blocker", "execution_term",
+]
+
+def classify_conversation(segments) -> dict:
+    """
+    Guesses whether a transcript is a sales call or an internal meeting from
+    the shared keyword masks: counts segments carrying sales vs meeting cues.
+    Ties (including no cues at all) go to meeting, the default mode.
+    Returns {"type": "meeting" | "sales", "sales_cues": n, "meeting_cues": n}.
+    """
+    index = meeting_index(segments)
+    sales_mask = 0
+    for name in SALES_CUES:
+        sales_mask |= index.bit(name)
+    meeting_mask = 0
+    for name in MEETING_CUES:
+        meeting_mask |= index.bit(name)
+
+    sales_cues = sum(1 for mask in index.masks if mask & sales_mask)
+    meeting_cues = sum(1 for mask in index.masks if mask & meeting_mask)
+    return {
+        "type": "sales" if sales_cues > meeting_cues else "meeting",
+        "sales_cues": sales_cues,
+        "meeting_cues": meeting_cues,
+    }
+
 def is_controlled(item):
     """
     Control Check: Does the item have an owner AND a timeline?
@@ -782,21 +813,26 @@ def detect_explicit_no_blockers(segments):
     """
     if not segments:
         return False
-        
-    tail = segments[-10:]
-    for seg in tail:
-        text = seg.get("text", "").lower()
+
+    index = meeting_index(segments)
+    lo, hi = index.time.span_tail(10)
+    return _no_blockers_in([index.masks[i] for i in index.time.order[lo:hi]], index.matcher.bits)
+
+def _no_blockers_in(masks, bits):
+    """detect_explicit_no_blockers over the tail masks (time order)."""
+    none_and_blocker = bits["none"] | bits["blocker"]
+    for mask in masks:
         # "none" is risky alone, but "no blockers" is safe.
-        # "any blockers? none" implies detection of question answer pair logic 
+        # "any blockers? none" implies detection of question answer pair logic
         # which is hard with just looking at single segments, but let's try strict keywords for now.
-        if "no blocker" in text or ("none" in text and "blocker" in text): 
+        if mask & bits["no_blocker"] or mask & none_and_blocker == none_and_blocker:
              # Simplistic: "none for me re: blockers"
              return True
-        # Check for specific "Any blockers?" -> "None" question/answer pattern requires context, 
+        # Check for specific "Any blockers?" -> "None" question/answer pattern requires context,
         # but let's assume specific phrases like "no impediments", "all clear".
-        if "all clear" in text or "good to go" in text:
+        if mask & bits["all_clear"]:
             return True
-            
+
     return False
 
 def adjust_segment_sentiment(text, raw_score):
@@ -807,19 +843,22 @@ def adjust_segment_sentiment(text, raw_score):
     - Execution terms -> Downweight if not resolved.
     - Resolution + Execution -> Neutral/Positive.
     """
-    text_lower = text.lower()
-    
+    matcher = meeting_matcher()
+    return _adjust_sentiment_from_mask(matcher.mask(text.lower()), raw_score, matcher.bits)
+
+def _adjust_sentiment_from_mask(mask, raw_score, bits):
+    """adjust_segment_sentiment over a precomputed feature mask."""
     # 1. Check for True Emotional Negativity (Highest Priority)
-    if any(t in text_lower for t in EMOTIONAL_NEGATIVE_TERMS):
+    if mask & bits["emotional_negative"]:
         return raw_score
 
     # 2. Check for Business Neutrality
-    if any(t in text_lower for t in BUSINESS_NEUTRAL_TERMS):
+    if mask & bits["business_neutral"]:
         return 0.0
 
     # 3. Check for Execution Context
-    has_execution = any(t in text_lower for t in EXECUTION_TERMS)
-    has_resolution = any(r in text_lower for r in RESOLUTION_TERMS)
+    has_execution = mask & bits["execution_term"]
+    has_resolution = mask & bits["resolution"]
 
     if has_execution:
         if has_resolution:
@@ -843,26 +882,32 @@ def calculate_business_sentiment(segments, meeting_health):
     if not segments:
         return 0, "Neutral / Focused"
 
+    index = meeting_index(segments)
+    bits = index.matcher.bits
     adjusted_scores = []
-    for s in segments:
-        raw_score = s.get("sentiment_score", 0) # Assumes nlp_engine provides this
-        # Fallback if sentiment_score missing (e.g. from labels)
-        if "sentiment_score" not in s:
-            # Map label to score approximation if needed
-            label = s.get("sentiment", "Neutral")
-            raw_score = 0.5 if label == "Positive" else -0.5 if label == "Negative" else 0
-            
-        adj_score = adjust_segment_sentiment(s.get("text", ""), raw_score)
+    for s, mask in zip(index.segments, index.masks):
+        adj_score = _adjust_sentiment_from_mask(mask, _business_raw_score(s), bits)
         adjusted_scores.append(adj_score)
 
     # Base Average (Corrected: Average of ADJUSTED scores)
     avg_score = sum(adjusted_scores) / len(adjusted_scores) if adjusted_scores else 0
 
     # End State Adjustment
-    end_boost = ending_state_boost(segments)
+    end_boost = ending_state_boost(index)
     
-    final_score = avg_score + end_boost
+    return _business_sentiment(avg_score + end_boost, meeting_health)
 
+def _business_raw_score(s):
+    raw_score = s.get("sentiment_score", 0) # Assumes nlp_engine provides this
+    # Fallback if sentiment_score missing (e.g. from labels)
+    if "sentiment_score" not in s:
+        # Map label to score approximation if needed
+        label = s.get("sentiment", "Neutral")
+        raw_score = 0.5 if label == "Positive" else -0.5 if label == "Negative" else 0
+    return raw_score
+
+def _business_sentiment(final_score, meeting_health):
+    """Outcome override and label for an (average + end boost) business score."""
     # Outcome Override (The "Good" Gate)
     # If meeting is On Track, sentiment cannot be broadly Negative
     if meeting_health == "on_track" and final_score < -0.1:
@@ -902,14 +947,18 @@ def ending_state_boost(segments):
     """
     if not segments:
         return 0
-    
-    tail = segments[-5:]
+
+    index = meeting_index(segments)
+    lo, hi = index.time.span_tail(5)
+    return _ending_boost_in([index.masks[i] for i in index.time.order[lo:hi]], index.matcher.bits)
+
+def _ending_boost_in(masks, bits):
+    """ending_state_boost over the tail masks (time order)."""
     # Check for closure language
-    for seg in tail:
-        text = seg.get("text", "").lower()
-        if any(k in text for k in ["no blocker", "no blockers", "good to go"]):
+    for mask in masks:
+        if mask & bits["closure"]:
              return 0.3
-        if "agreed" in text:
+        if mask & bits["agreed"]:
              return 0.2
     return 0
 
@@ -923,20 +972,18 @@ def evaluate_meeting_health(decisions, action_items, tension_points, sentiment_c
         return "blocked"
 
     # 2. Dependencies Control Check
-    # Filter actions that look like dependencies ("approval", "sign off", "dependency")
-    dependencies = [
-        a for a in action_items 
-        if any(term in a["task"].lower() for term in ["approval", "sign off", "dependency", "qa"])
-    ]
-    
-    for dep in dependencies:
-        if not is_controlled(dep):
-             # Uncontrolled Dependency -> Risk
-             return "at_risk"
+    if any(_is_uncontrolled_dependency(a) for a in action_items):
+        # Uncontrolled Dependency -> Risk
+        return "at_risk"
 
     # 3. Default -> On Track
     return "on_track"
 
+def _is_uncontrolled_dependency(action):
+    # Actions that look like dependencies ("approval", "sign off", "dependency")
+    is_dependency = any(term in action["task"].lower() for term in ["approval", "sign off", "dependency", "qa"])
+    return is_dependency and not is_controlled(action)
+
 # --- KEY INSIGHTS ENGINE ---
 
 # DEPRECATED: Legacy constants - kept for backward compatibility only
@@ -1043,31 +1090,31 @@ def detect_tension_points(segments):
     Detect tense or unresolved moments in a meeting.
     Heuristic-based (hackathon-safe).
     """
-    tension_points = []
-
-    for seg in segments:
-        sentiment = seg.get("sentiment", 0)
-        confidence = seg.get("sentiment_confidence", 0)
-        text = seg.get("text", "").lower()
-
-        # Strong negative sentiment with confidence
-        if sentiment < -0.4 and confidence >= 0.6:
-            tension_points.append({
-                "text": seg["text"],
-                "time": seg["start"],
-                "reason": "Negative sentiment"
-            })
-            continue
+    index = meeting_index(segments)
+    tension = index.bit("tension")
+    points = (
+        _tension_point(seg, index.sentiment[i], index.confidence[i], index.masks[i] & tension)
+        for i, seg in enumerate(index.segments)
+    )
+    return [point for point in points if point]
 
-        # Explicit tension keywords (fallback)
-        if any(k in text for k in ["blocked", "issue", "problem", "concern", "delay"]):
-            tension_points.append({
-                "text": seg["text"],
-                "time": seg["start"],
-                "reason": "Potential blocker or concern"
-            })
+def _tension_point(seg, sentiment, confidence, has_tension_keyword):
+    # Strong negative sentiment with confidence
+    if sentiment < -0.4 and confidence >= 0.6:
+        return {
+            "text": seg["text"],
+            "time": seg["start"],
+            "reason": "Negative sentiment"
+        }
 
-    return tension_points
+    # Explicit tension keywords (fallback)
+    if has_tension_keyword:
+        return {
+            "text": seg["text"],
+            "time": seg["start"],
+            "reason": "Potential blocker or concern"
+        }
+    return None
 
 
 def extract_deadline(text):
@@ -1086,52 +1133,51 @@ def extract_actions(segments):
     - MUST contain a real execution verb
     - MUST NOT be ownership-only
     """
-    actions = []
-
-    OWNERSHIP_ONLY_PHRASES = [
-        "take ownership",
-        "own this",
-        "i'm responsible",
-        "i am responsible"
-    ]
-
-    for seg in segments:
-        text = seg.get("text", "")
-        t = text.lower()
-
-        # Must be first-person future
-        if not (
-            t.startswith("i will") or t.startswith("i'll")
-            or t.startswith("we will") or t.startswith("we'll")
-        ):
-            continue
+    index = meeting_index(segments)
+    bits = index.matcher.bits
+    actions = (
+        _action_item(index.texts[i], index.lowers[i], mask, index.starts[i], bits)
+        for i, mask in enumerate(index.masks)
+    )
+    return [action for action in actions if action]
 
-        # Must contain an execution verb
-        if not any(v in t for v in EXECUTION_VERBS):
-            continue
+def _action_item(text, lower, mask, start, bits):
+    # Must contain an execution verb
+    if not mask & bits["execution_verb"]:
+        return None
 
-        # Must NOT be ownership-only
-        if any(p in t for p in OWNERSHIP_ONLY_PHRASES):
-            continue
+    # Must NOT be ownership-only
+    if mask & bits["ownership_only"]:
+        return None
 
-        actions.append({
-            "task": text,
-            "owner": "Unassigned",
-            "deadline": extract_deadline(text),
-            "time": seg.get("start", 0)
-        })
+    # Must be first-person future
+    if not lower.startswith(FIRST_PERSON_FUTURE):
+        return None
 
-    return actions
+    return {
+        "task": text,
+        "owner": "Unassigned",
+        "deadline": extract_deadline(text),
+        "time": start
+    }
 
-def analyze_meeting(nlp_input: dict) -> dict:
+def analyze_meeting(nlp_input: dict, index: FeatureIndex = None, sentiment: dict = None) -> dict:
     """
     STEP 9: Apply globally - Main entry point for Meeting Mode analysis.
     Uses new independent detectors and separates meeting_quality from project_risk.
+    `index`: a conversation_index() already built for these segments.
+    `sentiment`: this call's sentiment aggregates computed in bulk
+    (sentiment_columns.precomputed_sentiment); replaces the scalar passes.
     """
     summary = None # Default initialization
     
-    enriched_segments = nlp_input.get("segments", [])
-    segments = sorted(enriched_segments, key=lambda x: x["start"])
+    if index is None:
+        enriched_segments = nlp_input.get("segments", [])
+        segments = sorted(enriched_segments, key=lambda x: x["start"])
+
+        # One indexing pass; every detector below reads from it
+        index = meeting_index(segments)
+    segments = index.segments
 
     # 🔒 STEP 5: LEGACY VERSION GUARD (CRITICAL for Backward Compatibility)
     # If this is a legacy audio, freeze execution_attempted to False
@@ -1140,14 +1186,14 @@ def analyze_meeting(nlp_input: dict) -> dict:
 
     # 🔒 HARD FREEZE: Single-pass signal detection
     # Signals are computed ONCE and NEVER modified
-    core_signals = detect_signals(segments)
+    core_signals = detect_signals(index)
     
     # Merge with legacy signals for backward compatibility
     signals = {
         **core_signals,
-        "risk": detect_risks_present(segments),
-        "issues": detect_issues_present(segments),
-        "topic": extract_primary_topic(segments),
+        "risk": detect_risks_present(index),
+        "issues": detect_issues_present(index),
+        "topic": extract_primary_topic(index),
     }
     
     # 🔒 SIGNALS ARE NOW FROZEN - No function is allowed to modify them
@@ -1159,24 +1205,24 @@ def analyze_meeting(nlp_input: dict) -> dict:
     if is_legacy:
         execution_attempted = False
     else:
-        execution_attempted = detect_execution_attempted(segments)
+        execution_attempted = detect_execution_attempted(index)
     
     # 5.3 Sentiment Aggregation (Metadata Only - NOT used in quality)
-    sentiment_counts = aggregate_sentiment(segments)
+    sentiment_counts = sentiment["sentiment_counts"] if sentiment else aggregate_sentiment(index)
     
     # 5.5 Detect Decisions Made (Legacy - for action items display)
-    decisions = detect_decisions(segments)
+    decisions = detect_decisions(index)
     signals["decision_state"] = "decision made" if signals["decision"] else "no final decision"
 
     # 5.6 Detect Action Items (STREAMLINED)
-    action_items = extract_actions(segments)
+    action_items = extract_actions(index)
     signals["action_clarity"] = "next steps identified" if action_items else "no clear next steps"
 
     # 5.7 Detect Tension / Unresolved Moments
-    tension_points = detect_tension_points(segments)
+    tension_points = detect_tension_points(index)
 
     # --- 1. OVERRIDES (NO BLOCKERS) ---
-    no_blockers_declared = detect_explicit_no_blockers(segments)
+    no_blockers_declared = detect_explicit_no_blockers(index)
     
     actual_blockers = tension_points[:]
     if no_blockers_declared:
@@ -1185,11 +1231,33 @@ def analyze_meeting(nlp_input: dict) -> dict:
     # --- 2. MEETING HEALTH EVALUATION ---
     meeting_health = evaluate_meeting_health(decisions, action_items, actual_blockers, sentiment_counts, segments)
     
+    # --- 3. BUSINESS SENTIMENT (Metadata Only) ---
+    if sentiment:
+        business_sentiment = _business_sentiment(sentiment["business_score"], meeting_health)
+    else:
+        business_sentiment = calculate_business_sentiment(index, meeting_health)
+
+    transcript = [_meeting_transcript_entry(seg) for seg in segments]
+    return _compose_meeting_result(
+        signals, execution_attempted, sentiment_counts, decisions, action_items,
+        actual_blockers, meeting_health, business_sentiment, transcript
+    )
+
+def _meeting_transcript_entry(seg):
+    return {
+        "start": seg["start"],
+        "end": seg["end"],
+        "text": seg["text"],
+        "sentiment": seg["sentiment"],
+        "confidence": seg.get("sentiment_confidence", 0)
+    }
+
+def _compose_meeting_result(signals, execution_attempted, sentiment_counts, decisions, action_items,
+                            actual_blockers, meeting_health, business_sentiment, transcript):
+    """Quality, risk, summary and insights from the detector results; builds the Meeting Mode output."""
+    biz_sentiment_score, biz_sentiment_label = business_sentiment
     # Check for uncontrolled dependencies
     uncontrolled_deps = meeting_health == "at_risk"
-    
-    # --- 3. BUSINESS SENTIMENT (Metadata Only) ---
-    biz_sentiment_score, biz_sentiment_label = calculate_business_sentiment(segments, meeting_health)
 
     # 🔒 HARD FREEZE: Meeting quality computed ONCE from frozen signals
     # No function is allowed to modify it after this point
@@ -1238,33 +1306,17 @@ def analyze_meeting(nlp_input: dict) -> dict:
         "tension_points": actual_blockers,
         "blockers_present": len(actual_blockers) > 0,
         "dependencies_controlled": meeting_health != "at_risk",
-        "transcript": [
-            {
-                "start": seg["start"],
-                "end": seg["end"],
-                "text": seg["text"],
-                "sentiment": seg["sentiment"],
-                "confidence": seg.get("sentiment_confidence", 0)
-            }
-            for seg in segments
-        ]
+        "transcript": transcript
     }
+QUESTION_STARTERS = ("when ", "what ", "how ", "should ", "can ", "could ", "would ")
+
 def is_question(text: str) -> bool:
     """
     Detect if text is a question.
     Questions are NEVER decisions.
     """
     t = text.strip().lower()
-    return (
-        t.endswith("?")
-        or t.startswith("when ")
-        or t.startswith("what ")
-        or t.startswith("how ")
-        or t.startswith("should ")
-        or t.startswith("can ")
-        or t.startswith("could ")
-        or t.startswith("would ")
-    )
+    return t.endswith("?") or t.startswith(QUESTION_STARTERS)
 
 def is_valid_decision(text: str) -> bool:
     """
@@ -1278,7 +1330,7 @@ def is_valid_decision(text: str) -> bool:
         return False
 
     # Must contain decision keyword
-    return any(d in t for d in DECISION_KEYWORDS)
+    return any(d in t for d in meeting_keywords("decisions"))
 
 def is_valid_execution_decision(text: str) -> bool:
     """
@@ -1287,20 +1339,19 @@ def is_valid_execution_decision(text: str) -> bool:
     Accepts: Negative-form decisions (declarative rejections).
     """
     t = text.lower()
-
     if is_question(t):
         return False
 
-    if any(a in t for a in AGENDA_PHRASES):
-        return False
+    matcher = meeting_matcher()
+    mask = matcher.mask(t)
 
-    if any(c in t for c in CONCEPTUAL_VERBS):
+    if mask & (matcher.bit("agenda") | matcher.bit("conceptual")):
         return False
 
-    if any(n in t for n in NEGATIVE_DECISION_PATTERNS):
+    if mask & matcher.bit("negative_decision"):
         return True
 
-    return any(d in t for d in DECISION_PATTERNS)
+    return bool(mask & matcher.bit("decision"))
 
 def detect_decisions(segments):
     """
@@ -1310,15 +1361,14 @@ def detect_decisions(segments):
     STRICT filtering: Only declarative, execution-oriented decisions.
     """
     decisions = []
+    index = meeting_index(segments)
 
-    for seg in segments:
-        text = seg.get("text", "")
-        
-        # Apply STRICT validation filter
-        if is_valid_execution_decision(text):
+    for i, is_decision in enumerate(index.flags["execution_decision"]):
+        # Apply STRICT validation filter (see is_valid_execution_decision)
+        if is_decision:
             decisions.append({
-                "text": text,
-                "time": seg.get("start", 0)
+                "text": index.texts[i],
+                "time": index.starts[i]
             })
 
     return decisions
@@ -1345,9 +1395,10 @@ def overall_call_sentiment(segments):
     weighted_neutral = 0
     weighted_negative = 0
     total_weight = 0
+    min_confidence = confidence_threshold("sentiment_confidence")
     
     for idx, seg in enumerate(segments):
-        if seg["sentiment_confidence"] < 0.6:
+        if seg["sentiment_confidence"] < min_confidence:
             continue
             
         label = seg.get("sentiment_label", "Neutral")
@@ -1367,6 +1418,9 @@ def overall_call_sentiment(segments):
         elif label == "Neutral":
             weighted_neutral += weight
     
+    return _weighted_call_sentiment(weighted_positive, weighted_negative, total_weight)
+
+def _weighted_call_sentiment(weighted_positive, weighted_negative, total_weight):
     if total_weight == 0:
         return "neutral"
     
@@ -1385,17 +1439,31 @@ def overall_call_sentiment(segments):
 def detect_objections(segments, budget_alignment=False):
     """
     STEP 2: Suppress pricing objections when budget alignment is detected.
+    Accepts a segment list or a FeatureIndex (keyword masks instead of rescans).
     """
     objections = []
+    min_confidence = confidence_threshold("objection_confidence")
+
+    if isinstance(segments, FeatureIndex):
+        index = segments
+        for i, seg in enumerate(index.segments):
+            if index.labels[i] != "Negative" or index.confidence[i] < min_confidence:
+                continue
+            for obj_type in objection_keywords():
+                if obj_type == "Pricing" and budget_alignment:
+                    continue
+                if index.has(i, f"objection:{obj_type}"):
+                    objections.append({"type": obj_type, "text": seg["text"], "time": seg["start"]})
+        return objections
 
     for seg in segments:
         label = seg.get("sentiment_label", "Neutral")
-        if label != "Negative" or seg["sentiment_confidence"] < 0.75:
+        if label != "Negative" or seg["sentiment_confidence"] < min_confidence:
             continue
 
-        text = seg["text"].lower()
+        text = segment_text_lower(seg)
 
-        for obj_type, keywords in OBJECTION_KEYWORDS.items():
+        for obj_type, keywords in objection_keywords().items():
             # STEP 2: Skip pricing objections if budget alignment detected
             if obj_type == "Pricing" and budget_alignment:
                 continue
@@ -1409,21 +1477,31 @@ def detect_objections(segments, budget_alignment=False):
 
     return objections
 
+# Explicit buyer acceptance after an objection (RULE 3)
+ACCEPTANCE_PHRASES = [
+    "that makes sense", "okay got it", "understood", 
+    "fair enough", "that works", "sounds reasonable",
+    "i see", "makes sense", "good to know"
+]
+
+# Objection resolution looks at the next 5 segments
+OBJECTION_FOLLOWUP_WINDOW = 5
+
 def is_objection_resolved(objection, segments):
     """
     RULE 3: Pricing Objection Resolution Guard.
     Only mark objection as resolved if buyer sentiment improves after it.
+    Pass a TimeIndex as `segments` to share it across objections.
     """
-    objection_time = objection["time"]
-    
-    # Find segments after the objection
-    later_segments = [s for s in segments if s["start"] > objection_time]
+    timeline = TimeIndex.of(segments)
     
-    if not later_segments:
+    # Find segments after the objection (bisection on start time)
+    lo, hi = timeline.span_after(objection["time"])
+    if lo == hi:
         return False
     
     # Check next 3-5 segments for sentiment improvement
-    check_window = later_segments[:5]
+    check_window = timeline.segments[lo:min(hi, lo + OBJECTION_FOLLOWUP_WINDOW)]
     
     # Count positive/neutral responses after objection
     positive_count = sum(1 for s in check_window 
@@ -1431,15 +1509,9 @@ def is_objection_resolved(objection, segments):
                         and s.get("sentiment_confidence", 0) >= 0.6)
     
     # Also check for explicit acceptance phrases
-    acceptance_phrases = [
-        "that makes sense", "okay got it", "understood", 
-        "fair enough", "that works", "sounds reasonable",
-        "i see", "makes sense", "good to know"
-    ]
-    
     for seg in check_window:
-        text = seg["text"].lower()
-        if any(phrase in text for phrase in acceptance_phrases):
+        text = segment_text_lower(seg)
+        if any(phrase in text for phrase in ACCEPTANCE_PHRASES):
             return True
     
     # Resolved if majority of follow-up is positive/neutral
@@ -1452,11 +1524,14 @@ def classify_objections(objections, segments):
     """
     resolved = []
     unresolved = []
+
+    # One time index shared by every objection
+    timeline = TimeIndex.of(segments)
     
     for obj in objections:
         if obj["type"] == "Pricing":
             # Apply resolution guard for pricing objections
-            if is_objection_resolved(obj, segments):
+            if is_objection_resolved(obj, timeline):
                 resolved.append(obj)
             else:
                 unresolved.append(obj)
@@ -1468,19 +1543,10 @@ def classify_objections(objections, segments):
 
 def _determine_call_stage(signals):
     """
-    Determine call stage based on signals.
+    Determine call stage based on signals (config/scoring_rules.json "call_stage").
     Returns: 'strong', 'moderate', 'ambiguous', or 'weak'
     """
-    if signals.get("no_intent") or signals.get("deferred"):
-        return "weak"
-    
-    if signals.get("end_of_call_commitment") or signals.get("hard_commitment"):
-        return "strong"
-    
-    if signals.get("next_step") and signals.get("value_articulated"):
-        return "moderate"
-    
-    return "ambiguous"
+    return SCORING_RULES["call_stage"].evaluate(signals)["label"]
 
 def _fallback_actions(objections):
     """Fallback action generation when no signals available."""
@@ -1510,10 +1576,10 @@ def recommend_actions(objections, signals=None, segments=None):
     
     # STAGE 1: Strong Progress
     if call_stage == "strong":
-        if "proposal" in text_blob or "send proposal" in text_blob:
+        if any(term in text_blob for term in PROPOSAL_TERMS):
             actions.append("Send proposal")
         
-        if any(keyword in text_blob for keyword in ["review", "by friday", "by monday", "by tuesday", "by wednesday", "by thursday"]):
+        if any(keyword in text_blob for keyword in DEADLINE_TERMS):
             actions.append("Follow up on agreed deadline")
         
         # Only suggest onboarding if buying signal exists
@@ -1603,8 +1669,8 @@ def compose_sales_summary(signals, quality, objections=None):
     # Condition: Proposal agreed AND review timeline exists
     if signals.get("end_of_call_commitment") or signals.get("hard_commitment"):
         text_blob = signals.get("_text_blob", "")
-        has_proposal = "proposal" in text_blob or "send proposal" in text_blob
-        has_timeline = any(keyword in text_blob for keyword in ["review", "by friday", "by monday", "by tuesday", "by wednesday", "by thursday"])
+        has_proposal = any(term in text_blob for term in PROPOSAL_TERMS)
+        has_timeline = any(keyword in text_blob for keyword in DEADLINE_TERMS)
         
         if has_proposal and has_timeline:
             return "Strong progress made with proposal agreed and review scheduled. Clear buying signals detected with confirmed next steps."
@@ -1720,57 +1786,93 @@ def generate_sales_insights(objections, signals, quality):
     
     return insights[:3]
 
-def analyze_sales(enriched_segments: list) -> dict:
-    """
-    Main entry point for Sales Mode analysis.
-    All 7 calibration steps integrated here.
-    """
-    if not enriched_segments:
-        return {
-            "mode": "sales",
-            "quality": {"label": "Low", "score": 0, "drivers": []},
-            "overall_call_sentiment": "neutral",
-            "sentiment_score": 0,
-            "key_insights": [],
-            "objections": [],
-            "recommended_actions": [],
-            "transcript": []
-        }
+# --- SALES STAGE GRAPH ---
+# analyze_sales as named stages; shared intermediates are computed once per call
 
-    segments = sorted(enriched_segments, key=lambda x: x["start"])
+SALES_STAGES = StageGraph()
 
+@SALES_STAGES.stage("segments", "enriched_segments")
+def _sales_segments(enriched_segments):
+    return sorted(enriched_segments, key=lambda x: x["start"])
+
+@SALES_STAGES.stage("timeline", "segments")
+def _sales_timeline(segments):
+    # Already sorted, so the index reuses the list and only adds the start array
+    return TimeIndex(segments)
+
+@SALES_STAGES.stage("text_blob", "segments")
+def _sales_text_blob(segments):
+    return sales_text_blob(segments)
+
+@SALES_STAGES.stage("call_sentiment", "segments")
+def _sales_call_sentiment(segments):
     # STEP 6: Weighted sentiment
-    call_sentiment = overall_call_sentiment(segments)
-    
-    # Initial objection detection (will be refined after signals)
-    objections_initial = detect_objections(segments)
-    
+    return overall_call_sentiment(segments)
+
+@SALES_STAGES.stage("objections_initial", "segments")
+def _sales_objections_initial(segments):
+    # Initial objection detection (refined after signals)
+    return detect_objections(segments)
+
+@SALES_STAGES.stage("recommendations_temp", "objections_initial")
+def _sales_recommendations_temp(objections_initial):
     # Temporary recommendations for signal assessment
-    recommendations_temp = recommend_actions(objections_initial)
-    
-    # --- QUALITY SCORING ---
+    return recommend_actions(objections_initial)
+
+@SALES_STAGES.stage("signals", "timeline", "objections_initial", "recommendations_temp", "text_blob")
+def _sales_signals(timeline, objections_initial, recommendations_temp, text_blob):
     # STEPS 1, 2, 3, 4: Assess signals with all calibrations
-    sales_signals = assess_sales_signals(segments, objections_initial, recommendations_temp)
-    
-    # Add text_blob to signals for template selection (STEP 7) and action generation (STEP 5)
-    text_blob = " ".join([s["text"].lower() for s in segments])
-    sales_signals["_text_blob"] = text_blob
-    
-    # STEP 2: Re-detect objections with budget_alignment suppression
-    objections = detect_objections(segments, budget_alignment=sales_signals.get("budget_alignment", False))
-    
+    signals = assess_sales_signals(timeline, objections_initial, recommendations_temp, text_blob=text_blob)
+    # text_blob for template selection (STEP 7) and action generation (STEP 5)
+    signals["_text_blob"] = text_blob
+    return signals
+
+@SALES_STAGES.stage("objections", "objections_initial", "signals")
+def _sales_objections(objections_initial, signals):
+    # STEP 2: Budget alignment suppresses pricing objections. Same result as
+    # re-running detect_objections(budget_alignment=True), without the rescan
+    if signals.get("budget_alignment", False):
+        return [o for o in objections_initial if o["type"] != "Pricing"]
+    return objections_initial
+
+@SALES_STAGES.stage("recommendations", "objections", "signals", "timeline")
+def _sales_recommendations(objections, signals, timeline):
     # RULE 6: Context-aware action generation with stage-based mapping
-    recommendations = recommend_actions(objections, signals=sales_signals, segments=segments)
-    
-    # Compute quality with new signals
-    quality = compute_sales_quality(sales_signals)
+    return recommend_actions(objections, signals=signals, segments=timeline)
+
+@SALES_STAGES.stage("quality", "signals")
+def _sales_quality(signals):
+    return compute_sales_quality(signals)
 
+@SALES_STAGES.stage("summary", "signals", "quality", "objections")
+def _sales_summary(signals, quality, objections):
     # RULE 7: Template-based summary generation with objection acknowledgment
-    summary = compose_sales_summary(sales_signals, quality, objections=objections)
-    
-    # STEPS 3 & 4: Generate insights with authority classification and value gap removal
-    key_insights = generate_sales_insights(objections, sales_signals, quality)
-    
+    return compose_sales_summary(signals, quality, objections=objections)
+
+@SALES_STAGES.stage("key_insights", "objections", "signals", "quality")
+def _sales_key_insights(objections, signals, quality):
+    # STEPS 3 & 4: Authority classification and value gap removal
+    return generate_sales_insights(objections, signals, quality)
+
+@SALES_STAGES.stage("transcript", "segments")
+def _sales_transcript(segments):
+    return [_sales_transcript_entry(s) for s in segments]
+
+@SALES_STAGES.stage("result", "transcript", "call_sentiment", "objections", "recommendations", "quality", "summary", "key_insights")
+def _sales_result(transcript, call_sentiment, objections, recommendations, quality, summary, key_insights):
+    return _compose_sales_result(call_sentiment, objections, recommendations, quality, summary, key_insights, transcript)
+
+def _sales_transcript_entry(s):
+    return {
+        "start": s["start"],
+        "end": s["end"],
+        "text": s["text"],
+        "sentiment": s["sentiment"],
+        "sentiment_label": s.get("sentiment_label", "Neutral"),
+        "confidence": s["sentiment_confidence"]
+    }
+
+def _compose_sales_result(call_sentiment, objections, recommendations, quality, summary, key_insights, transcript):
     # Calculate sentiment score from call_sentiment label
     sentiment_score_map = {
         "positive": 0.6,
@@ -1789,17 +1891,353 @@ def analyze_sales(enriched_segments: list) -> dict:
         "key_insights": key_insights,
         "objections": objections,
         "recommended_actions": recommendations,
-        "transcript": [
-            {
-                "start": s["start"],
-                "end": s["end"],
-                "text": s["text"],
-                "sentiment": s["sentiment"],
-                "sentiment_label": s.get("sentiment_label", "Neutral"),
-                "confidence": s["sentiment_confidence"]
-            }
-            for s in segments
-        ]
+        "transcript": transcript
     }
 
+def analyze_sales(enriched_segments: list, timings: dict = None, index: FeatureIndex = None,
+                  sentiment: dict = None) -> dict:
+    """
+    Main entry point for Sales Mode analysis.
+    All 7 calibration steps integrated here, run as SALES_STAGES.
+    Pass `timings` to collect per-stage wall time (ms).
+    `index`: a conversation_index() of these segments; its sorted segments,
+    time index, lowercased text and objection masks seed the stage graph.
+    `sentiment`: bulk-computed aggregates as for analyze_meeting; seeds call_sentiment.
+    """
+    if not enriched_segments:
+        return {
+            "mode": "sales",
+            "quality": {"label": "Low", "score": 0, "drivers": []},
+            "overall_call_sentiment": "neutral",
+            "sentiment_score": 0,
+            "key_insights": [],
+            "objections": [],
+            "recommended_actions": [],
+            "transcript": []
+        }
+
+    inputs = {"enriched_segments": enriched_segments}
+    if index is not None:
+        inputs.update({
+            "segments": index.segments,
+            "timeline": index.time,
+            "text_blob": sales_text_blob(index),
+            "objections_initial": detect_objections(index),
+        })
+    if sentiment:
+        inputs["call_sentiment"] = sentiment["call_sentiment"]
+    return SALES_STAGES.run(inputs, ["result"], timings=timings)["result"]
+
+def analyze_conversation(nlp_input: dict, mode: str = "both", sentiment: dict = None) -> dict:
+    """
+    mode=both: meeting AND sales insights from one shared pass.
+    mode=auto: classify the conversation, return only the fitting analysis.
+    Both add `conversation_type` (see classify_conversation).
+    """
+    enriched_segments = nlp_input.get("segments", [])
+    index = conversation_index(enriched_segments)
+    conversation_type = classify_conversation(index)
+
+    if mode == "auto":
+        if conversation_type["type"] == "sales":
+            result = analyze_sales(enriched_segments, index=index, sentiment=sentiment)
+        else:
+            result = analyze_meeting(nlp_input, index=index, sentiment=sentiment)
+        return {**result, "conversation_type": conversation_type}
+
+    return {
+        "mode": "both",
+        "conversation_type": conversation_type,
+        "meeting": analyze_meeting(nlp_input, index=index, sentiment=sentiment),
+        "sales": analyze_sales(enriched_segments, index=index, sentiment=sentiment),
+    }
+
+def analyze_transcript(mode: str, transcript_text: str, enriched_segments: list, config: KeywordConfig = None,
+                       sentiment: dict = None) -> dict:
+    """
+    Dispatches to the analyzer for `mode` (meeting, sales, both, auto). Unknown modes run Meeting Mode.
+    The whole analysis runs on one keyword config version (`config`, default: the live one).
+    `sentiment`: precomputed sentiment aggregates of this call (see analyze_meeting).
+    """
+    with pinned_config(config):
+        if mode == "sales":
+            # analyze_sales expects a list of segments
+            return analyze_sales(enriched_segments, sentiment=sentiment)
+        if mode in ("both", "auto"):
+            # One shared keyword pass feeds both analyzers
+            return analyze_conversation({"text": transcript_text, "segments": enriched_segments}, mode, sentiment)
+        # Default to meeting mode
+        return analyze_meeting({"text": transcript_text, "segments": enriched_segments}, sentiment=sentiment)
+
+# --- INCREMENTAL ANALYZERS ---
+# Live sessions: per-signal state is updated as segments arrive, so an update
+# costs time proportional to the new segments. snapshot() returns the same
+# output as analyze_meeting / analyze_sales over every segment so far.
+
+def sales_blob_terms() -> list:
+    """Every phrase Sales Mode looks up in the transcript blob."""
+    return (
+        BUDGET_ALIGNMENT_KEYWORDS + SOFT_AUTHORITY_TERMS + HARD_AUTHORITY_RISK_TERMS
+        + NEXT_STEP_TERMS + COMMITMENT_KEYWORDS[:5] + DECISION_MAKER_TERMS + HARD_COMMITMENT_TERMS
+        + NO_INTENT_TERMS + DEFER_TERMS + buying_signal_keywords() + PROPOSAL_TERMS + DEADLINE_TERMS
+        + ["send info"]
+    )
+
+class _BlobTerms:
+    """
+    Answers `term in text_blob` for a growing sales blob without rebuilding it.
+    Watched terms are matched against each new segment plus the tail of the
+    blob before it, so phrases spanning the joining space are still found.
+    Other terms fall back to the joined blob (cached until the next append).
+    """
+
+    def __init__(self, terms):
+        self.terms = set(terms)
+        self.found = set()
+        self.tail_size = max((len(term) for term in self.terms), default=1) - 1
+        self.parts = []
+        self.tail = ""
+        self._joined = None
+
+    def append(self, text_lower: str):
+        window = f"{self.tail} {text_lower}" if self.parts else text_lower
+        for term in self.terms - self.found:
+            if term in window:
+                self.found.add(term)
+        self.parts.append(text_lower)
+        self.tail = window[-self.tail_size:] if self.tail_size else ""
+        self._joined = None
+
+    def __contains__(self, term):
+        if term in self.terms:
+            return term in self.found
+        if self._joined is None:
+            self._joined = " ".join(self.parts)
+        return term in self._joined
+
+class _IncrementalAnalyzer(ABC):
+    """
+    Shared plumbing: segments are kept in start order like the batch
+    analyzers sort them. A batch starting before the last segment forces
+    one rebuild from everything received (stable re-sort). The session stays
+    on the keyword config version it started with.
+    Subclasses implement _ingest (fold in start-sorted segments) and _snapshot.
+    """
+
+    def __init__(self, config: KeywordConfig = None):
+        self.config = config or current_config()
+        with pinned_config(self.config):
+            self._reset()
+
+    def _reset(self):
+        self._received = []
+        self._last_start = None
+
+    def add_segments(self, batch):
+        batch = sorted(batch, key=lambda x: x["start"])
+        if not batch:
+            return self
+        with pinned_config(self.config):
+            if self._last_start is not None and batch[0]["start"] < self._last_start:
+                received = sorted(self._received + batch, key=lambda x: x["start"])
+                self._reset()
+                batch = received
+            self._received.extend(batch)
+            self._last_start = batch[-1]["start"]
+            self._ingest(batch)
+        return self
+
+    def snapshot(self) -> dict:
+        with pinned_config(self.config):
+            return self._snapshot()
+
+    @abstractmethod
+    def _ingest(self, segments):
+        ...
+
+    @abstractmethod
+    def _snapshot(self) -> dict:
+        ...
+
+class IncrementalMeetingAnalyzer(_IncrementalAnalyzer):
+    """
+    Meeting Mode for live sessions: add_segments(batch) updates per-signal
+    flags, topic and sentiment counters, decision / action / tension lists,
+    the last-10 mask window and the business sentiment sum; snapshot()
+    matches analyze_meeting({"text": text, "segments": all segments}).
+    """
+
+    def __init__(self, text: str = "", version: str = None, config: KeywordConfig = None):
+        self.text = text
+        self.version = version
+        super().__init__(config)
+
+    def _reset(self):
+        super()._reset()
+        self._flags = {"ownership": False, "decision": False, "execution_decision": False,
+                       "risk": False, "issues": False, "execution_attempted": False}
+        self._topic_counts = {topic: 0 for topic in TOPIC_KEYWORDS}
+        self._sentiment_counts = {"Positive": 0, "Neutral": 0, "Negative": 0}
+        self._decisions = []
+        self._action_items = []
+        self._tension_points = []
+        self._uncontrolled_dependencies = 0
+        self._adjusted_sum = 0
+        self._count = 0
+        self._tail = deque(maxlen=10)  # masks of the last 10 segments
+        self._transcript = []
+
+    def _ingest(self, segments):
+        matcher = meeting_matcher()
+        bits = matcher.bits
+        lowers = [segment_text_lower(seg) for seg in segments]
+        flag_bits = {"ownership": bits["ownership"], "decision": bits["decision"], "risk": bits["risk"],
+                     "issues": bits["issue"], "execution_attempted": bits["execution_verb"]}
+
+        for seg, lower, mask in zip(segments, lowers, matcher.mask_all(lowers)):
+            text = seg.get("text", "")
+            start = seg.get("start", 0)
+
+            for name, bit in flag_bits.items():
+                if mask & bit:
+                    self._flags[name] = True
+            for topic in self._topic_counts:
+                if mask & bits[f"topic:{topic}"]:
+                    self._topic_counts[topic] += 1
+
+            label = seg.get("sentiment_label", "Neutral")
+            if label in self._sentiment_counts:
+                self._sentiment_counts[label] += 1
+
+            if _is_execution_decision(mask, is_question(text), bits):
+                self._flags["execution_decision"] = True
+                self._decisions.append({"text": text, "time": start})
+
+            action = _action_item(text, lower, mask, start, bits)
+            if action:
+                self._action_items.append(action)
+                self._uncontrolled_dependencies += _is_uncontrolled_dependency(action)
+
+            point = _tension_point(seg, seg.get("sentiment", 0), seg.get("sentiment_confidence", 0), mask & bits["tension"])
+            if point:
+                self._tension_points.append(point)
+
+            self._adjusted_sum += _adjust_sentiment_from_mask(mask, _business_raw_score(seg), bits)
+            self._count += 1
+            self._tail.append(mask)
+            self._transcript.append(_meeting_transcript_entry(seg))
+
+    def _snapshot(self) -> dict:
+        bits = meeting_matcher().bits
+        flags = self._flags
+        signals = {
+            "ownership": flags["ownership"],
+            "decision": flags["decision"],
+            "execution_decision": flags["execution_decision"],
+            "risk": flags["risk"],
+            "issues": flags["issues"],
+            "topic": _primary_topic(dict(self._topic_counts)),
+        }
+        execution_attempted = False if self.version == "legacy" else flags["execution_attempted"]
+
+        decisions = list(self._decisions)
+        signals["decision_state"] = "decision made" if signals["decision"] else "no final decision"
+        action_items = list(self._action_items)
+        signals["action_clarity"] = "next steps identified" if action_items else "no clear next steps"
 
+        tail = list(self._tail)
+        actual_blockers = [] if _no_blockers_in(tail, bits) else list(self._tension_points)
+
+        # evaluate_meeting_health with a running count of uncontrolled dependencies
+        if actual_blockers:
+            meeting_health = "blocked"
+        elif self._uncontrolled_dependencies:
+            meeting_health = "at_risk"
+        else:
+            meeting_health = "on_track"
+
+        avg_score = self._adjusted_sum / self._count if self._count else 0
+        business_sentiment = _business_sentiment(avg_score + _ending_boost_in(tail[-5:], bits), meeting_health)
+
+        return _compose_meeting_result(
+            signals, execution_attempted, dict(self._sentiment_counts), decisions, action_items,
+            actual_blockers, meeting_health, business_sentiment, list(self._transcript)
+        )
+
+class IncrementalSalesAnalyzer(_IncrementalAnalyzer):
+    """
+    Sales Mode for live sessions: add_segments(batch) appends to the time
+    index, objection list and transcript blob term set, and keeps prefix
+    counts for the position-weighted call sentiment; snapshot() runs the
+    remaining SALES_STAGES from that state and matches analyze_sales().
+    """
+
+    def _reset(self):
+        super()._reset()
+        self._timeline = TimeIndex([])
+        self._blob = _BlobTerms(sales_blob_terms())
+        self._objections = []
+        self._end_commitments = []  # positions of end-of-call commitment candidates
+        # Prefix counts over confident (>= sentiment_confidence) segments: all, Positive, Negative
+        self._confident = [0]
+        self._positive = [0]
+        self._negative = [0]
+        self._transcript = []
+
+    def _ingest(self, segments):
+        matcher = meeting_matcher()
+        lowers = [segment_text_lower(seg) for seg in segments]
+        objection_bits = [(obj_type, matcher.bit(f"objection:{obj_type}")) for obj_type in objection_keywords()]
+        objection_confidence = confidence_threshold("objection_confidence")
+        sentiment_confidence = confidence_threshold("sentiment_confidence")
+
+        for seg, lower, mask in zip(segments, lowers, matcher.mask_all(lowers)):
+            position = len(self._timeline)
+            self._timeline.append(seg)
+            self._blob.append(lower)
+
+            label = seg.get("sentiment_label", "Neutral")
+            confidence = seg["sentiment_confidence"]
+            if label == "Negative" and confidence >= objection_confidence:
+                for obj_type, bit in objection_bits:
+                    if mask & bit:
+                        self._objections.append({"type": obj_type, "text": seg["text"], "time": seg["start"]})
+
+            if _is_end_commitment(seg):
+                self._end_commitments.append(position)
+
+            confident = confidence >= sentiment_confidence
+            self._confident.append(self._confident[-1] + confident)
+            self._positive.append(self._positive[-1] + (confident and label == "Positive"))
+            self._negative.append(self._negative[-1] + (confident and label == "Negative"))
+            self._transcript.append(_sales_transcript_entry(seg))
+
+    def _snapshot(self) -> dict:
+        timeline = self._timeline
+        if not len(timeline):
+            return analyze_sales([])
+
+        # overall_call_sentiment: the last third (from 2n // 3) counts twice
+        n = len(timeline)
+        middle_end = 2 * n // 3
+        def weighted(prefix):
+            return prefix[n] + (prefix[n] - prefix[middle_end])
+        call_sentiment = _weighted_call_sentiment(weighted(self._positive), weighted(self._negative), weighted(self._confident))
+
+        # assess_sales_signals: commitment in the last 25%, blob terms
+        objections_initial = list(self._objections)
+        end_start, _ = timeline.span_last_fraction(0.25)
+        end_of_call_commitment = bool(self._end_commitments) and self._end_commitments[-1] >= end_start
+        signals = _sales_signals_from_blob(self._blob, objections_initial, recommend_actions(objections_initial), end_of_call_commitment)
+        signals["_text_blob"] = self._blob
+
+        inputs = {
+            "segments": timeline.segments,
+            "timeline": timeline,
+            "text_blob": self._blob,
+            "transcript": list(self._transcript),
+            "call_sentiment": call_sentiment,
+            "objections_initial": objections_initial,
+            "signals": signals,
+        }
+        return SALES_STAGES.run(inputs, ["result"])["result"]
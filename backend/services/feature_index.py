@@ -0,0 +1,50 @@
+from services.segment import segment_text_lower
+from services.time_index import TimeIndex
+
+class FeatureIndex:
+    """
+    Per-segment features computed in ONE pass and shared by every detector.
+
+    - masks[i]: bitset of every PhraseMatcher category segment i matches
+    - flags[name][i]: boolean predicates over the raw text (e.g. question)
+    - sentiment / confidence / labels / starts: parallel lists
+    - time: TimeIndex for window queries; its `order` maps time positions
+      back to positions in these columns
+
+    Detectors become lookups over these lists instead of rescanning text.
+    """
+
+    def __init__(self, segments, matcher, predicates: dict = None):
+        self.segments = segments
+        self.matcher = matcher
+        self.texts = [seg.get("text", "") for seg in segments]
+        self.lowers = [segment_text_lower(seg) for seg in segments]
+        self.masks = matcher.mask_all(self.lowers)
+        self.flags = {name: [predicate(text) for text in self.texts] for name, predicate in (predicates or {}).items()}
+        self.sentiment = [seg.get("sentiment", 0) for seg in segments]
+        self.confidence = [seg.get("sentiment_confidence", 0) for seg in segments]
+        self.labels = [seg.get("sentiment_label", "Neutral") for seg in segments]
+        self.starts = [seg.get("start", 0) for seg in segments]
+        self.time = TimeIndex(segments)
+
+    def __len__(self):
+        return len(self.segments)
+
+    def bit(self, category: str) -> int:
+        return self.matcher.bit(category)
+
+    def has(self, i: int, category: str) -> bool:
+        return bool(self.masks[i] & self.matcher.bit(category))
+
+    def any(self, category: str, indices=None) -> bool:
+        bit = self.matcher.bit(category)
+        masks = self.masks if indices is None else (self.masks[i] for i in indices)
+        return any(mask & bit for mask in masks)
+
+    def count(self, category: str) -> int:
+        bit = self.matcher.bit(category)
+        return sum(1 for mask in self.masks if mask & bit)
+
+    def where(self, category: str) -> list:
+        bit = self.matcher.bit(category)
+        return [i for i, mask in enumerate(self.masks) if mask & bit]
@@ -0,0 +1,103 @@
+import json
+import logging
+import os
+import re
+
+logger = logging.getLogger(__name__)
+
+LEXICON_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config", "sentiment_lexicon.json")
+
+# keywords.json categories that double as sentiment evidence (category -> weight)
+KEYWORD_POLARITY = {
+    "positive_signal": 1.0,
+    "blocker": -1.0,
+    "timeline_risk": -0.5,
+    "price_objection": -0.5,
+}
+
+# Confidence calibration (kept on the same 0-1 scale as the transformer)
+BASE_CONFIDENCE = 0.55
+CONFIDENCE_STEP = 0.15        # Added per unit of net polarity
+MAX_CONFIDENCE = 0.95         # Never claim model-level certainty
+NEUTRAL_MARKED_CONFIDENCE = 0.85  # Only neutral markers (agenda, update...) and no polar terms
+NEUTRAL_DEFAULT_CONFIDENCE = 0.6  # Nothing matched
+CONFLICTED_CONFIDENCE = 0.5       # Positive and negative evidence cancel out
+
+def _load_lexicon():
+    try:
+        with open(LEXICON_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        logger.error(f"Failed to load sentiment lexicon: {e}. Using keyword terms only.")
+        return {"positive": [], "negative": [], "neutral": [], "negators": []}
+
+class LexiconSentimentScorer:
+    """
+    Fast rule-based sentiment scorer used as a real fallback when the
+    transformer is unavailable or overloaded.
+
+    All terms are compiled into ONE regex (longest phrase first, optional
+    preceding negator), so a whole batch is scored with a single C-level
+    scan per text instead of per-term substring loops.
+    Output mirrors the transformers pipeline: [{"label", "score"}].
+    """
+
+    def __init__(self, weights: dict, negators: list):
+        self.weights = weights
+        terms = sorted(weights, key=len, reverse=True)
+        negator_group = "|".join(re.escape(n) for n in sorted(negators, key=len, reverse=True))
+        term_group = "|".join(re.escape(t) for t in terms) or r"(?!x)x"
+        negation = rf"(?:\b({negator_group})\s+)?" if negator_group else "()?"
+        self.pattern = re.compile(rf"{negation}\b({term_group})\b")
+
+    @classmethod
+    def from_config(cls, keywords_config: dict, lexicon: dict = None):
+        lexicon = lexicon if lexicon is not None else _load_lexicon()
+        weights = {}
+
+        for category, weight in KEYWORD_POLARITY.items():
+            for term in keywords_config.get("nlp_enrichment", {}).get(category, []):
+                weights[term.lower()] = weight
+
+        # Bundled list wins over keyword-derived weights
+        for term in lexicon.get("positive", []):
+            weights[term.lower()] = 1.0
+        for term in lexicon.get("negative", []):
+            weights[term.lower()] = -1.0
+        for term in lexicon.get("neutral", []):
+            weights[term.lower()] = 0.0
+
+        return cls(weights, [n.lower() for n in lexicon.get("negators", [])])
+
+    @staticmethod
+    def compiler_inputs(keywords_config: dict) -> dict:
+        """What from_config reads besides the keywords (part of the compiled-cache key)."""
+        return {"lexicon": _load_lexicon(), "keyword_polarity": KEYWORD_POLARITY}
+
+    def score_text(self, text: str) -> dict:
+        polarity = 0.0
+        polar_hits = 0
+        neutral_hits = 0
+
+        for negator, term in self.pattern.findall(text.lower()):
+            weight = self.weights[term]
+            if weight == 0.0:
+                neutral_hits += 1
+                continue
+            polar_hits += 1
+            polarity += -weight if negator else weight
+
+        if polarity > 0:
+            return {"label": "positive", "score": min(MAX_CONFIDENCE, BASE_CONFIDENCE + CONFIDENCE_STEP * polarity)}
+        if polarity < 0:
+            return {"label": "negative", "score": min(MAX_CONFIDENCE, BASE_CONFIDENCE + CONFIDENCE_STEP * -polarity)}
+        if polar_hits:
+            return {"label": "neutral", "score": CONFLICTED_CONFIDENCE}
+        if neutral_hits:
+            return {"label": "neutral", "score": NEUTRAL_MARKED_CONFIDENCE}
+        return {"label": "neutral", "score": NEUTRAL_DEFAULT_CONFIDENCE}
+
+    def __call__(self, texts, batch_size=None, **kwargs):
+        if isinstance(texts, str):
+            texts = [texts]
+        return [self.score_text(t) for t in texts]
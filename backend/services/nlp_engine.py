@@ -1,16 +1,69 @@
 import logging
+import math
 import sys
 import os
-from transformers import pipeline
+import numpy as np
+from collections import Counter
 
 # Ensure we can import from utils
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from utils.config_loader import KEYWORDS_CONFIG
+from utils.config_loader import KeywordConfig, active_config, current_config, register_compiler
+from services.lexicon_sentiment import LexiconSentimentScorer
+from services.segment import Segment, category_bit, decode_keywords, segment_extra
 
 logger = logging.getLogger(__name__)
 
-# Keyword Dictionaries (Loaded from Config)
-KEYWORDS_DB = KEYWORDS_CONFIG["nlp_enrichment"]
+# Keyword Dictionaries (Loaded from Config, compiled once per config version)
+def _keyword_phrases(keywords: dict) -> list:
+    """nlp_enrichment as [(category, phrases)] (flag bits are per process, so not compiled in)."""
+    return list(keywords["nlp_enrichment"].items())
+
+register_compiler("keyword_phrases", _keyword_phrases)
+register_compiler("lexicon_scorer", LexiconSentimentScorer.from_config, inputs=LexiconSentimentScorer.compiler_inputs)
+# Register flag bits in config order, so decoded keyword lists keep that order
+for _category in current_config().data["nlp_enrichment"]:
+    category_bit(_category)
+
+# Sentiment Model Configuration
+SENTIMENT_MODEL = "tabularisai/multilingual-sentiment-analysis"
+# "torch" (default) or "onnx" (int8 quantized, ONNX Runtime)
+SENTIMENT_BACKEND = os.environ.get("TALKSENSE_SENTIMENT_BACKEND", "torch").lower()
+
+# Token-aware Inference Configuration
+MAX_SENTIMENT_TOKENS = 512  # Model context (incl. special tokens)
+WINDOW_STRIDE_TOKENS = 64   # Overlap between windows of over-long segments
+# Longest coalesced text that is still ONE inference (window minus [CLS]/[SEP])
+COALESCE_MAX_TOKENS = MAX_SENTIMENT_TOKENS - 2
+SENTIMENT_MICRO_BATCH = 32  # Length-bucketed micro-batches keep padding small
+
+# Cross-request Dynamic Batching (see services/sentiment_batcher.py)
+BATCH_MAX_SIZE = int(os.environ.get("TALKSENSE_BATCH_MAX_SIZE", "64"))
+BATCH_MAX_WAIT_MS = float(os.environ.get("TALKSENSE_BATCH_MAX_WAIT_MS", "5"))
+# A request waiting longer on the batcher falls back to the lexicon scorer
+BATCH_TIMEOUT_S = float(os.environ.get("TALKSENSE_BATCH_TIMEOUT_S", "120"))
+
+# Load Shedding: switch to the lexicon scorer when this many texts are queued (0 = never)
+SHED_QUEUE_THRESHOLD = int(os.environ.get("TALKSENSE_SHED_QUEUE_THRESHOLD", "2048"))
+
+# Confidence Cascade: the lexicon tier scores every segment first and only
+# segments below this confidence reach the transformer
+CASCADE_ENABLED = os.environ.get("TALKSENSE_SENTIMENT_CASCADE", "0") == "1"
+CASCADE_THRESHOLD = float(os.environ.get("TALKSENSE_CASCADE_THRESHOLD", "0.85"))
+
+# sentiment_source values on enriched segments
+SOURCE_MODEL = "model"
+SOURCE_FAST = "fast"        # Cascade tier 1 was confident enough
+SOURCE_LEXICON = "lexicon"  # Degraded: fallback or load shedding
+SOURCE_NONE = "none"        # Too short to score
+
+# Adaptive Coalescing (0 = off): merge neighbouring segments up to a token
+# target and cap sentiment inferences per call
+COALESCE_TARGET_TOKENS = int(os.environ.get("TALKSENSE_COALESCE_TARGET_TOKENS", "0"))
+INFERENCE_BUDGET = int(os.environ.get("TALKSENSE_INFERENCE_BUDGET", "0"))
+WORD_TO_TOKEN_RATIO = 1.3  # Estimate when no fast tokenizer is loaded
+
+# Streaming enrichment: segments per inference micro-batch
+STREAM_MICRO_BATCH = int(os.environ.get("TALKSENSE_STREAM_MICRO_BATCH", "16"))
 
 # Semantic Merge Configuration
 CONTINUATION_STARTERS = [
@@ -18,17 +71,170 @@ CONTINUATION_STARTERS = [
     "also", "which", "that", "with"
 ]
 
+def map_sentiment_label(label: str, score: float):
+    """
+    Maps a raw model label to (signed score, Positive/Neutral/Negative).
+    Shared by every inference backend so labels stay identical.
+    """
+    label = label.lower()
+
+    if "positive" in label or "4 stars" in label or "5 stars" in label:
+        return score, "Positive"
+    if "negative" in label or "1 star" in label or "2 stars" in label:
+        return -score, "Negative"
+    return 0.0, "Neutral"
+
+def _softmax(logits):
+    logits = np.asarray(logits, dtype=np.float32)
+    shifted = np.exp(logits - logits.max(axis=-1, keepdims=True))
+    return shifted / shifted.sum(axis=-1, keepdims=True)
+
 class NLPEngine:
-    def __init__(self):
+    def __init__(self, backend: str = SENTIMENT_BACKEND, load_model: bool = True,
+                 cascade: bool = CASCADE_ENABLED, cascade_threshold: float = CASCADE_THRESHOLD):
+        self.backend = "torch"
+        self.sentiment_pipeline = None
+        self.batcher = None
+        self.cascade = cascade
+        self.cascade_threshold = cascade_threshold
+        self.coalesce_target_tokens = COALESCE_TARGET_TOKENS
+        self.inference_budget = INFERENCE_BUDGET
+        # Lifetime per-tier counters (fast / model / lexicon)
+        self.tier_counts = Counter()
+
+        if not load_model:
+            # Lexicon-only engine (tools, tests)
+            return
+
+        if backend == "onnx":
+            try:
+                from services.onnx_sentiment import OnnxSentimentPipeline
+                self.sentiment_pipeline = OnnxSentimentPipeline(SENTIMENT_MODEL)
+                self.backend = "onnx"
+                logger.info("NLP Engine: ONNX Runtime sentiment backend loaded successfully.")
+            except Exception as e:
+                logger.warning(f"NLP Engine: ONNX backend unavailable, falling back to torch. Error: {e}")
+
+        if self.sentiment_pipeline is None:
+            self.sentiment_pipeline = self._load_torch_pipeline()
+
+    def _load_torch_pipeline(self):
         try:
-            self.sentiment_pipeline = pipeline(
+            from transformers import pipeline
+            sentiment_pipeline = pipeline(
                 "sentiment-analysis",
-                model="tabularisai/multilingual-sentiment-analysis"
+                model=SENTIMENT_MODEL
             )
             logger.info("NLP Engine: Sentiment model loaded successfully.")
+            return sentiment_pipeline
+        except Exception as e:
+            logger.error(f"NLP Engine: Failed to load sentiment model (Offline?). Using lexicon fallback. Error: {e}")
+            return None
+
+    def start_batching(self, max_batch: int = BATCH_MAX_SIZE, max_wait_ms: float = BATCH_MAX_WAIT_MS,
+                       score_timeout: float = BATCH_TIMEOUT_S):
+        """
+        Routes all sentiment inference through one SentimentBatcher thread,
+        so concurrent requests share batches instead of contending for the model.
+        """
+        if self.batcher is None and self.sentiment_pipeline is not None:
+            from services.sentiment_batcher import SentimentBatcher
+            self.batcher = SentimentBatcher(self._run_sentiment, max_batch=max_batch, max_wait_ms=max_wait_ms,
+                                            score_timeout=score_timeout).start()
+        return self.batcher
+
+    def stop_batching(self):
+        if self.batcher is not None:
+            self.batcher.stop()
+            self.batcher = None
+
+    def _run_sentiment(self, texts: list) -> list:
+        """
+        Runs batch inference on the active backend.
+        If the ONNX session fails at runtime, switch to the torch pipeline for good.
+        """
+        try:
+            return self._score_texts(texts)
         except Exception as e:
-            logger.error(f"NLP Engine: Failed to load sentiment model (Offline?). Error: {e}")
-            self.sentiment_pipeline = None
+            if self.backend != "onnx":
+                raise
+            logger.error(f"ONNX sentiment inference failed, switching to torch pipeline: {e}")
+            self.backend = "torch"
+            self.sentiment_pipeline = self._load_torch_pipeline()
+            if self.sentiment_pipeline is None:
+                raise
+            return self._score_texts(texts)
+
+    def _score_texts(self, texts: list) -> list:
+        """
+        Single tokenization pass for the whole batch.
+        - Texts are tokenized once with the fast tokenizer (no per-call pipeline overhead).
+        - Truncation is by TOKENS: over-long texts are split into overlapping windows
+          and their class probabilities are averaged.
+        - Encodings are length-bucketed into micro-batches and fed straight to the model.
+        Returns the pipeline format: [{"label", "score"}] per input text.
+        """
+        tokenizer = getattr(self.sentiment_pipeline, "tokenizer", None)
+        if tokenizer is None or not getattr(tokenizer, "is_fast", False):
+            # Slow tokenizers cannot window; let the pipeline truncate by tokens
+            return self.sentiment_pipeline(texts, batch_size=len(texts), truncation=True)
+
+        max_length = min(MAX_SENTIMENT_TOKENS, tokenizer.model_max_length)
+        encoded = tokenizer(
+            texts,
+            truncation=True,
+            max_length=max_length,
+            stride=WINDOW_STRIDE_TOKENS,
+            return_overflowing_tokens=True,
+        )
+        sample_map = encoded.pop("overflow_to_sample_mapping")
+        windows = [{key: encoded[key][i] for key in encoded.keys()} for i in range(len(sample_map))]
+
+        # Length bucketing: similar-length windows share a batch -> minimal padding
+        order = sorted(range(len(windows)), key=lambda i: len(windows[i]["input_ids"]))
+        window_probs = [None] * len(windows)
+        for offset in range(0, len(order), SENTIMENT_MICRO_BATCH):
+            batch_ids = order[offset:offset + SENTIMENT_MICRO_BATCH]
+            batch = tokenizer.pad([windows[i] for i in batch_ids], return_tensors="np")
+            probs = _softmax(self._forward_logits(batch))
+            for row, window_id in enumerate(batch_ids):
+                window_probs[window_id] = probs[row]
+
+        # Average windows back into one prediction per text
+        totals = [None] * len(texts)
+        counts = [0] * len(texts)
+        for window_id, sample_id in enumerate(sample_map):
+            probs = window_probs[window_id]
+            totals[sample_id] = probs if totals[sample_id] is None else totals[sample_id] + probs
+            counts[sample_id] += 1
+
+        id2label = self._id2label()
+        results = []
+        for total, count in zip(totals, counts):
+            probs = total / count
+            best = int(probs.argmax())
+            results.append({"label": id2label[best], "score": float(probs[best])})
+        return results
+
+    def _forward_logits(self, batch):
+        """Runs pre-built tensors through the active backend model."""
+        if self.backend == "onnx":
+            return self.sentiment_pipeline.forward_logits(batch)
+
+        import torch
+        model = self.sentiment_pipeline.model
+        tensors = {
+            key: torch.as_tensor(value, device=model.device)
+            for key, value in batch.items()
+            if key in ("input_ids", "attention_mask", "token_type_ids")
+        }
+        with torch.no_grad():
+            return model(**tensors).logits.float().cpu().numpy()
+
+    def _id2label(self):
+        if self.backend == "onnx":
+            return self.sentiment_pipeline.id2label
+        return self.sentiment_pipeline.model.config.id2label
 
     def merge_semantic_segments(self, segments: list) -> list:
         """
@@ -36,11 +242,18 @@ class NLPEngine:
         Rule 1: Starts with continuation starter (and, but, so...)
         Rule 2: Previous segment implies continuation (no punctuation) AND needs merge.
         """
-        if not segments:
-            return []
+        return list(self.iter_merged(segments))
 
-        merged = []
-        buffer = None
+    def iter_merged(self, segments):
+        """
+        Streaming stage 1: semantic merge (see merge_semantic_segments).
+        Yields each merged segment as soon as the next one proves it is complete.
+        Accepts dicts or Segments and yields Segments; unmerged Segments are
+        passed through as-is (they are immutable, no copy needed).
+        """
+        buffer = None  # First segment of the current run
+        texts = []     # Texts merged into it
+        end = None
 
         for seg in segments:
             text = seg["text"].strip()
@@ -48,13 +261,13 @@ class NLPEngine:
                 continue
 
             if buffer is None:
-                buffer = seg.copy() # Copy to avoid mutating original list structure if needed
+                buffer, texts, end = seg, [seg["text"]], seg["end"]
                 continue
 
             # Check Merge Criteria
             is_continuation_word = text.lower().startswith(tuple(CONTINUATION_STARTERS))
             
-            prev_text = buffer["text"].strip()
+            prev_text = texts[-1].strip()
             prev_ends_punct = prev_text[-1] in ['.', '?', '!'] if prev_text else False
             curr_starts_lower = text[0].islower() if text else False
             
@@ -63,85 +276,351 @@ class NLPEngine:
 
             if should_merge:
                 # Merge into buffer
-                buffer["text"] += " " + text
-                buffer["end"] = seg["end"] # Extend time
+                texts.append(text)
+                end = seg["end"] # Extend time
             else:
                 # Push buffer and start new
-                merged.append(buffer)
-                buffer = seg.copy()
+                yield self._merged_segment(buffer, texts, end)
+                buffer, texts, end = seg, [seg["text"]], seg["end"]
+
+        if buffer is not None:
+            yield self._merged_segment(buffer, texts, end)
 
-        if buffer:
-            merged.append(buffer)
+    @staticmethod
+    def _merged_segment(first, texts, end):
+        if len(texts) == 1 and isinstance(first, Segment):
+            return first
+        # The run keeps its first segment's extra fields, as the dict merge did
+        return Segment(first["start"], end, " ".join(texts), extra=segment_extra(first))
 
-        return merged
+    def _token_lengths(self, texts: list) -> list:
+        tokenizer = getattr(self.sentiment_pipeline, "tokenizer", None)
+        if tokenizer is not None and getattr(tokenizer, "is_fast", False):
+            return [len(ids) for ids in tokenizer(texts, add_special_tokens=False)["input_ids"]]
+        return [math.ceil(len(t.split()) * WORD_TO_TOKEN_RATIO) for t in texts]
+
+    def coalesce_segments(self, segments: list, target_tokens: int = 0, inference_budget: int = 0):
+        """
+        Adaptive coalescing for choppy transcripts.
+        Greedily merges neighbouring segments while the combined length stays
+        within `target_tokens`. If that still leaves more than `inference_budget`
+        segments, the target is raised until the budget holds.
+        The target never exceeds COALESCE_MAX_TOKENS: a longer merge would be
+        split into several model windows, i.e. cost more than one inference. A
+        budget that cannot be met within that cap is reported as
+        `budget_met: False` (the call then needs more inferences than budgeted).
+        Merged segments keep the outer start/end plus the original `parts` timestamps.
+        Returns (segments, report) where report describes the granularity traded away.
+        """
+        if not segments or (target_tokens <= 0 and inference_budget <= 0):
+            return segments, None
+
+        lengths = self._token_lengths([seg["text"] for seg in segments])
+        total_tokens = sum(lengths)
+
+        target = min(max(target_tokens, 1), COALESCE_MAX_TOKENS)
+        if inference_budget > 0:
+            # Lower bound on the target that can possibly meet the budget
+            target = min(max(target, math.ceil(total_tokens / inference_budget)), COALESCE_MAX_TOKENS)
+
+        while True:
+            groups = []
+            current, current_len = [], 0
+            for idx, length in enumerate(lengths):
+                if current and current_len + length > target:
+                    groups.append(current)
+                    current, current_len = [], 0
+                current.append(idx)
+                current_len += length
+            if current:
+                groups.append(current)
+
+            # Greedy packing can overshoot by a few groups; widen and retry
+            if inference_budget <= 0 or len(groups) <= inference_budget or target >= COALESCE_MAX_TOKENS:
+                break
+            target = min(math.ceil(target * 1.25), COALESCE_MAX_TOKENS)
+
+        coalesced = []
+        for group in groups:
+            if len(group) == 1:
+                coalesced.append(Segment.from_dict(segments[group[0]]))
+                continue
+            first, last = segments[group[0]], segments[group[-1]]
+            coalesced.append(Segment(
+                first["start"],
+                last["end"],
+                " ".join(segments[i]["text"] for i in group),
+                parts=[(segments[i]["start"], segments[i]["end"]) for i in group],
+                extra=segment_extra(first),
+            ))
+
+        report = {
+            "segments_before": len(segments),
+            "segments_after": len(coalesced),
+            "target_tokens": target,
+            "mean_tokens_before": round(total_tokens / len(segments), 1),
+            "mean_tokens_after": round(total_tokens / len(coalesced), 1),
+            # Share of original boundaries that survived (1.0 = nothing merged)
+            "granularity_kept": round(len(coalesced) / len(segments), 3),
+        }
+        if inference_budget > 0:
+            report["budget_met"] = len(coalesced) <= inference_budget
+            if not report["budget_met"]:
+                logger.warning(f"Inference budget {inference_budget} not met: {len(coalesced)} segments "
+                               f"at the {COALESCE_MAX_TOKENS}-token window limit")
+        return coalesced, report
+
+    @property
+    def lexicon_scorer(self):
+        """Lexicon scorer of the active keyword config version."""
+        return active_config().artifact("lexicon_scorer")
 
     def extract_keywords(self, text):
-        found_keywords = []
-        text_lower = text.lower()
-        for category, phrases in KEYWORDS_DB.items():
+        return decode_keywords(self.keyword_flags(text.lower()))
+
+    def keyword_flags(self, text_lower: str, config: KeywordConfig = None) -> int:
+        """Keyword categories found in already-lowercased text, as Segment flag bits."""
+        flags = 0
+        for category, phrases in (config or active_config()).artifact("keyword_phrases"):
             for phrase in phrases:
                 if phrase in text_lower:
-                    found_keywords.append(category)
+                    flags |= category_bit(category)
                     break 
-        return found_keywords
+        return flags
 
-    def enrich_transcript(self, raw_segments: list) -> list:
-        # 0. Semantic Merge Layer (Pre-processing)
-        segments = self.merge_semantic_segments(raw_segments)
-        
-        # 1. First pass: Keywords and prep for batch sentiment
-        enriched_segments = []
-        texts_to_analyze = []
-        indices_to_update = []
-
-        for i, segment in enumerate(segments):
-            text = segment.get("text", "")
-            
-            # Keywords (keep per-segment logic as it's regex/substring based and fast)
-            keywords = self.extract_keywords(text)
-            
-            # Init default sentiment
-            segment_data = {
-                **segment,
-                "keywords": keywords,
-                "sentiment": 0.0,
-                "sentiment_label": "Neutral",
-                "sentiment_confidence": 0.0
-            }
-            
+    def should_shed_load(self) -> bool:
+        """True when the shared sentiment queue is over the load-shedding threshold."""
+        return bool(
+            self.batcher
+            and SHED_QUEUE_THRESHOLD > 0
+            and self.batcher.pending() >= SHED_QUEUE_THRESHOLD
+        )
+
+    def _infer_with_fallback(self, texts: list, config: KeywordConfig = None):
+        """
+        Returns (results, sentiment_source).
+        The lexicon scorer takes over when the model is missing, overloaded or failing,
+        so downstream analyzers never silently get an all-Neutral transcript.
+        """
+        lexicon_scorer = (config or active_config()).artifact("lexicon_scorer")
+        if self.sentiment_pipeline is None:
+            return lexicon_scorer(texts), SOURCE_LEXICON
+
+        if self.should_shed_load():
+            logger.warning(f"Sentiment queue over {SHED_QUEUE_THRESHOLD} texts, shedding load to lexicon scorer.")
+            return lexicon_scorer(texts), SOURCE_LEXICON
+
+        try:
+            # Shared cross-request batch when the batcher is running
+            if self.batcher:
+                return self.batcher.score(texts), SOURCE_MODEL
+            return self._run_sentiment(texts), SOURCE_MODEL
+        except Exception as e:
+            logger.error(f"Batch sentiment inference failed, using lexicon fallback: {e}")
+            return lexicon_scorer(texts), SOURCE_LEXICON
+
+    def _infer_cascade(self, texts: list, config: KeywordConfig = None):
+        """
+        Two-tier cascade. Returns (results, sources) aligned with texts.
+        Tier 1: lexicon scorer on every text (microseconds).
+        Tier 2: transformer only for texts where tier 1 is below the confidence threshold.
+        """
+        fast_results = (config or active_config()).artifact("lexicon_scorer")(texts)
+        results = list(fast_results)
+        sources = [SOURCE_FAST] * len(texts)
+
+        unsure = [i for i, r in enumerate(fast_results) if r["score"] < self.cascade_threshold]
+        if unsure:
+            model_results, source = self._infer_with_fallback([texts[i] for i in unsure], config)
+            for i, result in zip(unsure, model_results):
+                results[i] = result
+                sources[i] = source
+
+        return results, sources
+
+    def _infer(self, texts: list, config: KeywordConfig = None):
+        """Returns (results, sources) aligned with texts, cascade-aware."""
+        if self.cascade and self.sentiment_pipeline is not None:
+            return self._infer_cascade(texts, config)
+        results, source = self._infer_with_fallback(texts, config)
+        return results, [source] * len(texts)
+
+    def iter_keywords(self, segments, config: KeywordConfig = None):
+        """
+        Streaming stage 2: keyword flags + default (Neutral) sentiment fields.
+        Reuses the segment's cached lowercase text.
+        """
+        config = config or active_config()
+        for segment in segments:
+            yield segment.replace(
+                keyword_flags=self.keyword_flags(segment.text_lower, config),
+                sentiment=0.0,
+                sentiment_label="Neutral",
+                sentiment_confidence=0.0,
+                sentiment_source=SOURCE_NONE,
+            )
+
+    def iter_sentiment(self, segments, micro_batch: int = None, counters: Counter = None,
+                       config: KeywordConfig = None):
+        """
+        Streaming stage 3: micro-batched sentiment inference.
+        Segments are held only until their micro-batch is scored, then yielded
+        in order; memory is bounded by `micro_batch` (None = one batch per call).
+        """
+        counters = counters if counters is not None else Counter()
+        pending = []     # Everything not yet yielded (keeps output order)
+        candidates = []  # Positions in `pending` waiting for inference
+
+        for segment in segments:
             # specific logic for short texts - STRICT 4 WORD GUARDRAIL
-            if len(text.split()) >= 4:
-                texts_to_analyze.append(text[:512]) # Truncate for model safety
-                indices_to_update.append(i)
-                
-            enriched_segments.append(segment_data)
-
-        # 2. Batch Sentiment Inference
-        if self.sentiment_pipeline and texts_to_analyze:
-            try:
-                # Run batch inference
-                results = self.sentiment_pipeline(texts_to_analyze, batch_size=len(texts_to_analyze))
-                
-                # Map results back to segments
-                for idx, result in zip(indices_to_update, results):
-                    label = result["label"].lower()
-                    score = result["score"]
-                    
-                    sentiment_score = 0.0
-                    sentiment_label = "Neutral"
-                    
-                    if "positive" in label or "4 stars" in label or "5 stars" in label:
-                        sentiment_score = score
-                        sentiment_label = "Positive"
-                    elif "negative" in label or "1 star" in label or "2 stars" in label:
-                        sentiment_score = -score
-                        sentiment_label = "Negative"
-                    
-                    enriched_segments[idx]["sentiment"] = round(sentiment_score, 3)
-                    enriched_segments[idx]["sentiment_label"] = sentiment_label
-                    enriched_segments[idx]["sentiment_confidence"] = round(score, 2)
-                    
-            except Exception as e:
-                logger.error(f"Batch sentiment inference failed: {e}")
+            if len(segment.text.split()) >= 4:
+                counters["candidates"] += 1
+                candidates.append(len(pending))
+            pending.append(segment)
+
+            if micro_batch and len(candidates) >= micro_batch:
+                self._score_segments(pending, candidates, counters, config)
+                yield from pending
+                pending, candidates = [], []
+            elif not candidates:
+                # Nothing waiting on the model: release right away
+                yield from pending
+                pending = []
+
+        if candidates:
+            self._score_segments(pending, candidates, counters, config)
+        yield from pending
+
+    def _score_segments(self, pending: list, positions: list, counters: Counter, config: KeywordConfig = None):
+        """Scores pending[pos] for each position and swaps in the scored Segment."""
+        # Token-level truncation happens in _score_texts
+        results, sources = self._infer([pending[pos].text for pos in positions], config)
+        counters.update(sources)
+        counters["inferred"] += len(positions)
+        self.tier_counts.update(sources)
+
+        # Map results back to segments
+        for pos, result, source in zip(positions, results, sources):
+            score = result["score"]
+            sentiment_score, sentiment_label = map_sentiment_label(result["label"], score)
+
+            pending[pos] = pending[pos].replace(
+                sentiment=round(sentiment_score, 3),
+                sentiment_label=sentiment_label,
+                sentiment_confidence=round(score, 2),
+                sentiment_source=source,
+            )
+
+    def iter_enriched(self, raw_segments, stats: dict = None,
+                      coalesce_target_tokens: int = None, inference_budget: int = None,
+                      micro_batch: int = None, config: KeywordConfig = None):
+        """
+        Composable streaming pipeline: merge -> keywords -> micro-batched sentiment.
+        Yields enriched segments as they become ready.
+
+        Coalescing needs the whole call, so when it is active the stream is
+        materialized at that point (still one pass per stage).
+        `stats` is filled once the generator is exhausted.
+        Every stage uses one keyword config version (`config`, default: the
+        active one when the generator starts).
+        """
+        config = config or active_config()
+        target_tokens = self.coalesce_target_tokens if coalesce_target_tokens is None else coalesce_target_tokens
+        budget = self.inference_budget if inference_budget is None else inference_budget
+
+        # 0. Semantic Merge Layer (Pre-processing)
+        stream = self.iter_merged(raw_segments)
+
+        # 0b. Adaptive Coalescing (bounded enrichment cost on long, choppy calls)
+        coalesce_report = None
+        if target_tokens > 0 or budget > 0:
+            stream, coalesce_report = self.coalesce_segments(list(stream), target_tokens, budget)
+
+        # 1. Keywords
+        stream = self.iter_keywords(stream, config)
+
+
+        # 2. Sentiment (micro-batched)
+        counters = Counter()
+        produced = 0
+        for segment in self.iter_sentiment(stream, micro_batch=micro_batch, counters=counters, config=config):
+            produced += 1
+            yield segment
+
+        if stats is not None:
+            tiers = {k: v for k, v in counters.items() if k not in ("candidates", "inferred")}
+            stats.update({
+                "raw_segments": len(raw_segments) if hasattr(raw_segments, "__len__") else None,
+                "segments": produced,
+                "sentiment_candidates": counters["candidates"],
+                "sentiment_inferred": counters["inferred"],
+                "sentiment_tiers": tiers,
+            })
+            if coalesce_report:
+                stats["coalescing"] = coalesce_report
+
+    def enrich_transcript(self, raw_segments: list, stats: dict = None,
+                          coalesce_target_tokens: int = None, inference_budget: int = None,
+                          config: KeywordConfig = None) -> list:
+        """
+        Merge -> keywords -> batched sentiment (see iter_enriched), as a list.
+        If `stats` is given it is filled with per-call enrichment counters
+        (segment counts and how many texts each sentiment tier scored).
+
+        Coalescing: `coalesce_target_tokens` / `inference_budget` (engine defaults
+        when None) bound the number of segments, and so inferences, per call.
+        """
+        return list(self.iter_enriched(
+            raw_segments,
+            stats=stats,
+            coalesce_target_tokens=coalesce_target_tokens,
+            inference_budget=inference_budget,
+            config=config,
+        ))
+
+    def reenrich(self, previous: list, edited: list, stats: dict = None, rekey: bool = False,
+                 config: KeywordConfig = None) -> list:
+        """
+        Re-enrichment after transcript corrections.
+        `edited` segments ({"start", "end", "text"}, e.g. corrected response
+        segments) go through the semantic merge again, so an edit can join or
+        split segments. A merged segment identical to one of `previous` (same
+        start, end and text) is reused with its keywords and sentiment; only
+        changed or re-merged segments get keywords and sentiment inference, so
+        the cost follows the size of the edit.
+        `rekey`: `previous` was flagged under another keyword config version,
+        so reused segments get fresh keyword flags (no inference).
+        """
+        config = config or active_config()
+        reusable = {(seg["start"], seg["end"], seg["text"]): seg for seg in previous}
+        merged = list(self.iter_merged(
+            {"start": seg["start"], "end": seg["end"], "text": seg["text"]} for seg in edited
+        ))
+
+        enriched = []
+        changed = []  # positions in `enriched` with new text (keywords and sentiment)
+        for segment in merged:
+            reused = reusable.get((segment.start, segment.end, segment.text))
+            if reused is None:
+                changed.append(len(enriched))
+                enriched.append(segment)
+            elif rekey:
+                enriched.append(reused.replace(keyword_flags=self.keyword_flags(reused.text_lower, config)))
+            else:
+                enriched.append(reused)
+
+        counters = Counter()
+        fresh = self.iter_sentiment(self.iter_keywords([enriched[i] for i in changed], config),
+                                    counters=counters, config=config)
+        for position, segment in zip(changed, fresh):
+            enriched[position] = segment
 
-        return enriched_segments
\ No newline at end of file
+        if stats is not None:
+            stats.update({
+                "segments": len(enriched),
+                "reused": len(enriched) - len(changed),
+                "reenriched": len(changed),
+                "sentiment_inferred": counters["inferred"],
+                "sentiment_tiers": {k: v for k, v in counters.items() if k not in ("candidates", "inferred")},
+            })
+        return enriched
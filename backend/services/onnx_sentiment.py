@@ -0,0 +1,132 @@
+import logging
+import os
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Exported artifacts live next to the backend so every worker reuses them
+ONNX_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "models", "onnx")
+
+ONNX_OPSET = 14
+
+
+def _artifact_dir(model_name: str, cache_dir: str) -> str:
+    return os.path.join(cache_dir, model_name.replace("/", "__"))
+
+
+def export_quantized_model(model_name: str, cache_dir: str = ONNX_CACHE_DIR) -> str:
+    """
+    Exports a HuggingFace sequence classifier to ONNX and applies dynamic
+    int8 quantization. The artifact is cached on disk, so the export only
+    happens on the first start.
+    Returns the path of the quantized model.
+    """
+    target_dir = _artifact_dir(model_name, cache_dir)
+    fp32_path = os.path.join(target_dir, "model.onnx")
+    int8_path = os.path.join(target_dir, "model.int8.onnx")
+
+    if os.path.exists(int8_path):
+        return int8_path
+
+    # Heavy imports only happen when we actually need to export
+    import torch
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    os.makedirs(target_dir, exist_ok=True)
+    logger.info(f"ONNX Backend: Exporting {model_name} to {target_dir} (one-time).")
+
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModelForSequenceClassification.from_pretrained(model_name)
+    model.eval()
+
+    dummy = tokenizer(["export sample"], return_tensors="pt")
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in dummy]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["logits"] = {0: "batch"}
+
+    # Write to temp files and rename, so concurrent workers never load a half-written model
+    tmp_fp32 = fp32_path + f".{os.getpid()}.tmp"
+    tmp_int8 = int8_path + f".{os.getpid()}.tmp"
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            tuple(dummy[name] for name in input_names),
+            tmp_fp32,
+            input_names=input_names,
+            output_names=["logits"],
+            dynamic_axes=dynamic_axes,
+            opset_version=ONNX_OPSET,
+        )
+    os.replace(tmp_fp32, fp32_path)
+
+    quantize_dynamic(fp32_path, tmp_int8, weight_type=QuantType.QInt8)
+    os.replace(tmp_int8, int8_path)
+
+    logger.info("ONNX Backend: Quantized model cached.")
+    return int8_path
+
+
+class OnnxSentimentPipeline:
+    """
+    Drop-in replacement for the transformers sentiment pipeline backed by
+    ONNX Runtime. Calling it returns the same [{"label", "score"}] shape,
+    so NLPEngine keeps a single label mapping for both backends.
+    """
+
+    def __init__(self, model_name: str, cache_dir: str = ONNX_CACHE_DIR, max_length: int = 512):
+        import onnxruntime as ort
+        from transformers import AutoConfig, AutoTokenizer
+
+        model_path = export_quantized_model(model_name, cache_dir)
+
+        self.model_name = model_name
+        self.max_length = max_length
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self.id2label = AutoConfig.from_pretrained(model_name).id2label
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        self.input_names = [i.name for i in self.session.get_inputs()]
+
+    def forward_logits(self, encoded) -> np.ndarray:
+        """Runs the session on an already tokenized batch (numpy tensors)."""
+        feeds = {name: np.asarray(encoded[name], dtype=np.int64) for name in self.input_names}
+        return self.session.run(["logits"], feeds)[0]
+
+    def __call__(self, texts, batch_size=None, **kwargs):
+        if isinstance(texts, str):
+            texts = [texts]
+        if not texts:
+            return []
+
+        batch_size = batch_size or len(texts)
+        results = []
+        for offset in range(0, len(texts), batch_size):
+            chunk = texts[offset:offset + batch_size]
+            encoded = self.tokenizer(
+                chunk,
+                padding=True,
+                truncation=True,
+                max_length=self.max_length,
+                return_tensors="np",
+            )
+            logits = self.forward_logits(encoded)
+            results.extend(logits_to_predictions(logits, self.id2label))
+        return results
+
+
+def logits_to_predictions(logits, id2label) -> list:
+    """Softmax + argmax, formatted like the transformers pipeline output."""
+    logits = np.asarray(logits, dtype=np.float32)
+    shifted = logits - logits.max(axis=-1, keepdims=True)
+    probs = np.exp(shifted)
+    probs /= probs.sum(axis=-1, keepdims=True)
+
+    best = probs.argmax(axis=-1)
+    return [
+        {"label": id2label[int(idx)], "score": float(probs[row, idx])}
+        for row, idx in enumerate(best)
+    ]
@@ -0,0 +1,90 @@
+from services.time_index import TimeIndex
+
+# Segments per page when the client gives no limit, and the most it may ask for
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+def parse_fields(spec: str) -> tuple:
+    """
+    `fields` parameter -> (includes, excludes), each a list of key paths.
+    Comma-separated dotted paths ("insights.summary,insights.quality");
+    a leading "-" removes a path ("-insights.transcript"). Raises ValueError.
+    """
+    includes, excludes = [], []
+    for entry in (spec or "").split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        target = excludes if entry.startswith("-") else includes
+        path = entry.lstrip("-").split(".")
+        if not all(path):
+            raise ValueError(f"Invalid field path: {entry!r}")
+        target.append(path)
+    return includes, excludes
+
+def _copy_path(source: dict, target: dict, path: list):
+    for key in path[:-1]:
+        source = source.get(key)
+        if not isinstance(source, dict):
+            return
+        target = target.setdefault(key, {})
+    if path[-1] in source:
+        target[path[-1]] = source[path[-1]]
+
+def _drop_path(content: dict, path: list) -> dict:
+    """`content` without `path`; only the dicts along the path are copied."""
+    key = path[0]
+    if key not in content:
+        return content
+    trimmed = dict(content)
+    if len(path) == 1:
+        del trimmed[key]
+    elif isinstance(content[key], dict):
+        trimmed[key] = _drop_path(content[key], path[1:])
+    return trimmed
+
+def project(content: dict, spec: str, always: tuple = ()) -> dict:
+    """
+    The parts of a response `content` selected by a `fields` spec (see
+    parse_fields). With includes, only those paths (plus the top-level
+    `always` keys) are kept; excludes are removed afterwards. Paths missing
+    in this response (e.g. sales fields of a meeting) are skipped.
+    """
+    includes, excludes = parse_fields(spec)
+    if includes:
+        projected = {key: content[key] for key in always if key in content}
+        for path in includes:
+            _copy_path(content, projected, path)
+        content = projected
+    for path in excludes:
+        content = _drop_path(content, path)
+    return content
+
+def page_segments(timeline: TimeIndex, start: float = None, end: float = None,
+                  offset: int = 0, limit: int = DEFAULT_PAGE_SIZE) -> dict:
+    """
+    One page of the segments with start <= segment start < end (either bound
+    optional), by start time. Returns {"segments", "total", "offset", "next_offset"}
+    where next_offset is None on the last page.
+    """
+    lo, hi = timeline.span_between(float("-inf") if start is None else start,
+                                   float("inf") if end is None else end)
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    offset = max(0, offset)
+    first = lo + offset
+    last = min(hi, first + limit)
+    return {
+        "segments": timeline.segments[first:last],
+        "total": hi - lo,
+        "offset": offset,
+        "next_offset": offset + limit if last < hi else None,
+    }
+
+def carries_segments(content: dict, depth: int = 3) -> bool:
+    """True if a segment list ("segments" / "transcript") is still in `content` (checked `depth` levels down)."""
+    for key, value in content.items():
+        if key in ("segments", "transcript") and isinstance(value, list):
+            return True
+        if isinstance(value, dict) and depth > 1 and carries_segments(value, depth - 1):
+            return True
+    return False
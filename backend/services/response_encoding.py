@@ -0,0 +1,131 @@
+import gzip
+import json
+import logging
+import os
+
+from fastapi.responses import Response
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+# Optional fast encoders: stdlib json / gzip are used when they are missing
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+MEDIA_JSON = "application/json"
+MEDIA_MSGPACK = "application/msgpack"
+# Accepted spellings of MessagePack
+MSGPACK_TYPES = (MEDIA_MSGPACK, "application/x-msgpack", "application/vnd.msgpack")
+
+# Bodies below this size are sent uncompressed (0 = compress everything)
+COMPRESS_MIN_BYTES = int(os.environ.get("TALKSENSE_COMPRESS_MIN_BYTES", "1024"))
+GZIP_LEVEL = int(os.environ.get("TALKSENSE_GZIP_LEVEL", "5"))
+BROTLI_QUALITY = int(os.environ.get("TALKSENSE_BROTLI_QUALITY", "4"))
+# Responses with at least this many transcript segments are encoded off the event loop
+OFFLOAD_MIN_SEGMENTS = int(os.environ.get("TALKSENSE_ENCODE_OFFLOAD_SEGMENTS", "200"))
+
+def _default(value):
+    # NumPy scalars/arrays can reach the response from columnar code paths;
+    # matched by module so the response layer does not import numpy
+    if type(value).__module__ == "numpy" and hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"Type is not serializable: {type(value).__name__}")
+
+def _parse_header(header: str) -> list:
+    """[(value, q)] of an Accept / Accept-Encoding header, highest q first (stable)."""
+    entries = []
+    for part in (header or "").split(","):
+        value, *params = [p.strip() for p in part.split(";")]
+        if not value:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, raw = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(raw)
+                except ValueError:
+                    q = 0.0
+        entries.append((value.lower(), q))
+    return sorted(entries, key=lambda entry: -entry[1])
+
+def negotiate(accept: str = None, accept_encoding: str = None) -> tuple:
+    """
+    (media type, content coding or None) for the request headers.
+    MessagePack only when asked for (and installed), JSON otherwise;
+    brotli is preferred over gzip at equal q.
+    """
+    media_type = MEDIA_JSON
+    for value, q in _parse_header(accept):
+        if q <= 0:
+            continue
+        if value in MSGPACK_TYPES and msgpack is not None:
+            media_type = MEDIA_MSGPACK
+            break
+        if value in (MEDIA_JSON, "application/*", "*/*"):
+            break
+
+    available = ["br", "gzip"] if brotli is not None else ["gzip"]
+    offered = {}
+    for value, q in _parse_header(accept_encoding):
+        if value == "*":
+            for coding in available:
+                offered.setdefault(coding, q)
+        elif value in available:
+            offered[value] = q
+    candidates = [(q, -available.index(coding), coding) for coding, q in offered.items() if q > 0]
+    coding = max(candidates)[2] if candidates else None
+    return media_type, coding
+
+def encode_body(content, media_type: str = MEDIA_JSON) -> bytes:
+    """Serializes `content` (orjson when installed, else stdlib json; or MessagePack)."""
+    if media_type == MEDIA_MSGPACK:
+        return msgpack.packb(content, use_bin_type=True, default=_default)
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def compress(body: bytes, coding: str) -> bytes:
+    if coding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    if coding == "gzip":
+        return gzip.compress(body, compresslevel=GZIP_LEVEL)
+    return body
+
+def encode_line(content) -> str:
+    """One NDJSON line (fast encoder when installed), newline included."""
+    return encode_body(content).decode("utf-8") + "\n"
+
+def encode_response(content, accept: str = None, accept_encoding: str = None) -> tuple:
+    """(body, headers) for the negotiated media type and content coding."""
+    media_type, coding = negotiate(accept, accept_encoding)
+    body = encode_body(content, media_type)
+    headers = {"Content-Type": media_type, "Vary": "Accept, Accept-Encoding"}
+    if coding and len(body) >= COMPRESS_MIN_BYTES:
+        body = compress(body, coding)
+        headers["Content-Encoding"] = coding
+    return body, headers
+
+async def encoded_response(content, accept: str = None, accept_encoding: str = None,
+                           status_code: int = 200, segments: int = 0) -> Response:
+    """
+    Response for `content` with content negotiation (see negotiate). Bodies of
+    calls with `segments` >= OFFLOAD_MIN_SEGMENTS are encoded and compressed in
+    the threadpool, so a long call never blocks the event loop.
+    """
+    if segments >= OFFLOAD_MIN_SEGMENTS:
+        body, headers = await run_in_threadpool(encode_response, content, accept, accept_encoding)
+    else:
+        body, headers = encode_response(content, accept, accept_encoding)
+    media_type = headers.pop("Content-Type")
+    return Response(content=body, status_code=status_code, headers=headers, media_type=media_type)
@@ -0,0 +1,193 @@
+import json
+import os
+
+import numpy as np
+
+RULES_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config", "scoring_rules.json")
+
+class ScoringTable:
+    """
+    One scorer from scoring_rules.json, compiled into a decision table over a
+    boolean signal vector (`signals` gives the column order):
+    - overrides: the first matching condition returns a fixed result
+    - rules: `weight` is added (and `driver` listed) when the signal is `is`
+      (default true)
+    - labels: the first matching condition picks the label, clamps the score
+      (min_score / max_score) and appends its drivers; the last one is the
+      unconditional default
+    Conditions: {"any": [...]}, {"all": [...]}, {"score_at_least": n}, or {} (always).
+
+    evaluate(signals) scores one signal dict like the old if-chains;
+    evaluate_batch(columns) scores many rows at once with NumPy.
+    """
+
+    def __init__(self, name: str, spec: dict):
+        self.name = name
+        self.outputs = tuple(spec.get("outputs", ("label", "score", "drivers")))
+        self._columns = {}
+
+        self.rules = [
+            (self._column(rule["signal"]), bool(rule.get("is", True)), rule.get("weight", 0), rule.get("driver"))
+            for rule in spec.get("rules", [])
+        ]
+        self.overrides = [(self._condition(o["when"]), o["result"]) for o in spec.get("overrides", [])]
+        self.labels = [
+            (self._condition(entry.get("when", {})), entry["label"], entry.get("min_score"),
+             entry.get("max_score"), tuple(entry.get("drivers", ())))
+            for entry in spec.get("labels", [])
+        ]
+        if not self.labels or self.labels[-1][0] != ("always", ()):
+            raise ValueError(f"Scoring table {name!r}: the last label needs no condition (default)")
+
+        self.signals = tuple(self._columns)
+        self.weights = np.array([weight for _, _, weight, _ in self.rules]) if self.rules else np.zeros(0, dtype=np.int64)
+        self.drivers = [driver for _, _, _, driver in self.rules]
+
+    def _column(self, signal: str) -> int:
+        return self._columns.setdefault(signal, len(self._columns))
+
+    def _condition(self, when: dict):
+        if len(when) > 1:
+            raise ValueError(f"Scoring table {self.name!r}: one condition per entry, got {sorted(when)}")
+        if "any" in when:
+            return ("any", tuple(self._column(s) for s in when["any"]))
+        if "all" in when:
+            return ("all", tuple(self._column(s) for s in when["all"]))
+        if "score_at_least" in when:
+            return ("score", when["score_at_least"])
+        if when:
+            raise ValueError(f"Scoring table {self.name!r}: unknown condition {sorted(when)}")
+        return ("always", ())
+
+    # --- One row ---
+
+    @staticmethod
+    def _matches(condition, values, score) -> bool:
+        kind, arg = condition
+        if kind == "any":
+            return any(values[c] for c in arg)
+        if kind == "all":
+            return all(values[c] for c in arg)
+        if kind == "score":
+            return score >= arg
+        return True
+
+    def evaluate(self, signals: dict) -> dict:
+        """Scores one signal dict (missing signals count as false)."""
+        values = [bool(signals.get(name, False)) for name in self.signals]
+
+        for condition, result in self.overrides:
+            if self._matches(condition, values, 0):
+                return {key: list(result[key]) if key == "drivers" else result[key] for key in self.outputs}
+
+        score = 0
+        drivers = []
+        for column, expected, weight, driver in self.rules:
+            if values[column] == expected:
+                score += weight
+                if driver:
+                    drivers.append(driver)
+
+        for condition, label, min_score, max_score, label_drivers in self.labels:
+            if self._matches(condition, values, score):
+                if min_score is not None:
+                    score = max(score, min_score)
+                if max_score is not None:
+                    score = min(score, max_score)
+                drivers.extend(label_drivers)
+                break
+
+        result = {"label": label, "score": score, "drivers": drivers}
+        return {key: result[key] for key in self.outputs}
+
+    # --- Many rows ---
+
+    def signal_matrix(self, columns) -> np.ndarray:
+        """(rows, signals) bool matrix from {signal: column} (missing = false) or a matrix in `signals` order."""
+        if not isinstance(columns, dict):
+            return np.asarray(columns, dtype=bool).reshape(-1, len(self.signals))
+        rows = len(next(iter(columns.values()))) if columns else 0
+        matrix = np.zeros((rows, len(self.signals)), dtype=bool)
+        for name, column in self._columns.items():
+            if name in columns:
+                matrix[:, column] = np.asarray(columns[name], dtype=bool)
+        return matrix
+
+    @staticmethod
+    def _mask(condition, matrix, score) -> np.ndarray:
+        kind, arg = condition
+        if kind == "any":
+            return matrix[:, list(arg)].any(axis=1)
+        if kind == "all":
+            return matrix[:, list(arg)].all(axis=1)
+        if kind == "score":
+            return score >= arg
+        return np.ones(len(matrix), dtype=bool)
+
+    @staticmethod
+    def _first_match(masks, rows) -> np.ndarray:
+        """Index of the first true mask per row (len(masks) if none)."""
+        if not masks:
+            return np.full(rows, 0, dtype=np.int64)
+        stacked = np.vstack(masks + [np.ones(rows, dtype=bool)])
+        return stacked.argmax(axis=0)
+
+    def evaluate_batch(self, columns) -> dict:
+        """
+        Scores every row. Returns {"label", "score"} arrays plus "fired"
+        (rows x rules, which rules added their weight), "label_index" and
+        "override_index" (len(overrides) = none); see row_drivers().
+        """
+        matrix = self.signal_matrix(columns)
+        rows = len(matrix)
+
+        expected = np.array([e for _, e, _, _ in self.rules], dtype=bool)
+        fired = matrix[:, np.array([c for c, _, _, _ in self.rules], dtype=np.int64)] == expected
+        score = fired @ self.weights
+
+        label_index = np.full(rows, len(self.labels) - 1, dtype=np.int64)
+        undecided = np.ones(rows, dtype=bool)
+        for i, (condition, _, _, _, _) in enumerate(self.labels):
+            hit = undecided & self._mask(condition, matrix, score)
+            label_index[hit] = i
+            undecided &= ~hit
+        for i, (_, _, min_score, max_score, _) in enumerate(self.labels):
+            chosen = label_index == i
+            if min_score is not None:
+                score = np.where(chosen, np.maximum(score, min_score), score)
+            if max_score is not None:
+                score = np.where(chosen, np.minimum(score, max_score), score)
+        label = np.array([entry[1] for entry in self.labels], dtype=object)[label_index]
+
+        zero = np.zeros(rows)
+        override_index = self._first_match([self._mask(c, matrix, zero) for c, _ in self.overrides], rows)
+        if self.overrides:
+            overridden = override_index < len(self.overrides)
+            for i, (_, result) in enumerate(self.overrides):
+                chosen = override_index == i
+                label[chosen] = result["label"]
+                if "score" in result:
+                    score = np.where(chosen, result["score"], score)
+            fired = fired & ~overridden[:, None]
+
+        return {"label": label, "score": score, "fired": fired,
+                "label_index": label_index, "override_index": override_index}
+
+    def row_drivers(self, batch: dict, row: int) -> list:
+        """The `drivers` list evaluate() would return for one row of evaluate_batch()."""
+        override = int(batch["override_index"][row])
+        if override < len(self.overrides):
+            return list(self.overrides[override][1].get("drivers", []))
+        drivers = [d for d, hit in zip(self.drivers, batch["fired"][row]) if hit and d]
+        return drivers + list(self.labels[int(batch["label_index"][row])][4])
+
+def load_scoring_rules(path: str = RULES_PATH) -> dict:
+    """Compiles every table in scoring_rules.json. Raises on a malformed file."""
+    with open(path, "r", encoding="utf-8") as f:
+        spec = json.load(f)
+    return {name: ScoringTable(name, table) for name, table in spec.items()}
+
+SCORING_RULES = load_scoring_rules()
+
+def evaluate(name: str, signals: dict) -> dict:
+    return SCORING_RULES[name].evaluate(signals)
@@ -0,0 +1,200 @@
+import threading
+from collections.abc import Mapping
+
+# --- KEYWORD FLAGS ---
+# Keyword categories are stored as bits of one int per segment instead of a
+# list of strings. Bits are assigned on first use, so config changes that add
+# categories keep working without a restart.
+_CATEGORY_BITS = {}
+_CATEGORY_NAMES = []
+_CATEGORY_LOCK = threading.Lock()
+
+def category_bit(name: str) -> int:
+    bit = _CATEGORY_BITS.get(name)
+    if bit is None:
+        with _CATEGORY_LOCK:
+            bit = _CATEGORY_BITS.get(name)
+            if bit is None:
+                bit = 1 << len(_CATEGORY_NAMES)
+                _CATEGORY_NAMES.append(name)
+                _CATEGORY_BITS[name] = bit
+    return bit
+
+def encode_keywords(names) -> int:
+    flags = 0
+    for name in names:
+        flags |= category_bit(name)
+    return flags
+
+def decode_keywords(flags: int) -> list:
+    names = []
+    index = 0
+    while flags:
+        if flags & 1:
+            names.append(_CATEGORY_NAMES[index])
+        flags >>= 1
+        index += 1
+    return names
+
+
+class Segment(Mapping):
+    """
+    Immutable, slotted transcript segment shared from STT through the analyzers.
+
+    - Read-only Mapping: seg["text"], seg.get("sentiment", 0) and {**seg} keep
+      working everywhere a segment dict was used before.
+    - `text_lower` is computed once; analyzers use it instead of re-lowering.
+    - Keywords are compact int flags; seg["keywords"] decodes them to names.
+    - Stages derive new segments with replace() instead of copying dicts.
+    - Input fields without a slot (e.g. Whisper's id, avg_logprob) are kept
+      read-only in `extra` and returned after the public keys.
+    Convert with to_dict() only at the response boundary.
+    """
+
+    __slots__ = (
+        "start", "end", "text", "text_lower", "keyword_flags",
+        "sentiment", "sentiment_label", "sentiment_confidence", "sentiment_source",
+        "parts", "extra",
+    )
+
+    # Public mapping keys, in response order
+    KEYS = (
+        "start", "end", "text", "keywords",
+        "sentiment", "sentiment_label", "sentiment_confidence", "sentiment_source",
+    )
+
+    def __init__(self, start, end, text, keyword_flags=0, sentiment=0.0, sentiment_label="Neutral",
+                 sentiment_confidence=0.0, sentiment_source="none", parts=None, text_lower=None, extra=None):
+        set_field = object.__setattr__
+        set_field(self, "start", start)
+        set_field(self, "end", end)
+        set_field(self, "text", text)
+        set_field(self, "text_lower", text.lower() if text_lower is None else text_lower)
+        set_field(self, "keyword_flags", keyword_flags)
+        set_field(self, "sentiment", sentiment)
+        set_field(self, "sentiment_label", sentiment_label)
+        set_field(self, "sentiment_confidence", sentiment_confidence)
+        set_field(self, "sentiment_source", sentiment_source)
+        # Original (start, end) pairs when several segments were coalesced
+        set_field(self, "parts", tuple(parts) if parts else None)
+        # Never mutated: replace() shares it between derived segments
+        set_field(self, "extra", extra or None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Segment is immutable; use replace()")
+
+    def __delattr__(self, name):
+        raise AttributeError("Segment is immutable; use replace()")
+
+    # --- Mapping protocol ---
+
+    def __getitem__(self, key):
+        if key in _PLAIN_KEYS:
+            return getattr(self, key)
+        if key == "keywords":
+            return decode_keywords(self.keyword_flags)
+        if key == "parts" and self.parts is not None:
+            return [{"start": start, "end": end} for start, end in self.parts]
+        if self.extra is not None and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        # Analyzers call get() in hot loops; skip Mapping.get's try/except
+        if key in _PLAIN_KEYS:
+            return getattr(self, key)
+        if key in self:
+            return self[key]
+        return default
+
+    def __contains__(self, key):
+        return (key in _PLAIN_KEYS or key == "keywords" or (key == "parts" and self.parts is not None)
+                or (self.extra is not None and key in self.extra))
+
+    def __iter__(self):
+        yield from Segment.KEYS
+        if self.parts is not None:
+            yield "parts"
+        if self.extra is not None:
+            yield from self.extra
+
+    def __len__(self):
+        return len(Segment.KEYS) + (self.parts is not None) + (len(self.extra) if self.extra is not None else 0)
+
+    def __repr__(self):
+        return (f"Segment(start={self.start!r}, end={self.end!r}, text={self.text!r}, "
+                f"sentiment_label={self.sentiment_label!r})")
+
+    def __reduce__(self):
+        # Slotted + immutable: pickle (process pools) through the constructor
+        return (Segment, (self.start, self.end, self.text, self.keyword_flags, self.sentiment,
+                          self.sentiment_label, self.sentiment_confidence, self.sentiment_source,
+                          self.parts, self.text_lower, self.extra))
+
+    # --- Construction helpers ---
+
+    def replace(self, **changes):
+        """Returns a new Segment with `changes` applied (`keywords` accepts names)."""
+        if "keywords" in changes:
+            changes["keyword_flags"] = encode_keywords(changes.pop("keywords"))
+        text = changes.pop("text", self.text)
+        text_lower = self.text_lower if text is self.text else None
+        fields = {
+            "start": self.start,
+            "end": self.end,
+            "keyword_flags": self.keyword_flags,
+            "sentiment": self.sentiment,
+            "sentiment_label": self.sentiment_label,
+            "sentiment_confidence": self.sentiment_confidence,
+            "sentiment_source": self.sentiment_source,
+            "parts": self.parts,
+            "extra": self.extra,
+        }
+        fields.update(changes)
+        return Segment(text=text, text_lower=text_lower, **fields)
+
+    @classmethod
+    def from_dict(cls, data):
+        if isinstance(data, Segment):
+            return data
+        parts = data.get("parts")
+        return cls(
+            start=data.get("start", 0),
+            end=data.get("end", 0),
+            text=data.get("text", ""),
+            keyword_flags=encode_keywords(data.get("keywords", [])),
+            sentiment=data.get("sentiment", 0.0),
+            sentiment_label=data.get("sentiment_label", "Neutral"),
+            sentiment_confidence=data.get("sentiment_confidence", 0.0),
+            sentiment_source=data.get("sentiment_source", "none"),
+            parts=[(p["start"], p["end"]) for p in parts] if parts else None,
+            extra=segment_extra(data),
+        )
+
+    def to_dict(self) -> dict:
+        """JSON-ready dict (response boundary only)."""
+        return dict(self.items())
+
+
+# Keys read straight from a slot
+_PLAIN_KEYS = frozenset(Segment.KEYS) - {"keywords"}
+# Keys with a slot; any other input key goes to `extra`
+_FIELD_KEYS = frozenset(Segment.KEYS) | {"parts"}
+
+
+def to_segments(items) -> list:
+    """Coerces dicts (API input, stored JSON) into Segments; Segments pass through."""
+    return [Segment.from_dict(item) for item in items]
+
+def segment_extra(seg):
+    """Fields of a Segment or dict that have no Segment slot, or None."""
+    if isinstance(seg, Segment):
+        return seg.extra
+    extra = {key: value for key, value in seg.items() if key not in _FIELD_KEYS}
+    return extra or None
+
+def segment_text_lower(seg) -> str:
+    """Lowercased text: cached on Segments, computed for plain dicts."""
+    if isinstance(seg, Segment):
+        return seg.text_lower
+    return seg.get("text", "").lower()
@@ -0,0 +1,151 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BATCH = 64
+DEFAULT_MAX_WAIT_MS = 5.0
+# Longest a caller waits for its results (seconds); callers fall back on timeout
+DEFAULT_SCORE_TIMEOUT = 120.0
+
+class SentimentBatcher:
+    """
+    Cross-request dynamic batching for sentiment inference.
+
+    Every /analyze request submits its segment texts and gets a Future back.
+    A single inference thread collects texts from all in-flight requests for
+    up to `max_wait_ms` (or until `max_batch` texts are queued), runs ONE
+    batch and scatters the results back to each request's Future.
+
+    Side effect: the (non thread-safe) model is only ever touched by this thread.
+    Submissions and stop() share a lock, so every accepted Future is either
+    scored or failed: none is left waiting after shutdown.
+    """
+
+    def __init__(self, score_fn, max_batch: int = DEFAULT_MAX_BATCH, max_wait_ms: float = DEFAULT_MAX_WAIT_MS,
+                 score_timeout: float = DEFAULT_SCORE_TIMEOUT):
+        self.score_fn = score_fn
+        self.max_batch = max(1, int(max_batch))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+        self.score_timeout = score_timeout
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._pending_texts = 0
+        self._thread = None
+        self._running = False
+
+        # Simple counters for monitoring
+        self.batches_run = 0
+        self.texts_scored = 0
+
+    def start(self):
+        if self._running:
+            return self
+        self._running = True
+        self._thread = threading.Thread(target=self._loop, name="sentiment-batcher", daemon=True)
+        self._thread.start()
+        logger.info(f"Sentiment batcher started (max_batch={self.max_batch}, max_wait_ms={self.max_wait * 1000:.1f}).")
+        return self
+
+    def stop(self, timeout: float = 5.0):
+        with self._lock:
+            if not self._running:
+                return
+            # No submission can be enqueued after this point
+            self._running = False
+            self._queue.put(None)  # Wake the loop
+        self._thread.join(timeout)
+        self._fail_queued()
+
+    def pending(self) -> int:
+        """Number of texts queued or being scored right now."""
+        with self._lock:
+            return self._pending_texts
+
+    def submit(self, texts: list) -> Future:
+        future = Future()
+        if not texts:
+            future.set_result([])
+            return future
+        with self._lock:
+            if not self._running:
+                raise RuntimeError("SentimentBatcher is not running")
+            self._pending_texts += len(texts)
+            self._queue.put((list(texts), future))
+        return future
+
+    def score(self, texts: list, timeout: float = None) -> list:
+        """
+        Blocking helper: submit and wait for this request's results, at most
+        `timeout` seconds (default: score_timeout). Raises TimeoutError.
+        """
+        return self.submit(texts).result(timeout=self.score_timeout if timeout is None else timeout)
+
+    def _collect(self, first):
+        """Gathers requests until the batch is full or max_wait has elapsed."""
+        items = [first]
+        size = len(first[0])
+        deadline = time.monotonic() + self.max_wait
+
+        while size < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                # Shutdown signal (stop() cleared _running): finish what we have
+                break
+            items.append(item)
+            size += len(item[0])
+
+        return items
+
+    def _loop(self):
+        while self._running:
+            first = self._queue.get()
+            if first is None:
+                break
+
+            items = self._collect(first)
+            texts = [text for item_texts, _ in items for text in item_texts]
+
+            try:
+                results = []
+                for offset in range(0, len(texts), self.max_batch):
+                    results.extend(self.score_fn(texts[offset:offset + self.max_batch]))
+                    self.batches_run += 1
+                self.texts_scored += len(texts)
+            except Exception as e:
+                logger.error(f"Batched sentiment inference failed: {e}")
+                for _, future in items:
+                    future.set_exception(e)
+            else:
+                # Scatter results back in submission order
+                offset = 0
+                for item_texts, future in items:
+                    future.set_result(results[offset:offset + len(item_texts)])
+                    offset += len(item_texts)
+            finally:
+                with self._lock:
+                    self._pending_texts -= len(texts)
+
+        self._fail_queued()
+
+    def _fail_queued(self):
+        """Fails every submission still queued after shutdown."""
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                with self._lock:
+                    self._pending_texts -= len(item[0])
+                item[1].set_exception(RuntimeError("SentimentBatcher stopped"))
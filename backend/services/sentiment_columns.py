@@ -0,0 +1,157 @@
+import numpy as np
+
+from services.context_analyzer import confidence_threshold, meeting_matcher
+from services.segment import segment_text_lower
+
+# Label codes; unknown labels are OTHER (a missing label counts as Neutral)
+POSITIVE, NEUTRAL, NEGATIVE, OTHER = 0, 1, 2, 3
+LABEL_CODES = {"Positive": POSITIVE, "Neutral": NEUTRAL, "Negative": NEGATIVE}
+
+# Keyword features the aggregations read (meeting_matcher categories)
+FEATURES = ("emotional_negative", "business_neutral", "execution_term", "resolution", "closure", "agreed", "acceptance")
+
+
+def _business_raw_score(seg):
+    # Same fallback as calculate_business_sentiment
+    if "sentiment_score" in seg:
+        return seg["sentiment_score"]
+    label = seg.get("sentiment", "Neutral")
+    return 0.5 if label == "Positive" else -0.5 if label == "Negative" else 0
+
+
+class SentimentColumns:
+    """
+    Sentiment of one call or a stacked batch of calls as NumPy columns.
+
+    Segments of every call are sorted by start and concatenated; call c owns
+    rows offsets[c]:offsets[c + 1]. Columns per row:
+    - labels (int8 codes, missing counts as Neutral), labelled, confidence,
+      raw_score (business sentiment input), starts
+    - features[name]: boolean keyword feature (see FEATURES)
+    - call_ids / positions: owning call and position inside it
+
+    Built once per corpus chunk; the *_batch functions below then aggregate
+    every call at once instead of looping over dicts.
+    """
+
+    def __init__(self, calls):
+        calls = [sorted(call, key=lambda x: x["start"]) for call in calls]
+        lengths = np.array([len(call) for call in calls], dtype=np.int64)
+
+        self.offsets = np.zeros(len(calls) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=self.offsets[1:])
+        self.lengths = lengths
+        self.call_ids = np.repeat(np.arange(len(calls), dtype=np.int64), lengths)
+        self.positions = np.arange(int(self.offsets[-1]), dtype=np.int64) - self.offsets[self.call_ids]
+
+        segments = [seg for call in calls for seg in call]
+        self.labels = np.array([LABEL_CODES.get(seg.get("sentiment_label", "Neutral"), OTHER) for seg in segments], dtype=np.int8)
+        self.labelled = np.array(["sentiment_label" in seg for seg in segments], dtype=bool)
+        self.confidence = np.array([seg.get("sentiment_confidence", 0) for seg in segments], dtype=np.float64)
+        self.raw_score = np.array([_business_raw_score(seg) for seg in segments], dtype=np.float64)
+        self.starts = np.array([seg.get("start", 0) for seg in segments], dtype=np.float64)
+
+        # One keyword scan over the whole batch
+        matcher = meeting_matcher()
+        masks = matcher.mask_all([segment_text_lower(seg) for seg in segments])
+        masks = np.array(masks, dtype=np.int64 if len(matcher.bits) < 63 else object)
+        self.features = {name: (masks & matcher.bit(name)) != 0 for name in FEATURES}
+
+    def __len__(self):
+        return len(self.lengths)
+
+    def sum_per_call(self, values) -> np.ndarray:
+        """Per-call sums of a row column (summed in row order, like a Python loop)."""
+        return np.bincount(self.call_ids, weights=values, minlength=len(self))
+
+
+def aggregate_sentiment_batch(columns: SentimentColumns) -> np.ndarray:
+    """aggregate_sentiment per call: (calls, 3) counts of Positive, Neutral, Negative."""
+    counts = np.zeros((len(columns), 4), dtype=np.int64)
+    np.add.at(counts, (columns.call_ids, columns.labels), 1)
+    return counts[:, :3]
+
+
+def overall_call_sentiment_batch(columns: SentimentColumns) -> list:
+    """overall_call_sentiment per call: last third weighted 2x, confidence >= thresholds.sentiment_confidence only."""
+    middle_end = 2 * columns.lengths // 3
+    weights = np.where(columns.positions >= middle_end[columns.call_ids], 2.0, 1.0)
+    weights = np.where(columns.confidence >= confidence_threshold("sentiment_confidence"), weights, 0.0)
+
+    total = columns.sum_per_call(weights)
+    positive = columns.sum_per_call(np.where(columns.labels == POSITIVE, weights, 0.0))
+    negative = columns.sum_per_call(np.where(columns.labels == NEGATIVE, weights, 0.0))
+
+    has_weight = total > 0
+    labels = np.select(
+        [~has_weight, negative > positive, positive > negative, (positive > 0) & (negative > 0)],
+        ["neutral", "negative", "positive", "mixed"],
+        default="neutral",
+    )
+    return labels.tolist()
+
+
+def ending_state_boost_batch(columns: SentimentColumns, tail: int = 5) -> np.ndarray:
+    """ending_state_boost per call: first closure (0.3) or agreement (0.2) in the last `tail` segments."""
+    closure = columns.features["closure"]
+    value = np.where(closure, 0.3, np.where(columns.features["agreed"], 0.2, 0.0))
+    in_tail = columns.positions >= (columns.lengths - tail)[columns.call_ids]
+
+    rows = np.flatnonzero(in_tail & (value > 0))
+    boost = np.zeros(len(columns), dtype=np.float64)
+    calls, first = np.unique(columns.call_ids[rows], return_index=True)
+    boost[calls] = value[rows[first]]
+    return boost
+
+
+def business_scores_batch(columns: SentimentColumns) -> np.ndarray:
+    """calculate_business_sentiment per call before the outcome override: adjusted average + end boost."""
+    raw = columns.raw_score
+    features = columns.features
+    execution = features["execution_term"]
+
+    # _adjust_sentiment_from_mask, in rule order
+    adjusted = np.where(
+        features["emotional_negative"], raw,
+        np.where(features["business_neutral"], 0.0,
+        np.where(execution & features["resolution"], np.maximum(0.0, raw) + 0.1,
+        np.where(execution & (raw < 0), raw * 0.3, raw))))
+
+    lengths = np.maximum(columns.lengths, 1)
+    return columns.sum_per_call(adjusted) / lengths + ending_state_boost_batch(columns)
+
+
+def calculate_business_sentiment_batch(columns: SentimentColumns, meeting_health) -> tuple:
+    """
+    calculate_business_sentiment per call. `meeting_health` is one value for
+    every call or one per call. Returns (scores array, labels list).
+    """
+    scores = business_scores_batch(columns)
+    on_track = np.broadcast_to(np.asarray(meeting_health, dtype=object) == "on_track", scores.shape)
+    scores = np.where(on_track & (scores < -0.1), 0.0, scores)
+    scores = np.where(columns.lengths == 0, 0, scores)
+
+    labels = np.select([scores > 0.3, scores < -0.3], ["Positive", "Tense"], default="Neutral / Focused")
+    return scores, labels.tolist()
+
+
+def precomputed_sentiment(calls) -> list:
+    """
+    Per call, the sentiment aggregates analyze_transcript(sentiment=...) takes:
+    sentiment_counts, call_sentiment and business_score (before the outcome
+    override, which needs the meeting health). Every call is aggregated in
+    one columnar pass; empty calls get None and keep the scalar path.
+    """
+    columns = SentimentColumns(calls)
+    counts = aggregate_sentiment_batch(columns).tolist()
+    call_sentiment = overall_call_sentiment_batch(columns)
+    business = business_scores_batch(columns).tolist()
+    return [
+        {
+            "sentiment_counts": dict(zip(("Positive", "Neutral", "Negative"), counts[c])),
+            "call_sentiment": call_sentiment[c],
+            "business_score": business[c],
+        } if columns.lengths[c] else None
+        for c in range(len(columns))
+    ]
+
@@ -1,21 +1,23 @@
 import whisper
 
+from services.segment import Segment
+
 # Load model once (important for performance)
 model = whisper.load_model("base")  # base = balance of speed + accuracy
 
 def transcribe_audio(file_path: str):
     """
-    Transcribes audio file into text segments.
+    Transcribes audio file into text segments (immutable Segment objects).
     """
     result = model.transcribe(file_path)
 
     segments = []
     for segment in result["segments"]:
-        segments.append({
-            "start": round(segment["start"], 2),
-            "end": round(segment["end"], 2),
-            "text": segment["text"].strip()
-        })
+        segments.append(Segment(
+            start=round(segment["start"], 2),
+            end=round(segment["end"], 2),
+            text=segment["text"].strip()
+        ))
 
     return {
         "text": result["text"].strip(),
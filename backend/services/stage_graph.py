@@ -0,0 +1,52 @@
+import time
+
+class StageGraph:
+    """
+    Small dependency graph of named analysis stages.
+
+    Each stage declares the names it depends on (other stages or run inputs)
+    and is computed at most once per run; every consumer shares the result.
+    Pass `timings` to run() to collect per-stage wall time (ms, excluding deps).
+
+        graph = StageGraph()
+
+        @graph.stage("blob", "segments")
+        def _blob(segments): ...
+
+        results = graph.run({"segments": segs}, ["blob"])
+    """
+
+    def __init__(self):
+        self.stages = {}  # name -> (fn, deps)
+
+    def stage(self, name: str, *deps: str):
+        def register(fn):
+            if name in self.stages:
+                raise ValueError(f"Stage '{name}' is already defined")
+            self.stages[name] = (fn, deps)
+            return fn
+        return register
+
+    def run(self, inputs: dict, targets, timings: dict = None) -> dict:
+        """Computes `targets` (and only what they need). Returns all computed values by name."""
+        results = dict(inputs)
+        for target in targets:
+            self._resolve(target, results, timings, ())
+        return results
+
+    def _resolve(self, name, results, timings, path):
+        if name in results:
+            return results[name]
+        if name not in self.stages:
+            raise KeyError(f"Unknown stage or missing input '{name}'")
+        if name in path:
+            raise ValueError(f"Stage cycle: {' -> '.join(path + (name,))}")
+
+        fn, deps = self.stages[name]
+        args = [self._resolve(dep, results, timings, path + (name,)) for dep in deps]
+
+        start = time.perf_counter()
+        results[name] = fn(*args)
+        if timings is not None:
+            timings[name] = round((time.perf_counter() - start) * 1000, 3)
+        return results[name]
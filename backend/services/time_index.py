@@ -0,0 +1,89 @@
+from array import array
+from bisect import bisect_left, bisect_right
+
+class TimeIndex:
+    """
+    Start-time index over segments for O(log n) window queries.
+
+    `segments` are kept in start order (the input list itself when it is
+    already sorted, else a stable-sorted copy), `starts` is a parallel
+    array('d') and `order[i]` is the input position of segments[i].
+
+    Queries return time-ordered slices; the span_* variants return
+    (lo, hi) positions for columns aligned with `segments`.
+    """
+
+    def __init__(self, segments):
+        segments = list(segments) if not isinstance(segments, list) else segments
+        starts = [seg.get("start", 0) for seg in segments]
+
+        if all(a <= b for a, b in zip(starts, starts[1:])):
+            self.segments = segments
+            self.order = array("l", range(len(segments)))
+        else:
+            order = sorted(range(len(segments)), key=starts.__getitem__)
+            self.segments = [segments[i] for i in order]
+            self.order = array("l", order)
+            starts = [starts[i] for i in order]
+
+        self.starts = array("d", starts)
+
+    @classmethod
+    def of(cls, segments):
+        """Returns `segments` if it already is a TimeIndex, else indexes them."""
+        return segments if isinstance(segments, TimeIndex) else cls(segments)
+
+    def append(self, segment):
+        """Adds a segment that starts at or after the last one (live sessions)."""
+        start = segment.get("start", 0)
+        if self.starts and start < self.starts[-1]:
+            raise ValueError("TimeIndex.append needs segments in start order")
+        self.order.append(len(self.segments))
+        self.segments.append(segment)
+        self.starts.append(start)
+
+    def __len__(self):
+        return len(self.segments)
+
+    def __iter__(self):
+        return iter(self.segments)
+
+    def __getitem__(self, item):
+        return self.segments[item]
+
+    # --- Spans (positions into self.segments) ---
+
+    def span_after(self, t: float):
+        """Segments starting strictly after t."""
+        return bisect_right(self.starts, t), len(self.segments)
+
+    def span_between(self, t1: float, t2: float):
+        """Segments with t1 <= start < t2."""
+        return bisect_left(self.starts, t1), bisect_left(self.starts, t2)
+
+    def span_last_fraction(self, fraction: float):
+        """Last `fraction` of the segments by count (start = int(n * (1 - fraction)))."""
+        n = len(self.segments)
+        return min(n, max(0, int(n * (1 - fraction)))), n
+
+    def span_tail(self, count: int):
+        n = len(self.segments)
+        return max(0, n - count), n
+
+    # --- Windows (time-ordered segments) ---
+
+    def after(self, t: float) -> list:
+        lo, hi = self.span_after(t)
+        return self.segments[lo:hi]
+
+    def between(self, t1: float, t2: float) -> list:
+        lo, hi = self.span_between(t1, t2)
+        return self.segments[lo:hi]
+
+    def last_fraction(self, fraction: float) -> list:
+        lo, hi = self.span_last_fraction(fraction)
+        return self.segments[lo:hi]
+
+    def tail(self, count: int) -> list:
+        lo, hi = self.span_tail(count)
+        return self.segments[lo:hi]
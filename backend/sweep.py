@@ -0,0 +1,234 @@
+"""
+What-if calibration sweeps over stored enriched transcripts.
+
+Scores one corpus under many keyword / threshold variants and reports, per
+variant, the label distribution and how many calls changed against the
+current config. Config-independent work (parsing, sorting, lowercased text,
+time index, sales transcript blob) is done once per transcript in each
+worker; the worker then runs whole variants over that prepared corpus.
+
+Input: JSONL like rescore.py (/analyze responses or bare records).
+Grid file (JSON), both keys optional:
+    {"variants": {"<name>": <overlay>, ...},
+     "grid": {"thresholds.objection_confidence": [0.6, 0.7, 0.8],
+              "sales.objections.Pricing": [["price"], ["price", "budget"]]}}
+Overlays merge over keywords.json like profiles (lists replace); "grid"
+runs every combination of its dotted paths. "current" is always run first.
+
+Usage (from backend/):
+    python sweep.py archive/*.jsonl --grid grid.json [--mode sales] [--workers 8] [--output report.json]
+"""
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from rescore import record_transcript
+from services import context_analyzer as ca
+from services.segment import to_segments
+from services.time_index import TimeIndex
+from utils.config_loader import current_config, pinned_config, variant_config
+
+# Labels compared per call: field -> result -> value
+MEETING_FIELDS = {
+    "meeting_quality": lambda r: r["meeting_quality"]["label"],
+    "project_risk": lambda r: r["project_risk"]["label"],
+    "overall_sentiment": lambda r: r["overall_sentiment_label"],
+    "meeting_health": lambda r: r["meeting_health"],
+}
+SALES_FIELDS = {
+    "sales_quality": lambda r: r["quality"]["label"],
+    "call_sentiment": lambda r: r["overall_call_sentiment"],
+    "objections": lambda r: "+".join(sorted({o["type"] for o in r["objections"]})) or "none",
+}
+
+def expand_grid(spec: dict) -> list:
+    """[(name, overlay)]: "current", the named variants, then every grid combination."""
+    variants = [("current", {})] + list(spec.get("variants", {}).items())
+    grid = spec.get("grid", {})
+    paths = list(grid)
+    for values in itertools.product(*(grid[path] for path in paths)):
+        overlay = {}
+        for path, value in zip(paths, values):
+            *parents, leaf = path.split(".")
+            node = overlay
+            for key in parents:
+                node = node.setdefault(key, {})
+            node[leaf] = value
+        name = ",".join(f"{path}={json.dumps(value)}" for path, value in zip(paths, values))
+        variants.append((name, overlay))
+    names = [name for name, _ in variants]
+    if len(set(names)) != len(names):
+        raise ValueError("Variant names must be unique")
+    return variants
+
+def prepare_call(record: dict, mode: str = None) -> dict:
+    """The config-independent part of one call, computed once and shared by every variant."""
+    text, segments = record_transcript(record)
+    segments = sorted(to_segments(segments), key=lambda x: x["start"])
+    call = {"mode": mode or record.get("mode") or "meeting", "text": text, "segments": segments}
+    if call["mode"] == "sales" and segments:
+        # Seeds for SALES_STAGES (none of these read the keyword config)
+        call["sales_inputs"] = {
+            "enriched_segments": segments,
+            "segments": segments,
+            "timeline": TimeIndex(segments),
+            "text_blob": ca.sales_text_blob(segments),
+            "transcript": [ca._sales_transcript_entry(s) for s in segments],
+        }
+    return call
+
+def call_labels(call: dict) -> dict:
+    """Runs the analyzers for the call's mode on the pinned config; returns {field: label}."""
+    mode = call["mode"]
+    if "sales_inputs" in call:
+        result = ca.SALES_STAGES.run(call["sales_inputs"], ["result"])["result"]
+    else:
+        result = ca.analyze_transcript(mode, call["text"], call["segments"])
+
+    if mode == "both":
+        return {**{f"meeting.{k}": f(result["meeting"]) for k, f in MEETING_FIELDS.items()},
+                **{f"sales.{k}": f(result["sales"]) for k, f in SALES_FIELDS.items()}}
+    fields = SALES_FIELDS if result["mode"] == "sales" else MEETING_FIELDS
+    labels = {k: f(result) for k, f in fields.items()}
+    if mode == "auto":
+        labels["conversation_type"] = result["conversation_type"]["type"]
+    return labels
+
+def iter_records(inputs):
+    """Yields (call id, record or error message) for every non-empty input line."""
+    for path in inputs:
+        with open(path, encoding="utf-8") as f:
+            for line_no, raw in enumerate(f, 1):
+                if not raw.strip():
+                    continue
+                call_id = f"{path}:{line_no}"
+                try:
+                    record = json.loads(raw)
+                    yield record.get("id") or record.get("session_id") or call_id, record
+                except Exception as e:
+                    yield call_id, f"{type(e).__name__}: {e}"
+
+def load_corpus(inputs, mode: str = None) -> list:
+    """[(call id, prepared call or error message)] in input order."""
+    corpus = []
+    for call_id, record in iter_records(inputs):
+        if isinstance(record, dict):
+            try:
+                record = prepare_call(record, mode)
+            except Exception as e:
+                record = f"{type(e).__name__}: {e}"
+        corpus.append((call_id, record))
+    return corpus
+
+# Per-worker prepared corpus (set by _init_worker)
+_CORPUS = []
+
+def _init_worker(inputs, mode):
+    global _CORPUS
+    _CORPUS = load_corpus(inputs, mode)
+
+def run_variant(name: str, overlay: dict) -> tuple:
+    """Worker: (config version, [labels or {"error": ...} per call], seconds) for one variant."""
+    started = time.perf_counter()
+    config = variant_config(current_config(), overlay, name) if overlay else current_config()
+    labels = []
+    with pinned_config(config):
+        for _, call in _CORPUS:
+            if isinstance(call, str):
+                labels.append({"error": call})
+                continue
+            try:
+                labels.append(call_labels(call))
+            except Exception as e:
+                labels.append({"error": f"{type(e).__name__}: {e}"})
+    return config.version, labels, time.perf_counter() - started
+
+def compare(ids: list, baseline: list, labels: list, examples: int = 5) -> dict:
+    """Per-field change counts (and a few example call IDs) of `labels` against `baseline`."""
+    changed = Counter()
+    sample = {}
+    changed_calls = 0
+    for call_id, before, after in zip(ids, baseline, labels):
+        fields = [k for k in before.keys() | after.keys() if before.get(k) != after.get(k)]
+        changed_calls += bool(fields)
+        for field in fields:
+            changed[field] += 1
+            if len(sample.setdefault(field, [])) < examples:
+                sample[field].append(call_id)
+    return {"changed_calls": changed_calls, "changed": dict(sorted(changed.items())),
+            "examples": dict(sorted(sample.items()))}
+
+def sweep(inputs, variants: list, mode: str = None, workers: int = None) -> dict:
+    """
+    Scores the corpus under every (name, overlay) in `variants` (the first is
+    the baseline) in a process pool (threads in-process for workers=1).
+    Returns {"calls", "base_version", "seconds", "variants": [...]}.
+    """
+    # Invalid overlays fail here, before any worker starts
+    base = current_config().compile_all()
+    for name, overlay in variants:
+        if overlay:
+            variant_config(base, overlay, name)
+
+    ids = [call_id for call_id, _ in iter_records(inputs)]
+    workers = min(workers or os.cpu_count() or 1, len(variants))
+    started = time.perf_counter()
+    if workers > 1:
+        executor = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(inputs, mode))
+    else:
+        executor = ThreadPoolExecutor(1, initializer=_init_worker, initargs=(inputs, mode))
+    with executor:
+        results = list(executor.map(run_variant, *zip(*variants)))
+
+    baseline = results[0][1]
+    report = []
+    for (name, overlay), (version, labels, seconds) in zip(variants, results):
+        distribution = {}
+        for call in labels:
+            for field, value in call.items():
+                if field != "error":
+                    distribution.setdefault(field, Counter())[str(value)] += 1
+        report.append({
+            "name": name,
+            "overlay": overlay,
+            "config_version": version,
+            "errors": sum("error" in call for call in labels),
+            "distribution": {field: dict(sorted(counts.items())) for field, counts in sorted(distribution.items())},
+            **compare(ids, baseline, labels),
+            "seconds": round(seconds, 3),
+        })
+    return {"calls": len(ids), "base_version": base.version,
+            "seconds": round(time.perf_counter() - started, 3), "variants": report}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("inputs", nargs="+", help="Enriched transcript JSONL files")
+    parser.add_argument("--grid", required=True, help="Variant grid JSON file")
+    parser.add_argument("--mode", choices=["meeting", "sales", "both", "auto"],
+                        help="Analysis mode (default: each record's own mode, else meeting)")
+    parser.add_argument("--workers", type=int, default=None, help="Processes (default: CPU count)")
+    parser.add_argument("--output", default=None, help="Write the full JSON report here")
+    args = parser.parse_args(argv)
+
+    with open(args.grid, encoding="utf-8") as f:
+        variants = expand_grid(json.load(f))
+    report = sweep(args.inputs, variants, mode=args.mode, workers=args.workers)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    print(f"{report['calls']} calls x {len(variants)} variants in {report['seconds']}s (base {report['base_version']})")
+    for variant in report["variants"]:
+        changes = ", ".join(f"{field} {n}" for field, n in variant["changed"].items()) or "-"
+        print(f"  {variant['name']}: {variant['changed_calls']} calls changed ({changes})")
+    return report
+
+if __name__ == "__main__":
+    main()
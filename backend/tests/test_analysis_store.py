@@ -0,0 +1,121 @@
+"""
+Persistent analysis history: round trips through SQLite, upserts after
+edits, indexed history queries, and batched background writes.
+"""
+
+import sys
+import os
+import time
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.analysis_cache import StoredAnalysis
+from services.analysis_store import AnalysisStore, index_columns
+from services.segment import Segment, encode_keywords
+
+SEGMENTS = [
+    Segment(0.0, 3.0, "The price is too expensive.", keyword_flags=encode_keywords(["objections"]),
+            sentiment=-0.8, sentiment_label="Negative", sentiment_confidence=0.91, sentiment_source="model"),
+    Segment(3.0, 9.5, "We can offer flexible plans.", sentiment=0.4, sentiment_label="Positive",
+            sentiment_confidence=0.7, sentiment_source="lexicon", parts=[(3.0, 5.0), (5.5, 9.5)]),
+]
+
+MEETING = {"mode": "meeting", "meeting_quality": {"label": "Low"}, "meeting_health": "at_risk", "summary": "s"}
+SALES = {"mode": "sales", "quality": {"label": "High", "score": 7, "drivers": []}}
+
+@pytest.fixture
+def store(tmp_path):
+    store = AnalysisStore(str(tmp_path / "analyses.db"), batch_size=8, flush_ms=5)
+    yield store
+    store.close()
+
+def analysis(analysis_id, insights=MEETING, revision=0):
+    return StoredAnalysis(analysis_id, insights["mode"], None, "The price is too expensive.", SEGMENTS, "v1",
+                          revision, insights)
+
+def test_index_columns():
+    assert index_columns(MEETING) == {"meeting_quality": "Low", "sales_quality": None, "meeting_health": "at_risk"}
+    assert index_columns({"mode": "both", "meeting": MEETING, "sales": SALES}) == {
+        "meeting_quality": "Low", "sales_quality": "High", "meeting_health": "at_risk"}
+
+def test_round_trip(store):
+    store.save(analysis("a1"), filename="call.mp3", session_id="acme")
+    store.flush()
+
+    loaded = store.get("a1")
+    assert list(loaded.segments) == SEGMENTS
+    assert loaded.insights == MEETING and loaded.mode == "meeting" and loaded.config_version == "v1"
+    assert loaded.timeline.span_between(3.0, 10.0) == (1, 2)
+
+    extra = [SEGMENTS[0].replace(extra={"id": 7, "speaker": "A"})]
+    store.save(StoredAnalysis("a2", "meeting", None, "", extra, "v1", insights=MEETING))
+    store.flush()
+    assert store.get("a2").segments[0].to_dict() == extra[0].to_dict()
+    with pytest.raises(KeyError):
+        store.get("missing")
+
+def test_edits_replace_the_analysis_and_keep_its_history_fields(store):
+    store.save(analysis("a1"), filename="call.mp3", session_id="acme")
+    store.flush()
+    created = store.query()[0]["created_at"]
+
+    store.save(StoredAnalysis("a1", "sales", None, "edited", SEGMENTS[:1], "v2", 1, SALES))
+    store.flush()
+
+    [row] = store.query()
+    assert row["revision"] == 1 and row["mode"] == "sales" and row["sales_quality"] == "High"
+    assert row["meeting_health"] is None and row["segment_count"] == 1
+    assert row["created_at"] == created and row["session_id"] == "acme" and row["filename"] == "call.mp3"
+    assert list(store.get("a1").segments) == SEGMENTS[:1]
+
+def test_save_and_edit_in_one_batch(store):
+    store.save(analysis("a1"), session_id="acme")
+    store.save(analysis("a1", SALES, revision=1))
+    store.flush()
+
+    assert store.stats()["failures"] == 0
+    [row] = store.query()
+    assert row["revision"] == 1 and row["session_id"] == "acme" and row["segment_count"] == 2
+
+def test_history_queries(store):
+    healthy = {**MEETING, "meeting_quality": {"label": "High"}, "meeting_health": "on_track"}
+    for i, insights in enumerate([MEETING, healthy, SALES, MEETING]):
+        store.save(analysis(f"a{i}", insights), session_id="acme" if i % 2 else "globex")
+    store.flush()
+
+    assert [r["analysis_id"] for r in store.query(meeting_health="at_risk")] == ["a3", "a0"]
+    assert [r["analysis_id"] for r in store.query(session_id="acme")] == ["a3", "a1"]
+    assert [r["analysis_id"] for r in store.query(mode="sales", sales_quality="High")] == ["a2"]
+    assert store.query(meeting_health="at_risk", since=time.time() + 60) == []
+
+    first = store.query(limit=2)
+    rest = store.query(limit=2, before=(first[-1]["created_at"], first[-1]["analysis_id"]))
+    assert [r["analysis_id"] for r in first + rest] == ["a3", "a2", "a1", "a0"]
+    # Batched: four saves, fewer transactions
+    assert store.stats()["written"] == 4 and store.stats()["batches"] < 4
+
+def test_paging_keeps_analyses_sharing_a_timestamp(store):
+    for i in range(5):
+        store.save(analysis(f"a{i}"), created_at=1000.0)
+    store.flush()
+
+    seen, before = [], None
+    while True:
+        page = store.query(limit=2, before=before)
+        seen += [r["analysis_id"] for r in page]
+        if len(page) < 2:
+            break
+        before = (page[-1]["created_at"], page[-1]["analysis_id"])
+    assert seen == ["a4", "a3", "a2", "a1", "a0"]
+
+def test_wal_mode_and_indexed_queries(store):
+    conn = store._reader()
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    plan = conn.execute("EXPLAIN QUERY PLAN SELECT analysis_id FROM analyses "
+                        "WHERE meeting_health = ? AND created_at >= ? AND (created_at, analysis_id) < (?, ?) "
+                        "ORDER BY created_at DESC, analysis_id DESC",
+                        ("at_risk", 0, 2000.0, "a9")).fetchall()
+    steps = " ".join(str(step[-1]) for step in plan)
+    assert "analyses_meeting_health" in steps and "TEMP B-TREE" not in steps
@@ -0,0 +1,108 @@
+"""
+Per-tenant keyword profiles: overlays over keywords.json, compiled once and
+kept in a bounded LRU.
+"""
+
+import json
+import sys
+import os
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import config_loader
+from utils.config_loader import ConfigValidationError, KeywordConfig, ProfileCache, current_config, merge_keywords
+from services import context_analyzer as ca
+
+def seg(start, text, label="Negative", confidence=0.9):
+    return {"start": start, "end": start + 3.0, "text": text, "sentiment": -0.8,
+            "sentiment_label": label, "sentiment_confidence": confidence}
+
+CALL = [
+    seg(0.0, "Data residency in the EU is a hard requirement for us."),
+    seg(3.0, "Honestly we are ready to start a trial next month.", "Positive"),
+]
+
+@pytest.fixture
+def profiles(tmp_path, monkeypatch):
+    monkeypatch.setattr(config_loader, "CACHE_DIR", str(tmp_path / "compiled"))
+    directory = tmp_path / "profiles"
+    directory.mkdir()
+
+    def write(profile_id, overlay):
+        path = directory / f"{profile_id}.json"
+        path.write_text(json.dumps(overlay))
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    return str(directory), write
+
+SECURITY = {"sales": {"objections": {"Security": ["data residency"]}, "buying_signals": ["ready to start a trial"]}}
+
+def test_merge_layers_objects_and_replaces_lists():
+    base = {"sales": {"objections": {"Pricing": ["price"]}}, "meeting": {"risks": ["risk"]}}
+    merged = merge_keywords(base, {"sales": {"objections": {"Security": ["sso"]}}, "meeting": {"risks": ["delay"]}})
+    assert merged == {"sales": {"objections": {"Pricing": ["price"], "Security": ["sso"]}}, "meeting": {"risks": ["delay"]}}
+    assert base["sales"]["objections"] == {"Pricing": ["price"]}
+
+def test_profile_overlays_base_config(profiles):
+    directory, write = profiles
+    write("security", SECURITY)
+    config = ProfileCache(profiles_dir=directory).get("security")
+
+    assert config.version.startswith("security@")
+    assert set(config.data["sales"]["objections"]) == set(current_config().data["sales"]["objections"]) | {"Security"}
+
+    base_result = ca.analyze_transcript("sales", "", CALL)
+    profile_result = ca.analyze_transcript("sales", "", CALL, config=config)
+    assert [o["type"] for o in base_result["objections"]] == []
+    assert [o["type"] for o in profile_result["objections"]] == ["Security"]
+    assert ca.assess_sales_signals(CALL, [], [])["value_articulated"] is False
+    with config_loader.pinned_config(config):
+        assert ca.assess_sales_signals(CALL, [], [])["value_articulated"] is True
+
+def test_lru_hits_and_evictions(profiles):
+    directory, write = profiles
+    for name in ("a", "b", "c"):
+        write(name, SECURITY)
+    cache = ProfileCache(maxsize=2, profiles_dir=directory)
+
+    first = cache.get("a")
+    assert cache.get("a") is first
+    cache.get("b")
+    cache.get("c")  # evicts "a", the least recently used
+    assert cache.get("a") is not first
+
+    stats = cache.stats()
+    assert (stats["size"], stats["hits"], stats["misses"], stats["evictions"]) == (2, 1, 4, 2)
+
+def test_profile_rebuilt_when_file_or_base_changes(profiles):
+    directory, write = profiles
+    write("security", SECURITY)
+    cache = ProfileCache(profiles_dir=directory)
+    first = cache.get("security")
+
+    write("security", {"sales": {"objections": {"Security": ["sso"]}}})
+    second = cache.get("security")
+    assert second is not first
+    assert second.data["sales"]["objections"]["Security"] == ["sso"]
+
+    base = KeywordConfig(current_config().data, "other-base")
+    assert cache.get("security", base=base).version != second.version
+
+def test_unknown_invalid_and_malformed_profiles(profiles):
+    directory, write = profiles
+    cache = ProfileCache(profiles_dir=directory)
+    with pytest.raises(KeyError):
+        cache.get("missing")
+    with pytest.raises(KeyError):
+        cache.get("../keywords")
+
+    write("broken", {"sales": {"objections": {"Security": "sso"}}})
+    with pytest.raises(ConfigValidationError):
+        cache.get("broken")
+
+def test_bundled_example_profile_is_valid(monkeypatch, tmp_path):
+    monkeypatch.setattr(config_loader, "CACHE_DIR", "")
+    config = ProfileCache().get("example_saas")
+    assert "Security" in config.data["sales"]["objections"]
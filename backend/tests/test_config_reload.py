@@ -0,0 +1,98 @@
+"""
+Hot reload of keywords.json: new versions are validated and compiled before
+they go live, and an analysis pinned to a version keeps using it.
+"""
+
+import copy
+import json
+import sys
+import os
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import config_loader
+from utils.config_loader import ConfigWatcher, current_config, reload_config, swap_config, validate_keywords
+from services import context_analyzer as ca
+
+def seg(start, text, label="Negative", confidence=0.9):
+    return {"start": start, "end": start + 3.0, "text": text, "sentiment": -0.8,
+            "sentiment_label": label, "sentiment_confidence": confidence}
+
+CALL = [seg(0.0, "Data residency in the EU is a hard requirement for us.")]
+
+@pytest.fixture
+def keywords_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(config_loader, "CACHE_DIR", str(tmp_path / "compiled"))
+    original = current_config()
+    path = tmp_path / "keywords.json"
+    data = copy.deepcopy(original.data)
+    path.write_text(json.dumps(data))
+    yield path, data
+    swap_config(original)
+
+def write(path, data):
+    path.write_text(json.dumps(data))
+    # Same-second rewrites must still look changed to the watcher
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+def test_reload_swaps_version_and_matchers(keywords_file):
+    path, data = keywords_file
+    assert reload_config(str(path)) is True  # file bytes differ from keywords.json formatting
+    before = current_config()
+    assert [o["type"] for o in ca.detect_objections(CALL)] == []
+
+    data["sales"]["objections"]["Security"] = ["data residency"]
+    write(path, data)
+    assert reload_config(str(path)) is True
+    assert reload_config(str(path)) is False  # unchanged content
+
+    after = current_config()
+    assert after.version != before.version
+    assert [o["type"] for o in ca.detect_objections(CALL)] == ["Security"]
+    assert ca.meeting_matcher() is after.artifact("meeting_matcher")
+
+def test_pinned_analysis_keeps_its_version(keywords_file):
+    path, data = keywords_file
+    old = current_config()
+    data["sales"]["objections"]["Security"] = ["data residency"]
+    write(path, data)
+    reload_config(str(path))
+
+    # A request that started before the reload finishes on the old keywords
+    old_result = ca.analyze_transcript("sales", "", CALL, config=old)
+    new_result = ca.analyze_transcript("sales", "", CALL)
+    assert old_result["objections"] == []
+    assert [o["type"] for o in new_result["objections"]] == ["Security"]
+
+def test_invalid_change_is_rejected(keywords_file):
+    path, data = keywords_file
+    watcher = ConfigWatcher(str(path), interval=0)
+    live = current_config()
+
+    broken = copy.deepcopy(data)
+    broken["meeting"]["risks"] = "not a list"
+    write(path, broken)
+    assert watcher.check() is False
+    assert watcher.failures == 1
+    assert current_config() is live
+
+    data["meeting"]["risks"].append("supply chain")
+    write(path, data)
+    assert watcher.check() is True
+    assert "supply chain" in current_config().data["meeting"]["risks"]
+
+def test_new_versions_are_compiled_before_going_live(keywords_file):
+    path, data = keywords_file
+    data["nlp_enrichment"]["security"] = ["gdpr"]
+    write(path, data)
+    reload_config(str(path))
+
+    config = current_config()
+    assert set(config_loader._COMPILERS) <= set(config._artifacts)
+
+def test_validate_keywords_names_the_bad_entry():
+    with pytest.raises(ValueError, match="sales.objections.Pricing"):
+        validate_keywords({**current_config().data, "sales": {"objections": {"Pricing": [1]}}})
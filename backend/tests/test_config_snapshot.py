@@ -0,0 +1,121 @@
+"""
+Compiled keyword config snapshot: normalized phrase lists, fail-fast schema
+validation and the on-disk cache keyed by the file hash.
+"""
+
+import json
+import sys
+import os
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import config_loader
+from utils.config_loader import (
+    ConfigValidationError, KeywordConfig, normalize_phrases, pinned_config, read_config, register_compiler,
+)
+from benchmarks.synthetic import make_enriched_call
+from services import context_analyzer as ca
+
+def test_normalize_drops_duplicates_and_covered_phrases():
+    report = {}
+    phrases = ["I'll", "i'll  follow up", "we will", "We Will", "deploy", "deployment"]
+    assert normalize_phrases(phrases, report) == ["i'll", "we will", "deploy"]
+    assert report == {"duplicates": 1, "covered": 2, "phrases": 3}
+
+def test_whole_word_lists_keep_covered_phrases():
+    from services.lexicon_sentiment import LexiconSentimentScorer
+    compiled = config_loader.compile_keywords({
+        "meeting": {"risks": ["delay", "Delayed"]},
+        "nlp_enrichment": {"timeline_risk": ["delay", "Delayed"]},
+    })
+    assert compiled["meeting"]["risks"] == ["delay"]
+    assert compiled["nlp_enrichment"]["timeline_risk"] == ["delay", "delayed"]
+
+    # The lexicon matches whole words: "delay" alone would miss "delayed"
+    scorer = LexiconSentimentScorer.from_config(compiled, lexicon={})
+    assert scorer.score_text("the launch was delayed")["label"] == "negative"
+
+def test_normalized_config_matches_like_the_raw_file():
+    with open(config_loader.CONFIG_PATH, encoding="utf-8") as f:
+        raw = KeywordConfig(json.load(f), "raw")
+    call = make_enriched_call(300, objection_every=7)
+
+    with pinned_config(raw):
+        expected_meeting = ca.analyze_meeting({"text": "", "segments": call})
+        expected_sales = ca.analyze_sales(call)
+    assert ca.analyze_meeting({"text": "", "segments": call}) == expected_meeting
+    assert ca.analyze_sales(call)["objections"] == expected_sales["objections"]
+
+def test_snapshot_is_cached_by_file_hash(tmp_path):
+    cache_dir = str(tmp_path / "compiled")
+    config = read_config(config_loader.CONFIG_PATH, cache_dir=cache_dir).compile_all()
+    cache_files = os.listdir(cache_dir)
+    assert cache_files == [f"keywords-{config.version}-v{config_loader.CACHE_FORMAT}.pkl"]
+
+    cached = read_config(config_loader.CONFIG_PATH, cache_dir=cache_dir)
+    assert cached.data == config.data
+    assert cached.artifact("meeting_matcher").bits == config.artifact("meeting_matcher").bits
+
+    # Nothing new to compile: the cache is not rewritten
+    stamp = os.stat(os.path.join(cache_dir, cache_files[0])).st_mtime_ns
+    cached.compile_all()
+    assert os.stat(os.path.join(cache_dir, cache_files[0])).st_mtime_ns == stamp
+
+def test_compiler_version_bump_rebuilds_cached_artifact(tmp_path):
+    cache_dir = str(tmp_path / "compiled")
+    builds = []
+    try:
+        register_compiler("test_phrase_count", lambda data: builds.append(1) or len(data["meeting"]["risks"]))
+        read_config(config_loader.CONFIG_PATH, cache_dir=cache_dir).compile_all()
+        read_config(config_loader.CONFIG_PATH, cache_dir=cache_dir).artifact("test_phrase_count")
+        assert len(builds) == 1
+
+        register_compiler("test_phrase_count", lambda data: builds.append(2) or -1, version=2)
+        assert read_config(config_loader.CONFIG_PATH, cache_dir=cache_dir).artifact("test_phrase_count") == -1
+    finally:
+        config_loader._COMPILERS.pop("test_phrase_count", None)
+
+def test_edited_compiler_inputs_rebuild_cached_artifacts(tmp_path, monkeypatch):
+    from services import lexicon_sentiment, nlp_engine  # noqa: F401 (registers lexicon_scorer)
+    cache_dir = str(tmp_path / "compiled")
+    lexicon_path = tmp_path / "sentiment_lexicon.json"
+    with open(lexicon_sentiment.LEXICON_PATH, encoding="utf-8") as f:
+        lexicon = json.load(f)
+    lexicon_path.write_text(json.dumps(lexicon))
+    monkeypatch.setattr(lexicon_sentiment, "LEXICON_PATH", str(lexicon_path))
+
+    scorer = read_config(config_loader.CONFIG_PATH, cache_dir=cache_dir).compile_all().artifact("lexicon_scorer")
+    assert scorer.score_text("that is splendiferous")["label"] == "neutral"
+
+    # Only the bundled lexicon changes, not keywords.json
+    lexicon_path.write_text(json.dumps({**lexicon, "positive": lexicon["positive"] + ["splendiferous"]}))
+    cached = read_config(config_loader.CONFIG_PATH, cache_dir=cache_dir)
+    assert cached.artifact("lexicon_scorer").score_text("that is splendiferous")["label"] == "positive"
+
+    # Built-in meeting phrase lists are part of the matcher's key as well
+    # (patched where the registered compiler reads them)
+    analyzer = sys.modules[config_loader._COMPILERS["meeting_matcher"][2].__module__]
+    monkeypatch.setattr(analyzer, "AGENDA_PHRASES", analyzer.AGENDA_PHRASES + ["splendiferous"])
+    matcher = read_config(config_loader.CONFIG_PATH, cache_dir=cache_dir).artifact("meeting_matcher")
+    assert matcher.mask("that is splendiferous") & matcher.bit("agenda")
+
+def test_unreadable_cache_is_ignored(tmp_path):
+    cache_dir = tmp_path / "compiled"
+    version = read_config(config_loader.CONFIG_PATH, cache_dir="").version
+    cache_dir.mkdir()
+    (cache_dir / f"keywords-{version}-v{config_loader.CACHE_FORMAT}.pkl").write_bytes(b"not a pickle")
+
+    config = read_config(config_loader.CONFIG_PATH, cache_dir=str(cache_dir))
+    assert config.artifact("meeting_matcher") is not None
+
+def test_invalid_files_fail_fast(tmp_path):
+    path = tmp_path / "keywords.json"
+    path.write_text("{not json")
+    with pytest.raises(ConfigValidationError, match="not valid JSON"):
+        read_config(str(path), cache_dir="")
+
+    path.write_text(json.dumps({"meeting": {"decisions": ["agreed"]}}))
+    with pytest.raises(ConfigValidationError, match="meeting.actions"):
+        read_config(str(path), cache_dir="")
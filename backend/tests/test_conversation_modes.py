@@ -0,0 +1,62 @@
+"""
+mode=both / mode=auto: meeting and sales analysis from one shared pass give
+the same insights as the separate analyzers.
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import context_analyzer as ca
+
+def seg(start, text, label="Neutral", confidence=0.9):
+    score = {"Positive": 0.7, "Negative": -0.8}.get(label, 0.0)
+    return {"start": start, "end": start + 3.0, "text": text, "sentiment": score,
+            "sentiment_label": label, "sentiment_confidence": confidence}
+
+SALES_CALL = [
+    seg(0.0, "Thanks for walking me through the dashboards."),
+    seg(3.0, "The price seems too expensive for our current budget.", "Negative"),
+    seg(6.0, "That makes sense, we have flexible plans.", "Positive"),
+    seg(9.0, "I need approval from my boss before we commit.", "Negative", 0.8),
+    seg(12.0, "This looks good and it solves our problem with reporting.", "Positive"),
+    seg(15.0, "Sounds good, send the proposal by Friday for review.", "Positive"),
+]
+
+STANDUP = [
+    seg(0.0, "Let's go through the agenda for the release."),
+    seg(3.0, "The deployment is blocked waiting on approval.", "Negative"),
+    seg(6.0, "I'll handle the migration and update the ticket by Friday.", "Positive"),
+    seg(9.0, "We agreed to ship the release next week.", "Positive"),
+    seg(12.0, "No blockers from my side."),
+]
+
+def sorted_actions(result):
+    return {**result, "recommended_actions": sorted(result["recommended_actions"])}
+
+def test_both_matches_separate_analyzers():
+    for segments in (SALES_CALL, STANDUP, list(reversed(SALES_CALL))):
+        nlp_input = {"text": "", "segments": segments}
+        both = ca.analyze_conversation(nlp_input, "both")
+
+        assert both["mode"] == "both"
+        assert both["meeting"] == ca.analyze_meeting(nlp_input)
+        assert sorted_actions(both["sales"]) == sorted_actions(ca.analyze_sales(segments))
+
+def test_auto_picks_the_fitting_analysis():
+    sales = ca.analyze_conversation({"text": "", "segments": SALES_CALL}, "auto")
+    meeting = ca.analyze_conversation({"text": "", "segments": STANDUP}, "auto")
+
+    assert sales["mode"] == "sales" and sales["conversation_type"]["type"] == "sales"
+    assert meeting["mode"] == "meeting" and meeting["conversation_type"]["type"] == "meeting"
+
+def test_indexed_objections_match_text_scan():
+    index = ca.conversation_index(SALES_CALL)
+    for budget_alignment in (False, True):
+        assert ca.detect_objections(index, budget_alignment) == ca.detect_objections(SALES_CALL, budget_alignment)
+
+def test_empty_transcript_defaults_to_meeting():
+    result = ca.analyze_conversation({"text": "", "segments": []}, "auto")
+    assert result["conversation_type"] == {"type": "meeting", "sales_cues": 0, "meeting_cues": 0}
+    assert ca.analyze_conversation({"text": "", "segments": []}, "both")["sales"]["objections"] == []
@@ -0,0 +1,75 @@
+"""
+Shared feature index for the meeting detectors: one phrase scan per segment,
+same results as the per-detector substring checks.
+"""
+
+import sys
+import os
+import random
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.phrase_matcher import PhraseMatcher
+from services.feature_index import FeatureIndex
+from services import context_analyzer as ca
+
+SEGMENTS = [
+    {"start": 0.0, "end": 4.0, "text": "The agenda today is to review the release.", "sentiment": 0.0, "sentiment_confidence": 0.9, "sentiment_label": "Neutral"},
+    {"start": 4.0, "end": 8.0, "text": "Should we ship on Friday?", "sentiment": 0.0, "sentiment_confidence": 0.8, "sentiment_label": "Neutral"},
+    {"start": 8.0, "end": 12.0, "text": "The deployment is blocked by a security issue.", "sentiment": -0.8, "sentiment_confidence": 0.9, "sentiment_label": "Negative"},
+    {"start": 12.0, "end": 16.0, "text": "We decided to keep the plan and ship Friday.", "sentiment": 0.5, "sentiment_confidence": 0.7, "sentiment_label": "Positive"},
+    {"start": 16.0, "end": 20.0, "text": "I'll follow up with the security team tomorrow.", "sentiment": 0.2, "sentiment_confidence": 0.6, "sentiment_label": "Neutral"},
+    {"start": 20.0, "end": 24.0, "text": "Great, no blockers on my side, agreed.", "sentiment": 0.7, "sentiment_confidence": 0.9, "sentiment_label": "Positive"},
+]
+
+def test_matcher_matches_substring_semantics():
+    categories = {
+        "a": ["i'll", "i'll take", "will"],
+        "b": ["take"],
+        "c": ["ill t"],
+        "upper": ["by EOD"],
+    }
+    matcher = PhraseMatcher(categories)
+    rng = random.Random(5)
+    vocab = ["i'll", "take", "will", "it", "by", "eod", "EOD", "skill", "till", " "]
+
+    for _ in range(2000):
+        text = "".join(rng.choice(vocab) for _ in range(rng.randint(0, 6)))
+        mask = matcher.mask(text)
+        for name, phrases in categories.items():
+            assert bool(mask & matcher.bit(name)) == any(p in text for p in phrases), (text, name)
+
+    texts = ["i'll take it", "skill", "", "by EOD", "multi\nline will"]
+    assert matcher.mask_all(texts) == [matcher.mask(t) for t in texts]
+
+def test_index_flags_and_columns():
+    index = ca.meeting_index(SEGMENTS)
+
+    assert isinstance(index, FeatureIndex)
+    assert ca.meeting_index(index) is index
+    assert index.flags["question"] == [False, True, False, False, False, False]
+    assert index.flags["execution_decision"] == [ca.is_valid_execution_decision(s["text"]) for s in SEGMENTS]
+    assert index.has(0, "agenda") and index.has(2, "tension")
+    assert index.where("closure") == [5]
+    assert index.labels[2] == "Negative"
+
+def test_detectors_accept_list_or_index():
+    index = ca.meeting_index(SEGMENTS)
+    for detector in (
+        ca.detect_signals, ca.detect_execution_attempted, ca.detect_issues_present,
+        ca.detect_risks_present, ca.extract_primary_topic, ca.detect_decisions,
+        ca.extract_actions, ca.detect_tension_points, ca.detect_explicit_no_blockers,
+        ca.ending_state_boost, ca.aggregate_sentiment, ca.detect_ownership_committed,
+        ca.detect_decisions_made,
+    ):
+        assert detector(SEGMENTS) == detector(index), detector.__name__
+
+    assert ca.calculate_business_sentiment(SEGMENTS, "on_track") == ca.calculate_business_sentiment(index, "on_track")
+
+def test_analyze_meeting_uses_index():
+    result = ca.analyze_meeting({"text": "", "segments": list(reversed(SEGMENTS))})
+
+    assert [d["time"] for d in result["decisions"]] == [12.0, 20.0]
+    assert [a["time"] for a in result["action_items"]] == [16.0]
+    assert result["tension_points"] == []  # "no blockers" declared at the end
+    assert result["sentiment_overview"] == {"Positive": 2, "Neutral": 3, "Negative": 1}
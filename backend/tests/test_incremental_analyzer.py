@@ -0,0 +1,100 @@
+"""
+Incremental analyzers: snapshots after any batching of the segments match
+the batch analyzers run over everything received so far.
+"""
+
+import sys
+import os
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import context_analyzer as ca
+
+def seg(start, text, label="Neutral", confidence=0.9):
+    score = {"Positive": 0.7, "Negative": -0.8}.get(label, 0.0)
+    return {"start": start, "end": start + 3.0, "text": text, "sentiment": score,
+            "sentiment_label": label, "sentiment_confidence": confidence}
+
+SALES_CALL = [
+    seg(0.0, "Thanks for walking me through the dashboards."),
+    seg(3.0, "The price seems too expensive for our current budget.", "Negative"),
+    seg(6.0, "That makes sense, we have flexible plans.", "Positive"),
+    seg(9.0, "I need approval from my boss before we commit.", "Negative", 0.8),
+    seg(12.0, "This looks good and it solves our problem with reporting.", "Positive"),
+    seg(15.0, "Honestly it fits our budget.", "Positive"),
+    seg(18.0, "Sounds good, send the proposal by Friday for review.", "Positive"),
+]
+
+STANDUP = [
+    seg(0.0, "Let's go through the agenda for the release."),
+    seg(3.0, "The deployment is blocked waiting on approval.", "Negative"),
+    seg(6.0, "I'll handle the migration and update the ticket by Friday.", "Positive"),
+    seg(9.0, "Vendor will deliver the API keys next week."),
+    seg(12.0, "We agreed to ship the release next week.", "Positive"),
+    seg(15.0, "No blockers from my side."),
+]
+
+def sorted_actions(result):
+    return {**result, "recommended_actions": sorted(result["recommended_actions"])}
+
+def batches(segments, size):
+    return [segments[i:i + size] for i in range(0, len(segments), size)]
+
+def test_meeting_snapshots_match_analyze_meeting():
+    for size in (1, 2, 4, len(STANDUP)):
+        live = ca.IncrementalMeetingAnalyzer()
+        seen = []
+        for batch in batches(STANDUP, size):
+            live.add_segments(batch)
+            seen += batch
+            assert live.snapshot() == ca.analyze_meeting({"text": "", "segments": seen})
+
+def test_sales_snapshots_match_analyze_sales():
+    for size in (1, 3, len(SALES_CALL)):
+        live = ca.IncrementalSalesAnalyzer()
+        seen = []
+        for batch in batches(SALES_CALL, size):
+            live.add_segments(batch)
+            seen += batch
+            assert sorted_actions(live.snapshot()) == sorted_actions(ca.analyze_sales(seen))
+
+def test_out_of_order_batches_rebuild():
+    late, early = SALES_CALL[3:], SALES_CALL[:3]
+    sales = ca.IncrementalSalesAnalyzer().add_segments(late).add_segments(early)
+    assert sorted_actions(sales.snapshot()) == sorted_actions(ca.analyze_sales(SALES_CALL))
+
+    meeting = ca.IncrementalMeetingAnalyzer()
+    meeting.add_segments(list(reversed(STANDUP[2:])))
+    meeting.add_segments(STANDUP[:2])
+    assert meeting.snapshot() == ca.analyze_meeting({"text": "", "segments": STANDUP})
+
+def test_empty_snapshots():
+    assert ca.IncrementalMeetingAnalyzer().snapshot() == ca.analyze_meeting({"text": "", "segments": []})
+    assert ca.IncrementalSalesAnalyzer().add_segments([]).snapshot() == ca.analyze_sales([])
+
+def test_base_analyzer_is_abstract():
+    with pytest.raises(TypeError):
+        ca._IncrementalAnalyzer()
+
+def test_blob_terms_span_segment_boundaries():
+    blob = ca._BlobTerms(["send info", "by friday"])
+    for text in ("we can send", "info by", "friday then"):
+        blob.append(text)
+    assert "send info" in blob and "by friday" in blob
+    assert "info by friday" in blob  # unwatched: falls back to the joined blob
+    assert "nothing" not in blob
+
+def test_synthetic_call_parity():
+    from benchmarks.synthetic import make_enriched_call
+
+    call = make_enriched_call(240, objection_every=12)
+    sales = ca.IncrementalSalesAnalyzer()
+    meeting = ca.IncrementalMeetingAnalyzer()
+    for batch in batches(call, 17):
+        sales.add_segments(batch)
+        meeting.add_segments(batch)
+
+    assert sorted_actions(sales.snapshot()) == sorted_actions(ca.analyze_sales(call))
+    assert meeting.snapshot() == ca.analyze_meeting({"text": "", "segments": call})
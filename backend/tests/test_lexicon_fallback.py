@@ -0,0 +1,77 @@
+"""
+Lexicon sentiment fallback and load shedding.
+
+Without a model the engine must still produce real Positive/Negative labels
+(so objections and call sentiment keep working) and flag them as degraded.
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import nlp_engine
+from services.nlp_engine import NLPEngine, SOURCE_LEXICON, SOURCE_MODEL
+from services.lexicon_sentiment import LexiconSentimentScorer
+from services.context_analyzer import analyze_sales
+from utils.config_loader import KEYWORDS_CONFIG
+
+def test_lexicon_scorer_labels_and_negation():
+    scorer = LexiconSentimentScorer.from_config(KEYWORDS_CONFIG)
+
+    results = scorer([
+        "This is great, exactly what we need.",
+        "Honestly this is not good and the setup is frustrating.",
+        "Let's go through the agenda and the roles.",
+        "We met on Tuesday.",
+    ])
+
+    assert [r["label"] for r in results] == ["positive", "negative", "neutral", "neutral"]
+    assert results[1]["score"] >= 0.75
+    # Neutral markers are more certain than "nothing matched"
+    assert results[2]["score"] > results[3]["score"]
+
+def test_engine_without_model_uses_lexicon_and_keeps_objections():
+    engine = NLPEngine(load_model=False)
+    segments = [
+        {"start": 0.0, "end": 5.0, "text": "Thanks for walking us through the product today."},
+        {"start": 5.0, "end": 10.0, "text": "Honestly the price is too expensive, complicated and frustrating for us."},
+        {"start": 10.0, "end": 12.0, "text": "Okay."},
+    ]
+
+    enriched = engine.enrich_transcript(segments)
+
+    assert enriched[1]["sentiment_label"] == "Negative"
+    assert enriched[1]["sentiment_source"] == SOURCE_LEXICON
+    assert enriched[2]["sentiment_source"] == "none"  # Under the 4-word guardrail
+
+    insights = analyze_sales(enriched)
+    assert any(o["type"] == "Pricing" for o in insights["objections"])
+
+class BusyBatcher:
+    def __init__(self, pending):
+        self._pending = pending
+        self.scored = 0
+
+    def pending(self):
+        return self._pending
+
+    def score(self, texts):
+        self.scored += len(texts)
+        return [{"label": "Positive", "score": 0.99} for _ in texts]
+
+def test_load_shedding_switches_to_lexicon_over_threshold():
+    engine = NLPEngine(load_model=False)
+    engine.sentiment_pipeline = object()  # Pretend a model is loaded
+    segments = [{"start": 0.0, "end": 3.0, "text": "The rollout was a terrible failure."}]
+
+    engine.batcher = BusyBatcher(pending=nlp_engine.SHED_QUEUE_THRESHOLD)
+    shed = engine.enrich_transcript(segments)
+    assert shed[0]["sentiment_source"] == SOURCE_LEXICON
+    assert shed[0]["sentiment_label"] == "Negative"
+    assert engine.batcher.scored == 0
+
+    engine.batcher = BusyBatcher(pending=0)
+    normal = engine.enrich_transcript(segments)
+    assert normal[0]["sentiment_source"] == SOURCE_MODEL
+    assert engine.batcher.scored == 1
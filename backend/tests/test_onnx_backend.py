@@ -0,0 +1,68 @@
+"""
+Accuracy parity between the torch pipeline and the ONNX Runtime backend.
+
+The ONNX test needs transformers, torch, onnxruntime and the cached (or
+downloadable) sentiment model; it is skipped when any of them is missing.
+"""
+
+import sys
+import os
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.onnx_sentiment import logits_to_predictions
+
+PARITY_SENTENCES = [
+    "This is exactly what we need, the demo was fantastic.",
+    "The pricing is way too expensive for a team our size.",
+    "Let's review the agenda for today's meeting.",
+    "We are blocked on the security approval and it is frustrating.",
+    "I'll send the proposal by Friday and we can review it together.",
+    "Honestly I don't think this integration will work for us.",
+    "Sounds good, that works for me.",
+    "The release slipped again and the client is unhappy.",
+    "We discussed the roadmap and the onboarding flow.",
+    "I love how simple the interface is compared to our current tool.",
+]
+
+def test_logits_to_predictions_matches_pipeline_format():
+    id2label = {0: "Negative", 1: "Neutral", 2: "Positive"}
+    preds = logits_to_predictions([[0.1, 0.2, 3.0], [2.0, 0.0, 0.0]], id2label)
+
+    assert [p["label"] for p in preds] == ["Positive", "Negative"]
+    assert all(0.0 < p["score"] <= 1.0 for p in preds)
+    assert preds[0]["score"] > 0.8
+
+def test_onnx_label_parity_with_torch():
+    pytest.importorskip("onnxruntime")
+    pytest.importorskip("torch")
+    pytest.importorskip("transformers")
+
+    from transformers import pipeline
+    from services.nlp_engine import SENTIMENT_MODEL, map_sentiment_label
+    from services.onnx_sentiment import OnnxSentimentPipeline
+
+    try:
+        torch_pipe = pipeline("sentiment-analysis", model=SENTIMENT_MODEL)
+        onnx_pipe = OnnxSentimentPipeline(SENTIMENT_MODEL)
+    except Exception as e:
+        pytest.skip(f"Sentiment model not available offline: {e}")
+
+    torch_results = torch_pipe(PARITY_SENTENCES, batch_size=len(PARITY_SENTENCES))
+    onnx_results = onnx_pipe(PARITY_SENTENCES, batch_size=len(PARITY_SENTENCES))
+
+    agreement = 0
+    score_drift = []
+    for t, o in zip(torch_results, onnx_results):
+        _, t_label = map_sentiment_label(t["label"], t["score"])
+        _, o_label = map_sentiment_label(o["label"], o["score"])
+        agreement += t_label == o_label
+        if t["label"] == o["label"]:
+            score_drift.append(abs(t["score"] - o["score"]))
+
+    print(f"Label agreement: {agreement}/{len(PARITY_SENTENCES)}")
+    # int8 quantization may flip a borderline sentence, never more
+    assert agreement >= len(PARITY_SENTENCES) - 1
+    assert sum(score_drift) / len(score_drift) < 0.05
@@ -0,0 +1,58 @@
+"""
+Response projection (`fields=`) and time-range paging of stored segments.
+"""
+
+import sys
+import os
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.projection import carries_segments, page_segments, parse_fields, project
+from services.time_index import TimeIndex
+
+SEGMENTS = [{"start": float(i * 10), "end": float(i * 10 + 8), "text": f"segment {i}"} for i in range(25)]
+
+RESPONSE = {
+    "analysis_id": "a1",
+    "mode": "sales",
+    "transcript": {"text": "...", "segments": SEGMENTS},
+    "insights": {"summary": "s", "quality": {"label": "High"}, "key_insights": ["k"], "transcript": SEGMENTS},
+    "config_version": "v1",
+}
+
+def test_parse_fields():
+    assert parse_fields("insights.summary, -insights.transcript") == ([["insights", "summary"]], [["insights", "transcript"]])
+    assert parse_fields(None) == ([], [])
+    with pytest.raises(ValueError):
+        parse_fields("insights..summary")
+
+def test_includes_select_sections():
+    projected = project(RESPONSE, "insights.summary,insights.quality,insights.key_insights,insights.missing",
+                        always=("analysis_id",))
+    assert projected == {"analysis_id": "a1",
+                         "insights": {"summary": "s", "quality": {"label": "High"}, "key_insights": ["k"]}}
+    assert not carries_segments(projected)
+
+def test_excludes_drop_the_duplicate_transcript():
+    projected = project(RESPONSE, "-insights.transcript")
+    assert "transcript" not in projected["insights"]
+    assert projected["transcript"]["segments"] is SEGMENTS
+    # The input response is not modified
+    assert "transcript" in RESPONSE["insights"]
+    assert carries_segments(projected) and not carries_segments(project(projected, "-transcript.segments"))
+
+def test_page_segments_by_time_range():
+    timeline = TimeIndex(SEGMENTS)
+    page = page_segments(timeline, start=50.0, end=150.0, limit=4)
+    assert [s["start"] for s in page["segments"]] == [50.0, 60.0, 70.0, 80.0]
+    assert page["total"] == 10 and page["next_offset"] == 4
+
+    pages = [page]
+    while pages[-1]["next_offset"] is not None:
+        pages.append(page_segments(timeline, 50.0, 150.0, offset=pages[-1]["next_offset"], limit=4))
+    assert [s for p in pages for s in p["segments"]] == SEGMENTS[5:15]
+
+    everything = page_segments(timeline, limit=100)
+    assert everything["total"] == 25 and everything["next_offset"] is None
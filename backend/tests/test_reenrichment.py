@@ -0,0 +1,90 @@
+"""
+Transcript corrections: re-enrichment reuses stored keywords and sentiment
+for unchanged segments, scores only changed or re-merged ones, and matches
+a full enrichment of the corrected transcript.
+"""
+
+import sys
+import os
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.analysis_cache import AnalysisCache, StoredAnalysis
+from services.nlp_engine import NLPEngine
+from utils.config_loader import current_config, variant_config
+
+LINES = [
+    "Thanks everyone for joining the weekly sync today.",
+    "The deployment is blocked on the security review.",
+    "Ok.",
+    "I'll follow up with the security team tomorrow morning.",
+    "Great, that sounds like a solid plan for the release.",
+]
+
+def raw_segments():
+    return [{"start": float(i * 4), "end": float(i * 4 + 4), "text": t} for i, t in enumerate(LINES)]
+
+def edits_of(enriched):
+    return [{"start": s["start"], "end": s["end"], "text": s["text"]} for s in enriched]
+
+@pytest.fixture
+def engine():
+    return NLPEngine(load_model=False)
+
+def test_unchanged_transcript_reuses_everything(engine):
+    previous = engine.enrich_transcript(raw_segments())
+    stats = {}
+    result = engine.reenrich(previous, edits_of(previous), stats=stats)
+
+    assert all(a is b for a, b in zip(result, previous))
+    assert stats["reused"] == len(previous) and stats["sentiment_inferred"] == 0
+
+def test_edit_scores_only_the_changed_segment(engine):
+    previous = engine.enrich_transcript(raw_segments())
+    edited = edits_of(previous)
+    edited[1]["text"] = "The deployment is unblocked, the security review passed."
+
+    stats = {}
+    result = engine.reenrich(previous, edited, stats=stats)
+
+    assert stats["reenriched"] == 1 and stats["sentiment_inferred"] == 1
+    assert result == engine.enrich_transcript(edited)
+    assert result[0] is previous[0] and result[1] is not previous[1]
+
+def test_edit_that_merges_segments(engine):
+    previous = engine.enrich_transcript(raw_segments())
+    edited = edits_of(previous)
+    # No closing punctuation + lowercase continuation: merged with the next segment
+    edited[3]["text"] = "I'll follow up with the security team"
+    edited[4]["text"] = "tomorrow morning, that sounds like a solid plan."
+
+    stats = {}
+    result = engine.reenrich(previous, edited, stats=stats)
+
+    assert len(result) == len(previous) - 1
+    assert result[-1]["text"] == "I'll follow up with the security team tomorrow morning, that sounds like a solid plan."
+    assert stats["reenriched"] == 1
+    assert result == engine.enrich_transcript(edited)
+
+def test_rekey_after_config_change(engine):
+    previous = engine.enrich_transcript(raw_segments())
+    config = variant_config(current_config(), {"nlp_enrichment": {"security": ["security"]}})
+    stats = {}
+    result = engine.reenrich(previous, edits_of(previous), stats=stats, rekey=True, config=config)
+
+    assert stats["sentiment_inferred"] == 0
+    assert "security" in result[1]["keywords"]
+    assert [s["sentiment"] for s in result] == [s["sentiment"] for s in previous]
+
+def test_analysis_cache_lru():
+    cache = AnalysisCache(maxsize=2)
+    ids = [cache.new_id() for _ in range(3)]
+    for analysis_id in ids:
+        cache.put(StoredAnalysis(analysis_id, "meeting", None, "", [], "v1"))
+
+    with pytest.raises(KeyError):
+        cache.get(ids[0])
+    assert cache.get(ids[2]).mode == "meeting"
+    assert cache.stats() == {"size": 2, "maxsize": 2, "evictions": 1}
@@ -0,0 +1,77 @@
+"""
+Offline bulk rescoring CLI: results match the analyzers, bad records are
+reported per line, and an interrupted run resumes from its checkpoint.
+"""
+
+import sys
+import os
+import json
+import subprocess
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import rescore
+from services.context_analyzer import analyze_meeting, analyze_sales
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def seg(start, text, label="Neutral", confidence=0.9):
+    return {"start": start, "end": start + 3.0, "text": text, "sentiment": 0.0,
+            "sentiment_label": label, "sentiment_confidence": confidence}
+
+SALES = [seg(0.0, "The price is too expensive.", "Negative"), seg(3.0, "That makes sense, send the proposal.", "Positive")]
+MEETING = [seg(0.0, "I'll handle the deployment by Friday."), seg(3.0, "We agreed to ship next week.")]
+
+def write_archive(path, count=10):
+    with open(path, "w") as f:
+        for i in range(count):
+            if i == 3:
+                f.write("{not json\n")
+                continue
+            if i % 2:
+                record = {"id": f"call-{i}", "mode": "sales", "transcript": {"text": "", "segments": SALES}}
+            else:
+                record = {"session_id": f"call-{i}", "text": "", "segments": MEETING}
+            f.write(json.dumps(record) + "\n")
+
+def read_jsonl(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+def test_rescore_matches_analyzers(tmp_path):
+    archive, output = str(tmp_path / "archive.jsonl"), str(tmp_path / "out.jsonl")
+    write_archive(archive)
+
+    stats = rescore.rescore([archive], output, workers=2, chunk_size=3)
+    results = read_jsonl(output)
+
+    assert stats["calls"] == 10 and stats["errors"] == 1
+    assert [r["id"] for r in results] == [f"call-{i}" if i != 3 else f"{archive}:4" for i in range(10)]
+    assert "error" in results[3]
+    assert results[0]["insights"] == analyze_meeting({"text": "", "segments": MEETING})
+    assert sorted(results[1]["insights"]["recommended_actions"]) == sorted(analyze_sales(SALES)["recommended_actions"])
+
+def test_resume_after_interruption(tmp_path):
+    archive, output = str(tmp_path / "archive.jsonl"), str(tmp_path / "out.jsonl")
+    write_archive(archive)
+    rescore.rescore([archive], output, workers=1, chunk_size=4)
+    expected = read_jsonl(output)
+
+    # Crash after the first chunk: checkpoint at line 4, a torn line after it
+    with open(output, "rb") as f:
+        first_chunk = b"".join(f.readlines()[:4])
+    with open(output, "wb") as f:
+        f.write(first_chunk + b'{"id": "torn')
+    rescore.save_checkpoint(output + ".ckpt", {"files": {archive: 4}, "output_offset": len(first_chunk)})
+
+    stats = rescore.rescore([archive], output, workers=1, chunk_size=4)
+    assert stats["calls"] == 6
+    assert read_jsonl(output) == expected
+
+    # Completed run: nothing left to do
+    assert rescore.rescore([archive], output, workers=1)["calls"] == 0
+
+def test_cli_does_not_import_model_stacks():
+    code = "import sys, rescore; print(sorted(m for m in ('torch', 'transformers', 'whisper') if m in sys.modules))"
+    out = subprocess.run([sys.executable, "-c", code], cwd=BACKEND_DIR, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "[]"
@@ -0,0 +1,86 @@
+"""
+Response encoding: Accept / Accept-Encoding negotiation, lossless round
+trips for every format, and large payloads encoded off the event loop.
+"""
+
+import asyncio
+import gzip
+import json
+import sys
+import os
+import threading
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import response_encoding as enc
+from services.response_encoding import MEDIA_JSON, MEDIA_MSGPACK, encode_response, encoded_response, negotiate
+
+CONTENT = {
+    "mode": "sales",
+    "transcript": {"text": "Größe ✓", "segments": [{"start": 0.0, "end": 3.5, "text": "The price is high.",
+                                                    "keywords": [], "sentiment": -0.52}] * 50},
+    "insights": {"quality": {"label": "Low", "score": 3, "drivers": []}},
+}
+
+def decode(body, headers):
+    coding = headers.get("Content-Encoding")
+    if coding == "gzip":
+        body = gzip.decompress(body)
+    elif coding == "br":
+        body = enc.brotli.decompress(body)
+    if headers["Content-Type"] == MEDIA_MSGPACK:
+        return enc.msgpack.unpackb(body, raw=False)
+    return json.loads(body)
+
+def test_negotiate():
+    assert negotiate(None, None) == (MEDIA_JSON, None)
+    assert negotiate("*/*", "gzip, deflate") == (MEDIA_JSON, "gzip")
+    assert negotiate("application/json;q=0.5, application/msgpack", "identity")[0] == (
+        MEDIA_MSGPACK if enc.msgpack else MEDIA_JSON)
+    assert negotiate("application/msgpack;q=0, application/json", None)[0] == MEDIA_JSON
+    assert negotiate(None, "gzip;q=0.8, br;q=0.5")[1] == "gzip"
+    assert negotiate(None, "br;q=0, *")[1] == "gzip"
+    if enc.brotli:
+        assert negotiate(None, "gzip, br")[1] == "br"
+
+@pytest.mark.parametrize("accept", [MEDIA_JSON, MEDIA_MSGPACK])
+@pytest.mark.parametrize("accept_encoding", [None, "gzip", "br"])
+def test_round_trip(accept, accept_encoding):
+    if (accept == MEDIA_MSGPACK and enc.msgpack is None) or (accept_encoding == "br" and enc.brotli is None):
+        pytest.skip("optional encoder not installed")
+    body, headers = encode_response(CONTENT, accept, accept_encoding)
+
+    assert headers["Content-Type"] == accept
+    assert headers.get("Content-Encoding") == accept_encoding
+    assert decode(body, headers) == CONTENT
+
+def test_stdlib_fallback_matches(monkeypatch):
+    fast = json.loads(enc.encode_body(CONTENT))
+    monkeypatch.setattr(enc, "orjson", None)
+    assert json.loads(enc.encode_body(CONTENT)) == fast
+
+def test_small_bodies_are_not_compressed():
+    body, headers = encode_response({"status": "ok"}, None, "gzip")
+    assert "Content-Encoding" not in headers and json.loads(body) == {"status": "ok"}
+
+def test_numpy_values_are_encoded():
+    content = {"score": np.int64(7), "weights": np.array([0.5, 1.0]), "flag": np.bool_(True)}
+    assert json.loads(enc.encode_body(content)) == {"score": 7, "weights": [0.5, 1.0], "flag": True}
+
+def test_large_payloads_encode_off_the_event_loop(monkeypatch):
+    threads = []
+    real = enc.encode_response
+    monkeypatch.setattr(enc, "encode_response", lambda *args: threads.append(threading.current_thread()) or real(*args))
+
+    async def run(segments):
+        return await encoded_response(CONTENT, MEDIA_JSON, "gzip", segments=segments)
+
+    small = asyncio.run(run(1))
+    large = asyncio.run(run(enc.OFFLOAD_MIN_SEGMENTS))
+
+    assert threads[0] is threading.main_thread() and threads[1] is not threading.main_thread()
+    assert small.body == large.body
+    assert large.headers["content-encoding"] == "gzip" and large.headers["vary"] == "Accept, Accept-Encoding"
@@ -0,0 +1,93 @@
+"""
+Sales Mode as a memoized stage graph: every stage runs once per call and the
+output matches the step-by-step analyzer.
+"""
+
+import sys
+import os
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.stage_graph import StageGraph
+from services.time_index import TimeIndex
+from services import context_analyzer as ca
+
+def seg(start, text, label="Neutral", confidence=0.9):
+    score = {"Positive": 0.7, "Negative": -0.8}.get(label, 0.0)
+    return {"start": start, "end": start + 3.0, "text": text, "sentiment": score,
+            "sentiment_label": label, "sentiment_confidence": confidence}
+
+CALL = [
+    seg(0.0, "Thanks for walking me through the dashboards."),
+    seg(3.0, "The price seems too expensive for our current budget.", "Negative"),
+    seg(6.0, "That makes sense, we have flexible plans.", "Positive"),
+    seg(9.0, "The integration with our CRM looks complicated.", "Negative", 0.8),
+    seg(12.0, "This looks good and it solves our problem with reporting.", "Positive"),
+    seg(15.0, "Sounds good, send the proposal by Friday for review.", "Positive"),
+]
+
+def test_stages_run_once_and_report_timings():
+    graph = StageGraph()
+    calls = []
+
+    @graph.stage("double", "x")
+    def double(x):
+        calls.append("double")
+        return x * 2
+
+    @graph.stage("plus", "double")
+    def plus(d):
+        calls.append("plus")
+        return d + 1
+
+    @graph.stage("both", "double", "plus")
+    def both(d, p):
+        return (d, p)
+
+    timings = {}
+    results = graph.run({"x": 3}, ["both", "plus"], timings=timings)
+
+    assert results["both"] == (6, 7)
+    assert calls == ["double", "plus"]
+    assert set(timings) == {"double", "plus", "both"}
+
+def test_missing_input_and_cycles_are_reported():
+    graph = StageGraph()
+    graph.stage("a", "b")(lambda b: b)
+    graph.stage("b", "a")(lambda a: a)
+
+    with pytest.raises(KeyError):
+        graph.run({}, ["missing"])
+    with pytest.raises(ValueError):
+        graph.run({}, ["a"])
+
+def test_analyze_sales_matches_step_by_step_pipeline():
+    segments = sorted(CALL, key=lambda s: s["start"])
+    objections_initial = ca.detect_objections(segments)
+    signals = ca.assess_sales_signals(segments, objections_initial, ca.recommend_actions(objections_initial))
+    signals["_text_blob"] = ca.sales_text_blob(segments)
+    objections = ca.detect_objections(segments, budget_alignment=signals["budget_alignment"])
+
+    timings = {}
+    result = ca.analyze_sales(list(reversed(CALL)), timings=timings)
+
+    assert result["objections"] == objections
+    assert sorted(result["recommended_actions"]) == sorted(ca.recommend_actions(objections, signals=signals, segments=segments))
+    assert result["quality"] == ca.compute_sales_quality(signals)
+    assert "signals" in timings and "result" in timings
+
+def test_budget_alignment_filters_pricing_objections():
+    call = CALL + [seg(18.0, "Honestly it fits our budget.", "Positive")]
+    result = ca.analyze_sales(call)
+
+    segments = sorted(call, key=lambda s: s["start"])
+    assert result["objections"] == ca.detect_objections(segments, budget_alignment=True)
+    assert all(o["type"] != "Pricing" for o in result["objections"])
+
+def test_objection_resolution_shares_time_index():
+    segments = sorted(CALL, key=lambda s: s["start"])
+    timeline = TimeIndex(segments)
+    for obj in ca.detect_objections(segments):
+        assert ca.is_objection_resolved(obj, timeline) == ca.is_objection_resolved(obj, segments)
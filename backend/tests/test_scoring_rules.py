@@ -0,0 +1,104 @@
+"""
+Declarative scoring rules (config/scoring_rules.json) reproduce the old
+hand-written if-chains for every combination of signals, one row at a time
+and in batch.
+"""
+
+import itertools
+import json
+import sys
+import os
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import context_analyzer as ca
+from services.scoring_rules import SCORING_RULES, ScoringTable, load_scoring_rules
+
+SALES_SIGNALS = ["decision_maker_known", "next_step", "hard_commitment", "end_of_call_commitment",
+                 "budget_alignment", "no_intent", "deferred", "objection_handled",
+                 "value_articulated", "stalled"]
+
+def legacy_sales_quality(s):
+    if s["no_intent"] or s["deferred"]:
+        return {"label": "Low", "score": 2, "drivers": ["Disqualified: No Intent/Deferred"]}
+    score, drivers = 0, []
+    for key, weight, driver in (
+        ("decision_maker_known", 2, "Decision maker identified"),
+        ("next_step", 3, "Next step agreed"),
+        ("hard_commitment", 2, "Hard commitment locked"),
+        ("end_of_call_commitment", 3, "Strong end-of-call commitment"),
+        ("budget_alignment", 2, "Budget alignment confirmed"),
+        ("objection_handled", 2, "Objections managed"),
+        ("value_articulated", 2, "Value articulated"),
+    ):
+        if s[key]:
+            score += weight
+            drivers.append(driver)
+    if not s["stalled"]:
+        score += 1
+        drivers.append("Momentum maintained")
+    if s["end_of_call_commitment"] or s["hard_commitment"]:
+        return {"label": "High", "score": max(score, 8), "drivers": drivers + ["Momentum: Strong"]}
+    if s["next_step"]:
+        return {"label": "Medium", "score": max(score, 5), "drivers": drivers}
+    return {"label": "Low", "score": min(score, 4), "drivers": drivers}
+
+def legacy_call_stage(s):
+    if s["no_intent"] or s["deferred"]:
+        return "weak"
+    if s["end_of_call_commitment"] or s["hard_commitment"]:
+        return "strong"
+    if s["next_step"] and s["value_articulated"]:
+        return "moderate"
+    return "ambiguous"
+
+def all_combinations(names):
+    return [dict(zip(names, values)) for values in itertools.product([False, True], repeat=len(names))]
+
+def test_sales_quality_and_call_stage_match_legacy():
+    for signals in all_combinations(SALES_SIGNALS):
+        assert ca.compute_sales_quality(signals) == legacy_sales_quality(signals)
+        assert ca._determine_call_stage(signals) == legacy_call_stage(signals)
+
+def test_meeting_quality_and_project_risk_match_legacy():
+    for ownership, execution in itertools.product([False, True], repeat=2):
+        expected = ["Low", "Medium", "High"][ownership + execution]
+        assert ca.compute_meeting_quality_v2({"ownership": ownership, "execution_decision": execution}) == {"label": expected}
+
+    for issues, risks, deps in itertools.product([False, True], repeat=3):
+        score = 3 * issues + 3 * risks + 4 * deps
+        drivers = [d for on, d in ((issues, "Issues identified"), (risks, "Risks flagged"),
+                                   (deps, "Uncontrolled dependencies")) if on]
+        label = "High" if score >= 7 else "Medium" if score >= 4 else "Low"
+        assert ca.compute_project_risk(issues, risks, deps) == {"label": label, "score": score, "drivers": drivers}
+
+@pytest.mark.parametrize("name", sorted(SCORING_RULES))
+def test_batch_matches_row_evaluation(name):
+    table = SCORING_RULES[name]
+    rows = all_combinations(table.signals)
+    batch = table.evaluate_batch({s: [row[s] for row in rows] for s in table.signals})
+
+    for i, row in enumerate(rows):
+        expected = table.evaluate(row)
+        assert batch["label"][i] == expected["label"]
+        if "score" in expected:
+            assert batch["score"][i] == expected["score"]
+            assert table.row_drivers(batch, i) == expected["drivers"]
+
+def test_missing_signals_count_as_false():
+    assert ca.compute_sales_quality({"next_step": True})["label"] == "Medium"
+    batch = SCORING_RULES["sales_quality"].evaluate_batch({"next_step": [True, False]})
+    assert list(batch["label"]) == ["Medium", "Low"]
+
+def test_malformed_tables_fail_fast(tmp_path):
+    with pytest.raises(ValueError, match="default"):
+        ScoringTable("bad", {"labels": [{"when": {"any": ["x"]}, "label": "High"}]})
+    with pytest.raises(ValueError, match="unknown condition"):
+        ScoringTable("bad", {"labels": [{"when": {"none": ["x"]}, "label": "High"}, {"label": "Low"}]})
+
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps({"bad": {"rules": [{"signal": "x", "weight": 1}]}}))
+    with pytest.raises(ValueError):
+        load_scoring_rules(str(path))
@@ -0,0 +1,78 @@
+"""
+Adaptive coalescing: choppy segments are merged up to a token target and a
+per-call inference budget, keeping the original timestamps.
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.nlp_engine import COALESCE_MAX_TOKENS, NLPEngine
+
+def choppy_segments(n):
+    # Each segment ends with punctuation, so the semantic merge keeps them apart
+    return [
+        {"start": float(i * 2), "end": float(i * 2 + 2), "text": f"Point number {i} was covered today."}
+        for i in range(n)
+    ]
+
+def test_budget_caps_segment_count_and_keeps_timestamps():
+    engine = NLPEngine(load_model=False)
+    segments = choppy_segments(300)
+
+    coalesced, report = engine.coalesce_segments(segments, target_tokens=16, inference_budget=50)
+
+    assert len(coalesced) <= 50
+    assert coalesced[0]["start"] == 0.0
+    assert coalesced[-1]["end"] == segments[-1]["end"]
+    parts = [p for seg in coalesced for p in seg.get("parts", [{"start": seg["start"], "end": seg["end"]}])]
+    assert [p["start"] for p in parts] == [s["start"] for s in segments]
+    assert report["segments_before"] == 300
+    assert report["segments_after"] == len(coalesced)
+    assert report["granularity_kept"] < 0.2
+
+def test_target_tokens_merges_only_small_neighbours():
+    engine = NLPEngine(load_model=False)
+    segments = choppy_segments(4) + [
+        {"start": 8.0, "end": 30.0, "text": " ".join(["long"] * 60) + "."}
+    ]
+
+    coalesced, report = engine.coalesce_segments(segments, target_tokens=20)
+
+    assert len(coalesced) == 3
+    assert coalesced[-1]["text"] == segments[-1]["text"]  # Already over target: untouched
+    assert "parts" not in coalesced[-1]
+
+def test_enrich_transcript_reports_coalescing():
+    engine = NLPEngine(load_model=False)
+    stats = {}
+
+    enriched = engine.enrich_transcript(choppy_segments(120), stats=stats, inference_budget=10)
+
+    assert len(enriched) <= 10
+    assert stats["sentiment_inferred"] <= 10
+    assert stats["coalescing"]["segments_before"] == 120
+
+def test_target_never_exceeds_one_model_window():
+    engine = NLPEngine(load_model=False)
+    segments = choppy_segments(400)
+    lengths = engine._token_lengths([s["text"] for s in segments])
+
+    # ~3600 tokens cannot fit 2 windows: the target stops at the window size
+    coalesced, report = engine.coalesce_segments(segments, inference_budget=2)
+
+    assert report["target_tokens"] == COALESCE_MAX_TOKENS and report["budget_met"] is False
+    # Groups are contiguous: each coalesced segment's length is the sum over its parts
+    remaining = iter(lengths)
+    merged = [sum(next(remaining) for _ in seg.get("parts") or [seg]) for seg in coalesced]
+    assert max(merged) <= COALESCE_MAX_TOKENS
+
+    _, report = engine.coalesce_segments(segments, inference_budget=50)
+    assert report["budget_met"] is True
+
+def test_coalescing_off_by_default():
+    engine = NLPEngine(load_model=False)
+    segments = choppy_segments(5)
+
+    assert engine.coalesce_segments(segments) == (segments, None)
@@ -0,0 +1,97 @@
+"""
+Slotted Segment model: immutable, dict-compatible for analyzers, and only
+converted to JSON dicts at the response boundary.
+"""
+
+import sys
+import os
+import pickle
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.segment import Segment, to_segments
+from services.nlp_engine import NLPEngine
+from services.context_analyzer import analyze_meeting, analyze_sales
+
+LINES = [
+    "Thanks everyone for joining the weekly sync today.",
+    "and we should cover the release plan first",
+    "The deployment is blocked on the security review.",
+    "I'll follow up with the security team tomorrow morning.",
+    "The price seems too expensive for our current budget.",
+    "Great, that sounds like a solid plan for the release.",
+]
+
+def raw_segments():
+    return [{"start": float(i * 4), "end": float(i * 4 + 4), "text": t} for i, t in enumerate(LINES)]
+
+def test_segment_is_immutable_and_slotted():
+    seg = Segment(0.0, 2.5, "We Agreed To Ship")
+
+    assert not hasattr(seg, "__dict__")
+    assert seg.text_lower == "we agreed to ship"
+    with pytest.raises(AttributeError):
+        seg.text = "changed"
+
+    updated = seg.replace(sentiment=0.5, sentiment_label="Positive")
+    assert updated["sentiment"] == 0.5 and seg["sentiment"] == 0.0
+    # Unchanged text keeps the cached lowercase string
+    assert updated.text_lower is seg.text_lower
+
+def test_mapping_round_trip():
+    data = {
+        "start": 1.0, "end": 3.0, "text": "The deployment is blocked.",
+        "keywords": ["blocker"], "sentiment": -0.7, "sentiment_label": "Negative",
+        "sentiment_confidence": 0.9, "sentiment_source": "model",
+        "parts": [{"start": 1.0, "end": 2.0}, {"start": 2.0, "end": 3.0}],
+    }
+    seg = Segment.from_dict(data)
+
+    assert seg.to_dict() == data
+    assert seg == data
+    assert seg.get("missing", "default") == "default"
+    assert "parts" not in Segment(0.0, 1.0, "x")
+    assert pickle.loads(pickle.dumps(seg)) == seg
+
+def test_unknown_fields_are_kept():
+    whisper = {"id": 3, "start": 0.0, "end": 2.0, "text": "We agreed", "avg_logprob": -0.21, "no_speech_prob": 0.01}
+    seg = Segment.from_dict(whisper)
+
+    assert seg["id"] == 3 and seg.get("avg_logprob") == -0.21 and "no_speech_prob" in seg
+    assert seg.replace(sentiment=0.5).to_dict() == {**seg.to_dict(), "sentiment": 0.5}
+    assert pickle.loads(pickle.dumps(seg)) == seg
+
+    # Through the pipeline: a merged run keeps its first segment's fields
+    engine = NLPEngine(load_model=False)
+    follow_up = {"id": 4, "start": 2.0, "end": 4.0, "text": "and we ship on friday", "avg_logprob": -0.3}
+    [merged] = engine.enrich_transcript([whisper, follow_up])
+    assert merged["text"] == "We agreed and we ship on friday" and merged["end"] == 4.0
+    assert {k: merged[k] for k in ("id", "avg_logprob", "no_speech_prob")} == {"id": 3, "avg_logprob": -0.21,
+                                                                              "no_speech_prob": 0.01}
+
+def test_pipeline_produces_segments_and_matches_dict_analysis():
+    engine = NLPEngine(load_model=False)
+    enriched = engine.enrich_transcript(raw_segments())
+
+    assert all(isinstance(seg, Segment) for seg in enriched)
+    assert enriched[1]["keywords"] == engine.extract_keywords(enriched[1]["text"])
+
+    as_dicts = [seg.to_dict() for seg in enriched]
+    text = " ".join(LINES)
+    assert analyze_meeting({"text": text, "segments": enriched}) == analyze_meeting({"text": text, "segments": as_dicts})
+
+    from_objects = analyze_sales(enriched)
+    from_dicts = analyze_sales(as_dicts)
+    # recommend_actions de-duplicates through a set
+    from_objects["recommended_actions"] = sorted(from_objects["recommended_actions"])
+    from_dicts["recommended_actions"] = sorted(from_dicts["recommended_actions"])
+    assert from_objects == from_dicts
+
+def test_enrichment_accepts_segments_from_stt():
+    engine = NLPEngine(load_model=False)
+    from_dicts = engine.enrich_transcript(raw_segments())
+    from_segments = engine.enrich_transcript(to_segments(raw_segments()))
+
+    assert from_segments == from_dicts
@@ -0,0 +1,116 @@
+"""
+Cross-request dynamic batching: concurrent submissions share one inference
+batch and every request gets exactly its own results back.
+"""
+
+import sys
+import os
+import threading
+import time
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.sentiment_batcher import SentimentBatcher
+
+class RecordingScorer:
+    def __init__(self, delay=0.0):
+        self.calls = []
+        self.delay = delay
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        time.sleep(self.delay)
+        return [{"label": "Positive", "score": float(len(t))} for t in texts]
+
+def test_concurrent_requests_share_batches():
+    scorer = RecordingScorer()
+    batcher = SentimentBatcher(scorer, max_batch=64, max_wait_ms=50).start()
+    results = {}
+
+    def request(n):
+        texts = [f"request {n} segment {i}" for i in range(3)]
+        results[n] = (texts, batcher.score(texts, timeout=5))
+
+    threads = [threading.Thread(target=request, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    batcher.stop()
+
+    # 8 requests x 3 texts collapse into far fewer model calls
+    assert len(scorer.calls) < 8
+    assert batcher.texts_scored == 24
+    assert batcher.pending() == 0
+
+    # Results scattered back to the right request, in order
+    for texts, scored in results.values():
+        assert [r["score"] for r in scored] == [float(len(t)) for t in texts]
+
+def test_max_batch_caps_model_calls():
+    scorer = RecordingScorer()
+    batcher = SentimentBatcher(scorer, max_batch=4, max_wait_ms=1).start()
+
+    scored = batcher.score([f"t{i}" for i in range(10)], timeout=5)
+    batcher.stop()
+
+    assert len(scored) == 10
+    assert max(len(call) for call in scorer.calls) <= 4
+
+def test_inference_error_propagates_to_each_request():
+    def failing(texts):
+        raise ValueError("model crashed")
+
+    batcher = SentimentBatcher(failing, max_wait_ms=1).start()
+    with pytest.raises(ValueError):
+        batcher.score(["hello there"], timeout=5)
+    assert batcher.pending() == 0
+    batcher.stop()
+
+def test_stop_fails_queued_submissions():
+    scorer = RecordingScorer(delay=0.3)
+    batcher = SentimentBatcher(scorer, max_wait_ms=0).start()
+    in_flight = batcher.submit(["scored before shutdown"])
+    time.sleep(0.05)  # The loop is now busy scoring it
+    queued = batcher.submit(["never scored"])
+
+    batcher.stop(timeout=0.01)
+
+    with pytest.raises(RuntimeError, match="stopped"):
+        queued.result(timeout=1)
+    assert in_flight.result(timeout=5)[0]["label"] == "Positive"
+    with pytest.raises(RuntimeError, match="not running"):
+        batcher.submit(["too late"])
+
+def test_submissions_racing_stop_always_resolve():
+    batcher = SentimentBatcher(RecordingScorer(), max_wait_ms=1).start()
+    futures = []
+
+    def request():
+        for i in range(50):
+            try:
+                futures.append(batcher.submit([f"text {i}"]))
+            except RuntimeError:
+                return
+
+    threads = [threading.Thread(target=request) for _ in range(4)]
+    for t in threads:
+        t.start()
+    batcher.stop()
+    for t in threads:
+        t.join()
+
+    for future in futures:
+        assert future.exception(timeout=1) is None or isinstance(future.exception(), RuntimeError)
+
+def test_score_waits_at_most_score_timeout():
+    release = threading.Event()
+    batcher = SentimentBatcher(lambda texts: release.wait(5) and [{}] * len(texts), score_timeout=0.05).start()
+    try:
+        with pytest.raises(TimeoutError):
+            batcher.score(["stuck behind a slow batch"])
+    finally:
+        release.set()
+        batcher.stop()
@@ -0,0 +1,52 @@
+"""
+Confidence cascade: the cheap tier settles confident segments, only the
+unsure ones reach the transformer, and per-tier counts are reported.
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.nlp_engine import NLPEngine, SOURCE_FAST, SOURCE_MODEL
+
+class CountingModel:
+    def __init__(self):
+        self.seen = []
+
+    def __call__(self, texts, batch_size=None, **kwargs):
+        self.seen.extend(texts)
+        return [{"label": "Positive", "score": 0.97} for _ in texts]
+
+def make_engine(cascade=True):
+    engine = NLPEngine(load_model=False, cascade=cascade, cascade_threshold=0.85)
+    engine.sentiment_pipeline = CountingModel()
+    # CountingModel has no tokenizer -> _score_texts calls the pipeline directly
+    return engine
+
+SEGMENTS = [
+    {"start": 0.0, "end": 4.0, "text": "Let's go through the agenda and the roles first."},
+    {"start": 4.0, "end": 8.0, "text": "This is terrible, the rollout failed and it is frustrating."},
+    {"start": 8.0, "end": 12.0, "text": "We met with their team on Tuesday afternoon."},
+]
+
+def test_cascade_only_sends_unsure_segments_to_model():
+    engine = make_engine()
+    stats = {}
+
+    enriched = engine.enrich_transcript(SEGMENTS, stats=stats)
+
+    assert [s["sentiment_source"] for s in enriched] == [SOURCE_FAST, SOURCE_FAST, SOURCE_MODEL]
+    assert engine.sentiment_pipeline.seen == [SEGMENTS[2]["text"]]
+    assert enriched[1]["sentiment_label"] == "Negative"
+    assert stats["sentiment_tiers"] == {SOURCE_FAST: 2, SOURCE_MODEL: 1}
+    assert engine.tier_counts[SOURCE_FAST] == 2
+
+def test_cascade_disabled_scores_everything_with_model():
+    engine = make_engine(cascade=False)
+    stats = {}
+
+    engine.enrich_transcript(SEGMENTS, stats=stats)
+
+    assert len(engine.sentiment_pipeline.seen) == 3
+    assert stats["sentiment_tiers"] == {SOURCE_MODEL: 3}
@@ -0,0 +1,75 @@
+"""
+Columnar (NumPy) sentiment aggregations match the scalar analyzer functions,
+for one call and for a stacked batch of calls.
+"""
+
+import sys
+import os
+import random
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import context_analyzer as ca
+from services.sentiment_columns import (
+    SentimentColumns, aggregate_sentiment_batch, overall_call_sentiment_batch,
+    ending_state_boost_batch, calculate_business_sentiment_batch, precomputed_sentiment,
+)
+
+LINES = [
+    "The price is too expensive for us.", "That makes sense.", "We agreed on the plan.",
+    "No blockers, good to go.", "The deployment bug is fixed and resolved.", "I am frustrated with this.",
+    "Let's review the budget.", "The integration looks complicated.", "Fair enough, send it over.",
+    "We have a bug in the deploy pipeline.", "Thanks everyone.",
+]
+
+def random_call(rng, n):
+    call = []
+    for i in range(n):
+        seg = {"start": float(rng.choice([i, i, max(0, i - 1)])), "end": i + 1.0, "text": rng.choice(LINES),
+               "sentiment": rng.choice([-0.8, 0.0, 0.6]), "sentiment_confidence": rng.choice([0.5, 0.6, 0.8, 0.95])}
+        if rng.random() < 0.9:
+            seg["sentiment_label"] = rng.choice(["Positive", "Neutral", "Negative", "Mixed"])
+        if rng.random() < 0.5:
+            seg["sentiment_score"] = rng.choice([-0.9, -0.2, 0.0, 0.4, 0.9])
+        call.append(seg)
+    return call
+
+def test_batch_matches_scalar_functions():
+    rng = random.Random(4)
+    calls = [random_call(rng, rng.randint(0, 25)) for _ in range(300)]
+    health = [rng.choice(["on_track", "at_risk", "needs_attention"]) for _ in calls]
+    columns = SentimentColumns(calls)
+
+    counts = aggregate_sentiment_batch(columns)
+    overall = overall_call_sentiment_batch(columns)
+    boosts = ending_state_boost_batch(columns)
+    scores, labels = calculate_business_sentiment_batch(columns, health)
+
+    for c, call in enumerate(calls):
+        segments = sorted(call, key=lambda x: x["start"])
+        expected = ca.aggregate_sentiment(segments)
+        assert counts[c].tolist() == [expected["Positive"], expected["Neutral"], expected["Negative"]]
+        assert overall[c] == ca.overall_call_sentiment(segments)
+        assert boosts[c] == ca.ending_state_boost(segments)
+        assert (scores[c], labels[c]) == ca.calculate_business_sentiment(segments, health[c])
+
+def test_precomputed_sentiment_keeps_analyzer_output():
+    rng = random.Random(11)
+    calls = [random_call(rng, rng.randint(0, 25)) for _ in range(60)]
+
+    for call, sentiment in zip(calls, precomputed_sentiment(calls)):
+        assert (sentiment is None) == (not call)
+        for mode in ("meeting", "sales", "both"):
+            assert ca.analyze_transcript(mode, "", call, sentiment=sentiment) == ca.analyze_transcript(mode, "", call)
+
+def test_single_call_and_empty_batch():
+    call = [{"start": 0.0, "end": 1.0, "text": "We agreed.", "sentiment": 0.5,
+             "sentiment_label": "Positive", "sentiment_confidence": 0.9}]
+    assert overall_call_sentiment_batch(SentimentColumns([call])) == ["positive"]
+
+    empty = SentimentColumns([])
+    assert len(empty) == 0
+    assert aggregate_sentiment_batch(empty).shape == (0, 3)
+    assert np.asarray(calculate_business_sentiment_batch(empty, "on_track")[0]).shape == (0,)
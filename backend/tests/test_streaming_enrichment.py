@@ -0,0 +1,61 @@
+"""
+Streaming enrichment: generator stages yield enriched segments before the
+input is exhausted and produce the same output as enrich_transcript.
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.nlp_engine import NLPEngine
+
+LINES = [
+    "Thanks everyone for joining the weekly sync today.",
+    "and we should cover the release plan first",
+    "The deployment is blocked on the security review.",
+    "Ok.",
+    "I'll follow up with the security team tomorrow morning.",
+    "Great, that sounds like a solid plan for the release.",
+]
+
+def raw_segments():
+    return [{"start": float(i * 4), "end": float(i * 4 + 4), "text": t} for i, t in enumerate(LINES)]
+
+def test_stream_yields_before_input_is_exhausted():
+    engine = NLPEngine(load_model=False)
+    consumed = []
+
+    def source():
+        for seg in raw_segments():
+            consumed.append(seg)
+            yield seg
+
+    stream = engine.iter_enriched(source(), micro_batch=1)
+    first = next(stream)
+
+    assert first["text"].startswith("Thanks everyone")
+    assert first["sentiment_source"] == "lexicon"
+    # Only what the merge stage needed to close the first segment was read
+    assert len(consumed) < len(LINES)
+
+def test_stream_matches_batch_enrichment():
+    engine = NLPEngine(load_model=False)
+
+    stream_stats, batch_stats = {}, {}
+    streamed = list(engine.iter_enriched(raw_segments(), stats=stream_stats, micro_batch=2))
+    batched = engine.enrich_transcript(raw_segments(), stats=batch_stats)
+
+    assert streamed == batched
+    assert len(batched) == 5  # "and we should..." merged into the first segment
+    assert batched[0]["end"] == 8.0
+    assert batched[2]["sentiment_source"] == "none"  # "Ok." is under 4 words
+    assert stream_stats == batch_stats
+
+def test_stream_does_not_mutate_input_segments():
+    engine = NLPEngine(load_model=False)
+    raw = raw_segments()
+
+    list(engine.iter_enriched(raw))
+
+    assert raw == raw_segments()
@@ -0,0 +1,96 @@
+"""
+What-if sweeps: the baseline variant matches the analyzers, threshold and
+keyword overlays change exactly the calls they should, and invalid variants
+fail before any work starts.
+"""
+
+import sys
+import os
+import json
+from collections import Counter
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sweep
+from services import context_analyzer as ca
+from utils import config_loader
+from utils.config_loader import ConfigValidationError, current_config, variant_config
+
+def seg(start, text, label="Neutral", confidence=0.9):
+    return {"start": start, "end": start + 3.0, "text": text, "sentiment": 0.0,
+            "sentiment_label": label, "sentiment_confidence": confidence}
+
+# A pricing objection just under the default objection_confidence (0.75)
+BORDERLINE = [seg(0.0, "The price is too expensive for us.", "Negative", 0.7), seg(3.0, "Send me the proposal.")]
+CLEAR = [seg(0.0, "The price is too expensive.", "Negative", 0.95), seg(3.0, "That makes sense.", "Positive")]
+MEETING = [seg(0.0, "I'll handle the deployment by Friday."), seg(3.0, "We agreed to ship next week.")]
+
+@pytest.fixture(autouse=True)
+def no_disk_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(config_loader, "CACHE_DIR", str(tmp_path / "compiled"))
+
+def write_archive(path):
+    records = [
+        {"id": "borderline", "mode": "sales", "segments": BORDERLINE},
+        {"id": "clear", "mode": "sales", "segments": CLEAR},
+        {"id": "meeting", "segments": MEETING},
+    ]
+    with open(path, "w") as f:
+        f.write("\n".join(json.dumps(r) for r in records) + "\n{not json\n")
+
+def test_expand_grid():
+    variants = sweep.expand_grid({
+        "variants": {"strict": {"thresholds": {"objection_confidence": 0.9}}},
+        "grid": {"thresholds.objection_confidence": [0.6, 0.8], "thresholds.sentiment_confidence": [0.5, 0.7]},
+    })
+    assert [name for name, _ in variants][:2] == ["current", "strict"]
+    assert len(variants) == 6
+    assert variants[2] == ("thresholds.objection_confidence=0.6,thresholds.sentiment_confidence=0.5",
+                           {"thresholds": {"objection_confidence": 0.6, "sentiment_confidence": 0.5}})
+
+def test_baseline_matches_analyzers(tmp_path):
+    archive = str(tmp_path / "archive.jsonl")
+    write_archive(archive)
+    report = sweep.sweep([archive], [("current", {})], workers=1)
+
+    current = report["variants"][0]
+    assert report["calls"] == 4
+    assert current["errors"] == 1 and current["changed_calls"] == 0
+    assert current["distribution"]["sales_quality"] == Counter(
+        ca.analyze_sales(calls)["quality"]["label"] for calls in (BORDERLINE, CLEAR))
+    assert current["distribution"]["objections"] == {"Pricing": 1, "none": 1}
+    assert current["distribution"]["meeting_quality"] == {
+        ca.analyze_meeting({"text": "", "segments": MEETING})["meeting_quality"]["label"]: 1}
+
+def test_threshold_and_keyword_variants(tmp_path):
+    archive = str(tmp_path / "archive.jsonl")
+    write_archive(archive)
+    variants = sweep.expand_grid({
+        "variants": {"no_pricing": {"sales": {"objections": {"Pricing": ["invoice"]}}}},
+        "grid": {"thresholds.objection_confidence": [0.65]},
+    })
+    report = sweep.sweep([archive], variants, workers=2)
+    by_name = {v["name"]: v for v in report["variants"]}
+
+    lenient = by_name["thresholds.objection_confidence=0.65"]
+    assert lenient["changed"]["objections"] == 1
+    assert lenient["examples"]["objections"] == ["borderline"]
+    assert lenient["config_version"].startswith("thresholds.objection_confidence=0.65@")
+
+    assert by_name["no_pricing"]["distribution"]["objections"] == {"none": 2}
+    assert by_name["no_pricing"]["examples"]["objections"] == ["clear"]
+
+def test_threshold_follows_pinned_config():
+    lenient = variant_config(current_config(), {"thresholds": {"objection_confidence": 0.65}})
+    assert ca.analyze_transcript("sales", "", BORDERLINE)["objections"] == []
+    assert [o["type"] for o in ca.analyze_transcript("sales", "", BORDERLINE, config=lenient)["objections"]] == ["Pricing"]
+
+def test_invalid_variant_fails_fast(tmp_path):
+    archive = str(tmp_path / "archive.jsonl")
+    write_archive(archive)
+    with pytest.raises(ConfigValidationError, match="thresholds.objection_confidence"):
+        sweep.sweep([archive], sweep.expand_grid({"grid": {"thresholds.objection_confidence": [1.5]}}), workers=1)
+    with pytest.raises(ConfigValidationError, match="thresholds.typo"):
+        variant_config(current_config(), {"thresholds": {"typo": 0.5}})
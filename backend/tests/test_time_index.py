@@ -0,0 +1,58 @@
+"""
+Time-indexed segment store: window queries match plain list filters, and
+the analyzers that use it keep their results.
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.time_index import TimeIndex
+from services import context_analyzer as ca
+
+def seg(start, text="ok", label="Neutral", confidence=0.9):
+    return {"start": start, "end": start + 1.0, "text": text, "sentiment": 0.0,
+            "sentiment_label": label, "sentiment_confidence": confidence}
+
+def test_window_queries_match_filters():
+    segments = [seg(float(t)) for t in [0, 1, 1, 2, 4, 4, 7, 9]]
+    index = TimeIndex(segments)
+
+    assert index.segments is segments  # already sorted: no copy
+    for t in [-1, 0, 1, 1.5, 4, 8, 9, 10]:
+        assert index.after(t) == [s for s in segments if s["start"] > t]
+        assert index.between(t, t + 3) == [s for s in segments if t <= s["start"] < t + 3]
+    assert index.last_fraction(0.25) == segments[int(len(segments) * 0.75):]
+    assert index.tail(3) == segments[-3:]
+    assert index.tail(50) == segments
+
+def test_unsorted_input_is_ordered_and_mapped_back():
+    segments = [seg(5.0, "c"), seg(1.0, "a"), seg(3.0, "b"), seg(1.0, "a2")]
+    index = TimeIndex(segments)
+
+    assert [s["text"] for s in index.segments] == ["a", "a2", "b", "c"]
+    assert list(index.order) == [1, 3, 2, 0]
+    assert [segments[i]["text"] for i in index.order[slice(*index.span_after(2.0))]] == ["b", "c"]
+
+def test_empty_index():
+    index = TimeIndex([])
+    assert len(index) == 0
+    assert index.after(0) == [] and index.tail(5) == [] and index.last_fraction(0.25) == []
+
+def test_meeting_tail_windows_use_time_order():
+    segments = [seg(float(i), "status update") for i in range(20)]
+    segments.append(seg(21.0, "No blockers from my side."))
+    assert ca.detect_explicit_no_blockers(segments)
+    assert ca.ending_state_boost(segments[:-1] + [seg(22.0, "Agreed, let's ship it.")]) == 0.2
+    # The statement is only in the tail when ordered by time
+    assert not ca.detect_explicit_no_blockers([segments[-1]] + [seg(30.0 + i) for i in range(10)])
+
+def test_objection_resolution_uses_next_five_segments():
+    segments = [seg(0.0, "The price is too expensive.", "Negative")]
+    segments += [seg(float(i), "hmm", "Negative") for i in range(1, 6)]
+    segments += [seg(float(i), "ok", "Positive") for i in range(6, 20)]
+    objection = ca.detect_objections(segments)[0]
+
+    assert not ca.is_objection_resolved(objection, TimeIndex(segments))
+    assert not ca.is_objection_resolved(objection, list(reversed(segments)))
@@ -0,0 +1,91 @@
+"""
+Token-aware truncation: segments are tokenized once, over-long segments are
+windowed by tokens, and predictions come back in input order.
+"""
+
+import sys
+import os
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("transformers")
+tokenizers = pytest.importorskip("tokenizers")
+
+from transformers import PreTrainedTokenizerFast
+from services import nlp_engine
+from services.nlp_engine import NLPEngine
+
+WORDS = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "good", "bad", "the", "call", "went", "price"]
+
+def build_tokenizer():
+    vocab = {w: i for i, w in enumerate(WORDS)}
+    core = tokenizers.Tokenizer(tokenizers.models.WordLevel(vocab, unk_token="[UNK]"))
+    core.pre_tokenizer = tokenizers.pre_tokenizers.Whitespace()
+    core.post_processor = tokenizers.processors.TemplateProcessing(
+        single="[CLS] $A [SEP]", special_tokens=[("[CLS]", 2), ("[SEP]", 3)]
+    )
+    return PreTrainedTokenizerFast(
+        tokenizer_object=core, pad_token="[PAD]", unk_token="[UNK]",
+        cls_token="[CLS]", sep_token="[SEP]", model_max_length=512
+    )
+
+class FakeBackend:
+    """Scores 'good' vs 'bad' token counts; records every forward batch."""
+    id2label = {0: "Negative", 1: "Neutral", 2: "Positive"}
+
+    def __init__(self):
+        self.tokenizer = build_tokenizer()
+        self.batches = []
+
+    def forward_logits(self, batch):
+        ids = np.asarray(batch["input_ids"])
+        self.batches.append(ids.shape)
+        good = (ids == WORDS.index("good")).sum(axis=1)
+        bad = (ids == WORDS.index("bad")).sum(axis=1)
+        return np.stack([bad * 2.0, np.ones(len(ids)), good * 2.0], axis=1)
+
+def make_engine():
+    engine = NLPEngine(load_model=False)
+    engine.backend = "onnx"
+    engine.sentiment_pipeline = FakeBackend()
+    return engine
+
+def test_long_segment_is_windowed_by_tokens():
+    engine = make_engine()
+    # 1500 tokens: a character cut at 512 would only ever see "bad"
+    long_text = " ".join(["bad"] * 100 + ["good"] * 1400)
+
+    result = engine._score_texts([long_text])
+
+    assert result[0]["label"] == "Positive"
+    windows = sum(shape[0] for shape in engine.sentiment_pipeline.batches)
+    assert windows > 1
+    assert all(shape[1] <= nlp_engine.MAX_SENTIMENT_TOKENS for shape in engine.sentiment_pipeline.batches)
+
+def test_results_keep_input_order_across_length_buckets():
+    engine = make_engine()
+    texts = [
+        "the call went good good",
+        " ".join(["the call went bad"] * 40),
+        "price bad bad",
+        "the call went",
+    ]
+
+    labels = [r["label"] for r in engine._score_texts(texts)]
+
+    assert labels == ["Positive", "Negative", "Negative", "Neutral"]
+
+def test_enrich_transcript_uses_token_windowing():
+    engine = make_engine()
+    segments = [
+        {"start": 0.0, "end": 4.0, "text": "The call went good good."},
+        {"start": 4.0, "end": 9.0, "text": "Bad bad price bad today."},
+    ]
+
+    enriched = engine.enrich_transcript(segments)
+
+    assert [s["sentiment_label"] for s in enriched] == ["Positive", "Negative"]
+    assert enriched[1]["sentiment"] < 0
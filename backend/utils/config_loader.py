@@ -1,16 +1,41 @@
+import contextvars
+import hashlib
 import json
 import os
 import logging
+import pickle
+import re
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
 
 logger = logging.getLogger(__name__)
 
 CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config", "keywords.json")
 
+# Seconds between keywords.json checks of the hot-reload watcher (0 = off)
+RELOAD_INTERVAL = float(os.environ.get("TALKSENSE_CONFIG_RELOAD_INTERVAL", "2"))
+
+# Compiled snapshots, keyed by the keywords file hash ("" = no disk cache)
+CACHE_DIR = os.environ.get("TALKSENSE_CONFIG_CACHE_DIR", os.path.join(os.path.dirname(CONFIG_PATH), ".compiled"))
+# Bump when compile_keywords changes its output
+CACHE_FORMAT = 3
+
+# Per-tenant overlays: <PROFILES_DIR>/<profile id>.json
+PROFILES_DIR = os.environ.get("TALKSENSE_PROFILES_DIR", os.path.join(os.path.dirname(CONFIG_PATH), "profiles"))
+# Compiled profiles kept in memory (least recently used ones are evicted)
+PROFILE_CACHE_SIZE = int(os.environ.get("TALKSENSE_PROFILE_CACHE_SIZE", "16"))
+PROFILE_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
 # Default Fallback (Critical Safety)
 DEFAULT_KEYWORDS = {
     "meeting": {
         "decisions": ["we will", "let's", "agreed", "decided", "finalize"],
-        "actions": ["please", "can you", "need to", "will handle"]
+        "actions": ["please", "can you", "need to", "will handle"],
+        "ownership_commitment": ["i will", "i'll"],
+        "directional_decisions": ["we're going to", "we will go with"],
+        "issues": ["issue", "problem", "bug"],
+        "risks": ["risk", "delay", "blocked"]
     },
     "sales": {
         "objections": {
@@ -21,27 +46,468 @@ DEFAULT_KEYWORDS = {
     "nlp_enrichment": {
         "action_item": ["action item"],
         "decision_made": ["decision"]
+    },
+    "thresholds": {
+        "objection_confidence": 0.75,
+        "sentiment_confidence": 0.6
     }
 }
 
+# Phrase lists the analyzers read: section -> keys
+REQUIRED_LISTS = {
+    "meeting": ["decisions", "actions", "ownership_commitment", "directional_decisions", "issues", "risks"],
+}
+# Sections mapping a name (objection type, keyword category) to a phrase list
+REQUIRED_GROUPS = [("sales", "objections"), ("nlp_enrichment", None)]
+# Lists that replace a built-in list when present
+OPTIONAL_LISTS = {
+    "sales": ["buying_signals"],
+}
+# Sections whose lists are also matched as whole words (LexiconSentimentScorer
+# weights nlp_enrichment terms): "delay" does not match "delayed" there, so
+# covered phrases are kept
+WHOLE_WORD_SECTIONS = {"nlp_enrichment"}
+# Sentiment confidence cut-offs (0-1); missing ones use DEFAULT_KEYWORDS["thresholds"]
+THRESHOLD_KEYS = ["objection_confidence", "sentiment_confidence"]
+
+class ConfigValidationError(ValueError):
+    """keywords.json is not valid JSON or lacks a phrase list the analyzers read."""
+
+def _is_phrase_list(value):
+    return isinstance(value, list) and all(isinstance(p, str) and p.strip() for p in value)
+
+def validate_keywords(data) -> dict:
+    """
+    Checks that `data` has every phrase list the analyzers read.
+    Raises ConfigValidationError naming the first bad entry; returns `data`.
+    """
+    if not isinstance(data, dict):
+        raise ConfigValidationError("keywords config must be a JSON object")
+
+    for section, keys in REQUIRED_LISTS.items():
+        for key in keys:
+            if not _is_phrase_list(data.get(section, {}).get(key)):
+                raise ConfigValidationError(f"{section}.{key} must be a list of non-empty strings")
+
+    for section, keys in OPTIONAL_LISTS.items():
+        for key in keys:
+            value = data.get(section, {}).get(key)
+            if value is not None and not _is_phrase_list(value):
+                raise ConfigValidationError(f"{section}.{key} must be a list of non-empty strings")
+
+    for section, key in REQUIRED_GROUPS:
+        group = data.get(section)
+        group = group.get(key) if key and isinstance(group, dict) else group
+        name = f"{section}.{key}" if key else section
+        if not isinstance(group, dict):
+            raise ConfigValidationError(f"{name} must be an object of phrase lists")
+        for entry, phrases in group.items():
+            if not _is_phrase_list(phrases):
+                raise ConfigValidationError(f"{name}.{entry} must be a list of non-empty strings")
+
+    thresholds = data.get("thresholds", {})
+    if not isinstance(thresholds, dict):
+        raise ConfigValidationError("thresholds must be an object")
+    for key, value in thresholds.items():
+        if key not in THRESHOLD_KEYS:
+            raise ConfigValidationError(f"thresholds.{key} is unknown (expected one of {THRESHOLD_KEYS})")
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or not 0 <= value <= 1:
+            raise ConfigValidationError(f"thresholds.{key} must be a number between 0 and 1")
+    return data
+
+def normalize_phrases(phrases: list, report: dict = None, drop_covered: bool = True) -> list:
+    """
+    Lowercased, whitespace-collapsed phrases without duplicates and, with
+    `drop_covered`, without phrases covered by a shorter one in the same list
+    ("i'll follow up" under "i'll"). Only lists used as `any(phrase in text)`
+    may drop those; whole-word matching needs them ("delay" vs "delayed").
+    """
+    unique = list(dict.fromkeys(" ".join(p.lower().split()) for p in phrases))
+    kept = [p for p in unique if not any(q != p and q in p for q in unique)] if drop_covered else unique
+    if report is not None:
+        report["duplicates"] = report.get("duplicates", 0) + len(phrases) - len(unique)
+        report["covered"] = report.get("covered", 0) + len(unique) - len(kept)
+        report["phrases"] = report.get("phrases", 0) + len(kept)
+    return kept
+
+def compile_keywords(data: dict, report: dict = None, drop_covered: bool = True) -> dict:
+    """
+    A copy of the keywords with every phrase list normalized (see
+    normalize_phrases); lists under WHOLE_WORD_SECTIONS keep covered phrases.
+    """
+    compiled = {}
+    for key, value in data.items():
+        if isinstance(value, dict):
+            compiled[key] = compile_keywords(value, report, drop_covered and key not in WHOLE_WORD_SECTIONS)
+        elif _is_phrase_list(value):
+            compiled[key] = normalize_phrases(value, report, drop_covered)
+        else:
+            compiled[key] = value
+    return compiled
+
+def merge_keywords(base: dict, overlay: dict) -> dict:
+    """`base` with `overlay` layered on top: objects merge key by key, anything else is replaced."""
+    merged = dict(base)
+    for key, value in overlay.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge_keywords(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
 def load_keywords():
     """
-    Loads keywords from JSON config file.
-    Returns default dictionary if file is missing or invalid.
+    Loads keywords from JSON config file: validated and normalized.
+    Returns the default dictionary if the file is missing; raises
+    ConfigValidationError if it is invalid.
+    """
+    return read_config(CONFIG_PATH, cache_dir="").data if os.path.exists(CONFIG_PATH) else _default_config().data
+
+# --- VERSIONED CONFIG (hot reload) ---
+
+# name -> (fn(data), version, inputs(data)) building a derived structure (matchers, lexicon) from the keywords
+_COMPILERS = {}
+
+def register_compiler(name: str, compile_fn, version: int = 1, inputs=None):
+    """
+    Registers how consumers derive `name` from the keywords (see
+    KeywordConfig.artifact). Artifacts are pickled into the snapshot cache:
+    they must not hold process-local state, and `version` must be bumped
+    whenever `compile_fn` changes its logic. `inputs(data)` returns whatever
+    else `compile_fn` reads (bundled files, built-in phrase lists) as JSON
+    values; their hash is part of the cache key, so editing them rebuilds it.
+    """
+    _COMPILERS[name] = (compile_fn, version, inputs)
+    return compile_fn
+
+def _compiler_key(name: str, data: dict) -> str:
+    """Cache key of artifact `name` for `data`: compiler version plus a hash of its other inputs."""
+    _, version, inputs = _COMPILERS[name]
+    if inputs is None:
+        return str(version)
+    encoded = json.dumps(inputs(data), sort_keys=True, default=sorted).encode()
+    return f"{version}:{hashlib.sha256(encoded).hexdigest()[:12]}"
+
+class KeywordConfig:
+    """
+    One immutable, versioned keywords.json snapshot.
+
+    `data` is the validated file with normalized phrase lists and `version` a
+    hash of its bytes. Matchers and other derived structures are built from
+    `data` by the registered compilers and cached on the snapshot, so a
+    reload swaps in a new object and never touches one an in-flight request
+    is still using. With a `cache_dir`, compile_all() also saves the snapshot
+    to disk so the next process skips validation and compilation.
+    """
+
+    def __init__(self, data: dict, version: str, report: dict = None, cache_dir: str = "", cached: dict = None):
+        self.data = data
+        self.version = version
+        self.report = report or {}
+        self.cache_dir = cache_dir
+        self._cached = cached or {}  # name -> (compiler key, artifact) from disk
+        self._artifacts = {}
+        self._keys = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def artifact(self, name: str):
+        """The compiled `name` for this version (from the disk cache or built on first use)."""
+        artifacts = self._artifacts
+        if name not in artifacts:
+            with self._lock:
+                if name not in artifacts:
+                    key = self._keys[name] = _compiler_key(name, self.data)
+                    cached = self._cached.get(name)
+                    if cached is not None and cached[0] == key:
+                        artifacts[name] = cached[1]
+                    else:
+                        artifacts[name] = _COMPILERS[name][0](self.data)
+                        self._dirty = True
+        return artifacts[name]
+
+    def compile_all(self):
+        """Builds every registered artifact now (before the snapshot goes live) and saves new ones."""
+        for name in list(_COMPILERS):
+            self.artifact(name)
+        if self._dirty and self.cache_dir:
+            self.save()
+        return self
+
+    def save(self):
+        """Writes the snapshot to cache_dir (write-then-rename; failures only log)."""
+        artifacts = dict(self._cached)
+        with self._lock:
+            for name, artifact in self._artifacts.items():
+                artifacts[name] = (self._keys[name], artifact)
+            self._dirty = False
+        path = _cache_path(self.cache_dir, self.version)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump({"version": self.version, "data": self.data, "report": self.report,
+                             "artifacts": artifacts}, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not cache compiled keyword config in {self.cache_dir}: {e}")
+
+def _cache_path(cache_dir: str, version: str) -> str:
+    return os.path.join(cache_dir, f"keywords-{version}-v{CACHE_FORMAT}.pkl")
+
+def _load_cached(cache_dir: str, version: str):
+    """The cached snapshot of `version`, or None (missing or unreadable)."""
+    if not cache_dir:
+        return None
+    try:
+        with open(_cache_path(cache_dir, version), "rb") as f:
+            snapshot = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable keyword config cache: {e}")
+        return None
+    if snapshot.get("version") != version:
+        return None
+    return KeywordConfig(snapshot["data"], version, snapshot["report"], cache_dir, snapshot["artifacts"])
+
+def read_config(path: str = CONFIG_PATH, cache_dir: str = None) -> KeywordConfig:
     """
+    Validated, normalized snapshot of a keywords file; loaded from the
+    compiled cache when this exact file content was seen before.
+    Raises ConfigValidationError if the file is invalid.
+    """
+    cache_dir = CACHE_DIR if cache_dir is None else cache_dir
+    with open(path, "rb") as f:
+        raw = f.read()
+    version = hashlib.sha256(raw).hexdigest()[:12]
+
+    config = _load_cached(cache_dir, version)
+    if config is not None:
+        return config
+
+    try:
+        data = json.loads(raw.decode("utf-8"))
+    except ValueError as e:
+        raise ConfigValidationError(f"{path} is not valid JSON: {e}") from e
+    report = {}
+    data = compile_keywords(validate_keywords(data), report)
+    return KeywordConfig(data, version, report, cache_dir)
+
+def _default_config() -> KeywordConfig:
+    report = {}
+    return KeywordConfig(compile_keywords(validate_keywords(DEFAULT_KEYWORDS), report), "defaults", report)
+
+def _initial_config() -> KeywordConfig:
+    # Schema errors fail fast: analyzers must never silently run on defaults
     if not os.path.exists(CONFIG_PATH):
         logger.warning(f"Config file not found at {CONFIG_PATH}. Using defaults.")
-        return DEFAULT_KEYWORDS
+        return _default_config()
+    config = read_config(CONFIG_PATH)
+    logger.info(f"Keywords configuration loaded successfully (version {config.version}, {config.report}).")
+    return config
 
+_ACTIVE = _initial_config()
+_SWAP_LOCK = threading.Lock()
+# Snapshot a request is running on (see pinned_config)
+_PINNED = contextvars.ContextVar("keyword_config", default=None)
+
+def current_config() -> KeywordConfig:
+    """The newest live snapshot. Requests take it once, at the start."""
+    return _ACTIVE
+
+def active_config() -> KeywordConfig:
+    """The snapshot pinned for this request, else the newest one."""
+    return _PINNED.get() or _ACTIVE
+
+@contextmanager
+def pinned_config(config: KeywordConfig = None):
+    """Runs the block on one snapshot, even if a reload lands meanwhile."""
+    token = _PINNED.set(config or active_config())
     try:
-        with open(CONFIG_PATH, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            logger.info("Keywords configuration loaded successfully.")
-            return data
-    except Exception as e:
-        logger.error(f"Failed to load keyword config: {e}. Using defaults.")
-        return DEFAULT_KEYWORDS
+        yield _PINNED.get()
+    finally:
+        _PINNED.reset(token)
+
+def swap_config(config: KeywordConfig) -> KeywordConfig:
+    """Compiles `config` and makes it the live snapshot. Returns the previous one."""
+    global _ACTIVE
+    config.compile_all()
+    with _SWAP_LOCK:
+        previous, _ACTIVE = _ACTIVE, config
+    return previous
+
+def reload_config(path: str = CONFIG_PATH) -> bool:
+    """
+    Reads, validates and compiles `path`, then swaps it in. Returns False if
+    the content did not change. Raises (keeping the live snapshot) if the
+    file is invalid.
+    """
+    config = read_config(path)
+    if config.version == _ACTIVE.version:
+        return False
+    previous = swap_config(config)
+    logger.info(f"Keywords configuration reloaded: {previous.version} -> {config.version}.")
+    return True
+
+class ConfigWatcher:
+    """
+    Background thread polling keywords.json (mtime + size) every `interval`
+    seconds. A changed file is validated and compiled on this thread, then
+    swapped in; an invalid file is logged and the live snapshot kept.
+    """
+
+    def __init__(self, path: str = CONFIG_PATH, interval: float = RELOAD_INTERVAL):
+        self.path = path
+        self.interval = interval
+        self._stamp = self._file_stamp()
+        self._stop = threading.Event()
+        self._thread = None
+        self.reloads = 0
+        self.failures = 0
+
+    def _file_stamp(self):
+        try:
+            stat = os.stat(self.path)
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
+
+    def check(self) -> bool:
+        """One poll: reloads if the file changed. Returns True if a new version went live."""
+        stamp = self._file_stamp()
+        if stamp is None or stamp == self._stamp:
+            return False
+        self._stamp = stamp
+        try:
+            reloaded = reload_config(self.path)
+        except Exception as e:
+            self.failures += 1
+            logger.error(f"Rejected keyword config change, keeping version {_ACTIVE.version}: {e}")
+            return False
+        self.reloads += reloaded
+        return reloaded
+
+    def start(self):
+        if self._thread is not None or self.interval <= 0:
+            return self
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="config-watcher", daemon=True)
+        self._thread.start()
+        logger.info(f"Keyword config watcher started (interval={self.interval}s).")
+        return self
+
+    def stop(self, timeout: float = 5.0):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            self.check()
+
+# Singleton-like access (the keywords as loaded at import; live code uses active_config())
+KEYWORDS_CONFIG = _ACTIVE.data
+
+# --- PROFILES (per-tenant keyword overlays) ---
+
+def profile_path(profile_id: str, profiles_dir: str = None) -> str:
+    """Path of a profile overlay. Raises KeyError for malformed or unknown IDs."""
+    if not isinstance(profile_id, str) or not PROFILE_ID_PATTERN.match(profile_id):
+        raise KeyError(f"Invalid config profile ID: {profile_id!r}")
+    path = os.path.join(profiles_dir or PROFILES_DIR, f"{profile_id}.json")
+    if not os.path.isfile(path):
+        raise KeyError(f"Unknown config profile: {profile_id}")
+    return path
+
+def read_profile(profile_id: str, base: KeywordConfig, profiles_dir: str = None, cache_dir: str = None) -> KeywordConfig:
+    """
+    The profile overlay merged over `base` (see merge_keywords), validated and
+    normalized like keywords.json. Its version ("<id>@<hash>") covers both
+    the base version and the overlay bytes, so the disk cache stays correct.
+    """
+    cache_dir = CACHE_DIR if cache_dir is None else cache_dir
+    with open(profile_path(profile_id, profiles_dir), "rb") as f:
+        raw = f.read()
+    version = f"{profile_id}@{hashlib.sha256(base.version.encode() + b':' + raw).hexdigest()[:12]}"
+
+    config = _load_cached(cache_dir, version)
+    if config is not None:
+        return config
+
+    try:
+        overlay = json.loads(raw.decode("utf-8"))
+    except ValueError as e:
+        raise ConfigValidationError(f"Profile {profile_id} is not valid JSON: {e}") from e
+    if not isinstance(overlay, dict):
+        raise ConfigValidationError(f"Profile {profile_id} must be a JSON object")
+    report = {}
+    data = compile_keywords(validate_keywords(merge_keywords(base.data, overlay)), report)
+    return KeywordConfig(data, version, report, cache_dir)
+
+def variant_config(base: KeywordConfig, overlay: dict, name: str = "variant") -> KeywordConfig:
+    """
+    An in-memory config: `overlay` merged over `base` like a profile (not
+    cached on disk). Used for what-if runs such as sweep.py.
+    Raises ConfigValidationError if the result is invalid.
+    """
+    digest = hashlib.sha256(base.version.encode() + b":" + json.dumps(overlay, sort_keys=True).encode())
+    report = {}
+    data = compile_keywords(validate_keywords(merge_keywords(base.data, overlay)), report)
+    return KeywordConfig(data, f"{name}@{digest.hexdigest()[:12]}", report)
+
+class ProfileCache:
+    """
+    Bounded LRU of compiled profile configs. A profile is loaded and compiled
+    on first use; the least recently used one is evicted past `maxsize`, so
+    many tenants never mean as many resident matchers. Entries are rebuilt
+    when the base config version or the profile file changes.
+    """
+
+    def __init__(self, maxsize: int = PROFILE_CACHE_SIZE, profiles_dir: str = None):
+        self.maxsize = max(1, int(maxsize))
+        self.profiles_dir = profiles_dir
+        self._entries = OrderedDict()  # profile id -> (base version, mtime_ns, size, config)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, profile_id: str, base: KeywordConfig = None) -> KeywordConfig:
+        """Compiled config of `profile_id` over `base` (default: the live config)."""
+        base = base or current_config()
+        stat = os.stat(profile_path(profile_id, self.profiles_dir))
+        key = (base.version, stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            entry = self._entries.get(profile_id)
+            if entry is not None and entry[:3] == key:
+                self._entries.move_to_end(profile_id)
+                self.hits += 1
+                return entry[3]
+            self.misses += 1
+
+        # Compile outside the lock; other profiles keep being served meanwhile
+        config = read_profile(profile_id, base, self.profiles_dir).compile_all()
 
-# Singleton-like access
-KEYWORDS_CONFIG = load_keywords()
+        with self._lock:
+            self._entries[profile_id] = key + (config,)
+            self._entries.move_to_end(profile_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return config
 
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
@@ -0,0 +1,101 @@
+import re
+
+_SEPARATOR = "\n"  # Joins texts for batch scans
+
+def _trie_pattern(phrases) -> str:
+    """
+    Regex alternation shaped like a trie: one branch per first character, so a
+    non-matching position fails after a single comparison, and the greedy
+    optional tails return the LONGEST phrase starting at each position.
+    """
+    trie = {}
+    for phrase in phrases:
+        node = trie
+        for ch in phrase:
+            node = node.setdefault(ch, {})
+        node[""] = True
+
+    def build(node):
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch != ""]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 and "" not in node else "(?:" + "|".join(branches) + ")"
+        return body + "?" if "" in node else body
+
+    return build(trie)
+
+
+class PhraseMatcher:
+    """
+    Matches many phrase categories against a text in ONE regex scan.
+
+    Semantics are exactly `any(phrase in text for phrase in category)` for
+    every category at once: a zero-width lookahead finds the longest phrase
+    starting at each position, and each phrase's mask also carries every
+    category whose phrases are prefixes of it.
+    Phrases are used as-is (not lowercased), like the `in` checks they replace.
+
+    mask(text) -> int with bit(category) set for every matching category.
+    """
+
+    def __init__(self, categories: dict):
+        self.bits = {name: 1 << i for i, name in enumerate(categories)}
+
+        phrase_bits = {}
+        self.always = 0  # Categories holding "" match every text
+        for name, phrases in categories.items():
+            for phrase in phrases:
+                if phrase:
+                    phrase_bits[phrase] = phrase_bits.get(phrase, 0) | self.bits[name]
+                else:
+                    self.always |= self.bits[name]
+
+        # A match of "i'll take" also means "i'll" matched at the same position
+        self.masks = {}
+        for phrase in phrase_bits:
+            mask = 0
+            for end in range(1, len(phrase) + 1):
+                mask |= phrase_bits.get(phrase[:end], 0)
+            self.masks[phrase] = mask
+
+        trie = _trie_pattern(phrase_bits)
+        self.pattern = re.compile("(?=(" + trie + "))") if phrase_bits else None
+        # Batch form: the separator is captured too, so ONE findall over all
+        # texts yields each text's phrases followed by its boundary marker
+        self.batch_pattern = None
+        if phrase_bits and not any(_SEPARATOR in phrase for phrase in phrase_bits):
+            self.batch_pattern = re.compile("(?=(" + trie + "|" + re.escape(_SEPARATOR) + "))")
+
+    def bit(self, name: str) -> int:
+        return self.bits[name]
+
+    def mask(self, text: str) -> int:
+        mask = self.always
+        if self.pattern is not None:
+            masks = self.masks
+            for phrase in self.pattern.findall(text):
+                mask |= masks[phrase]
+        return mask
+
+    def mask_all(self, texts) -> list:
+        """mask() for every text, in a single regex call when possible."""
+        texts = list(texts)
+        if not texts or self.pattern is None:
+            return [self.always] * len(texts)
+
+        blob = _SEPARATOR.join(texts)
+        if self.batch_pattern is None or blob.count(_SEPARATOR) != len(texts) - 1:
+            # Some text contains the separator itself
+            return [self.mask(text) for text in texts]
+
+        masks = self.masks
+        result = []
+        mask = self.always
+        for phrase in self.batch_pattern.findall(blob):
+            if phrase == _SEPARATOR:
+                result.append(mask)
+                mask = self.always
+            else:
+                mask |= masks[phrase]
+        result.append(mask)
+        return result